@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""
+ETL Benchmarks - Micro-benchmarks for the hot paths of the ETL pipeline
+Compares the current implementations against the approaches they replaced
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+def _timeit(fn, repeat: int = 3) -> float:
+    """Best wall-clock time of fn() over repeat runs, in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _print_table(title: str, headers: list, rows: list):
+    """Print a simple fixed-width results table"""
+    print("\n" + "=" * 70)
+    print(title)
+    print("=" * 70)
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).rjust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(str(v).rjust(w) for v, w in zip(row, widths)))
+    print("=" * 70)
+
+
+def _synthetic_daft_batch(size: int, existing_ratio: float = 0.5):
+    """Batch of Daft keys plus the subset that 'already exists' in the database"""
+    import pandas as pd
+
+    df = pd.DataFrame({
+        'property_id': [str(6000000 + i) for i in range(size)],
+        'publish_date': pd.array([1700000000000 + i * 1000 for i in range(size)], dtype='Int64'),
+    })
+    existing = df.iloc[: int(size * existing_ratio)].astype({'publish_date': 'int64'})
+    return df, existing
+
+
+def bench_dedup(sizes: list, use_db: bool, repeat: int):
+    """Row-wise apply/IN-list dedup vs MultiIndex.isin and the temp-table join"""
+    import pandas as pd
+
+    rows = []
+    for size in sizes:
+        df, existing = _synthetic_daft_batch(size)
+
+        # Previous implementation: Python set membership per row via DataFrame.apply
+        existing_set = {(r.property_id, r.publish_date) for r in existing.itertuples()}
+
+        def legacy_apply():
+            return df[~df.apply(lambda row: (row['property_id'], row['publish_date']) in existing_set, axis=1)]
+
+        def multiindex_isin():
+            index = pd.MultiIndex.from_arrays([existing['property_id'], existing['publish_date']])
+            keys = pd.MultiIndex.from_arrays([df['property_id'], df['publish_date'].astype('int64')])
+            return df[~keys.isin(index)]
+
+        assert len(legacy_apply()) == len(multiindex_isin())
+
+        legacy = _timeit(legacy_apply, repeat)
+        vectorized = _timeit(multiindex_isin, repeat)
+        rows.append([f"{size:,}", 'pandas filter', f"{legacy * 1000:.2f}", f"{vectorized * 1000:.2f}",
+                     f"{legacy / vectorized:.1f}x"])
+
+    if use_db:
+        from etl.loaders.data_loader import DataLoader
+        from etl.utils.database import db
+
+        loader = DataLoader()
+        for size in sizes:
+            df, _ = _synthetic_daft_batch(size)
+
+            def legacy_in_list():
+                placeholders = ','.join(f"('{pid}',{pub})" for pid, pub in zip(df['property_id'], df['publish_date']))
+                return db.execute_query(f"""
+                    SELECT property_id, publish_date
+                    FROM raw_daft_listings
+                    WHERE (property_id, publish_date) IN ({placeholders})
+                """)
+
+            try:
+                legacy = _timeit(legacy_in_list, repeat)
+            except Exception as e:
+                # Large IN-lists can exceed the server's max_stack_depth
+                print(f"Previous IN-list query failed at {size:,} rows: {type(e).__name__}")
+                legacy = None
+
+            for strategy in ('temp_table', 'pandas'):
+                elapsed = _timeit(lambda: loader._filter_existing_daft(df, strategy=strategy), repeat)
+                rows.append([f"{size:,}", f"db {strategy}",
+                             f"{legacy * 1000:.2f}" if legacy else 'failed', f"{elapsed * 1000:.2f}",
+                             f"{legacy / elapsed:.1f}x" if legacy else '-'])
+
+    _print_table(
+        "Daft dedup: previous (IN-list + apply) vs set-based anti-join",
+        ['rows', 'path', 'previous ms', 'new ms', 'speedup'],
+        rows
+    )
+
+
+def _legacy_parse_jsonstat(json_data: dict):
+    """
+    Copy of SmartCSOScraper._parse_jsonstat before the stride decoder (cartesian
+    product of the categories, one dict per cell, nulls kept), kept as the benchmark baseline
+    """
+    import itertools
+
+    import pandas as pd
+
+    dimensions = json_data['dimension']
+    values = json_data['value']
+
+    dim_info = []
+    for dim_id in json_data.get('id', []):
+        dim = dimensions[dim_id]
+        categories = dim.get('category', {})
+        cat_index = categories.get('index', [])
+        cat_labels = categories.get('label', {})
+
+        if isinstance(cat_index, list):
+            cat_values = cat_index
+        else:
+            cat_values = sorted(cat_index.keys(), key=lambda x: cat_index[x])
+
+        dim_info.append({
+            'id': dim_id,
+            'values': cat_values,
+            'labels': {v: cat_labels.get(v, v) for v in cat_values}
+        })
+
+    all_combos = list(itertools.product(*[d['values'] for d in dim_info]))
+
+    rows = []
+    for idx, combo in enumerate(all_combos):
+        if idx < len(values):
+            row = {}
+            for dim_idx, value in enumerate(combo):
+                dim = dim_info[dim_idx]
+                row[dim['id']] = value
+                row[f"{dim['id']}_Label"] = dim['labels'].get(value, value)
+            row['VALUE'] = values[idx]
+            rows.append(row)
+
+    df = pd.DataFrame(rows)
+
+    if 'TLIST(A1)' in df.columns:
+        df['Year'] = pd.to_numeric(df['TLIST(A1)'], errors='coerce').astype('Int64')
+    elif 'TLIST(M1)' in df.columns:
+        df['Year'] = df['TLIST(M1)'].astype(str).str[:4]
+        df['Year'] = pd.to_numeric(df['Year'], errors='coerce').astype('Int64')
+    elif 'TLIST(Q1)' in df.columns:
+        df['Year'] = df['TLIST(Q1)'].astype(str).str[:4]
+        df['Year'] = pd.to_numeric(df['Year'], errors='coerce').astype('Int64')
+
+    return df
+
+
+def bench_jsonstat_memory(cells_list: list, chunk_rows: int):
+    """Peak traced memory of whole-document JSON-stat parsing vs the streaming decoder"""
+    import json
+    import tempfile
+    import tracemalloc
+
+    import pandas as pd
+
+    from etl.scrapers.smart_cso_scraper import SmartCSOScraper
+    from tests.synthetic import write_synthetic_cube
+
+    scraper = SmartCSOScraper()
+    rows = []
+
+    def comparable(df):
+        # The stream drops null cells and builds Categoricals; compare plain values
+        df = df.dropna(subset=['VALUE']).reset_index(drop=True)
+        dtypes = {col: object for col in df.columns if col not in ('VALUE', 'Year')}
+        return df.astype({**dtypes, 'VALUE': float})
+
+    for cells in cells_list:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'cube.json'
+            total = write_synthetic_cube(path, cells)
+            size_mb = path.stat().st_size / 1024 / 1024
+
+            # Previous implementation: whole body through json, one dict per cell
+            tracemalloc.start()
+            start = time.perf_counter()
+            with open(path, 'rb') as f:
+                legacy = _legacy_parse_jsonstat(json.load(f))
+            legacy_seconds = time.perf_counter() - start
+            legacy_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            stream_rows = 0
+            for chunk in scraper._iter_jsonstat_file(path, 'BENCH', chunk_rows=chunk_rows):
+                stream_rows += len(chunk)
+            stream_seconds = time.perf_counter() - start
+            stream_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            # Outside the traced runs: both decoders must produce the same rows
+            streamed = pd.concat(scraper._iter_jsonstat_file(path, 'BENCH', chunk_rows=chunk_rows),
+                                 ignore_index=True)
+            pd.testing.assert_frame_equal(comparable(legacy), comparable(streamed))
+            assert len(streamed) == stream_rows
+            del legacy, streamed
+
+            rows.append([f"{total:,}", f"{size_mb:.1f}",
+                         f"{legacy_peak / 1024 / 1024:.1f}", f"{legacy_seconds:.2f}",
+                         f"{stream_peak / 1024 / 1024:.1f}", f"{stream_seconds:.2f}"])
+
+    _print_table(
+        f"JSON-stat decode: whole document vs streaming ({chunk_rows:,} cells per chunk)",
+        ['cells', 'file MB', 'whole peak MB', 'whole s', 'stream peak MB', 'stream s'],
+        rows
+    )
+
+
+def _legacy_parse_price(price_text):
+    """Price parsing before the regexes were precompiled"""
+    import re
+
+    if not price_text:
+        return None
+    try:
+        price_str = str(price_text).replace('€', '').replace(',', '').strip()
+        return float(re.sub(r'[^\d.]', '', price_str))
+    except (ValueError, TypeError):
+        return None
+
+
+def _legacy_parse_number(text):
+    """Number parsing before the regexes were precompiled"""
+    import re
+
+    if not text:
+        return None
+    try:
+        return int(re.sub(r'[^\d]', '', str(text)))
+    except (ValueError, TypeError):
+        return None
+
+
+def _legacy_parse_listing_json(listing_data: dict, extract_county) -> dict:
+    """
+    Copy of the listing parser (now daft_parser.parse_listing_json) before the offset extractor
+    (repeated .get lookups, a timestamp per listing), kept as the benchmark baseline
+    """
+    from datetime import datetime
+
+    coordinates = listing_data.get('point', {}).get('coordinates', [])
+    longitude = coordinates[0] if len(coordinates) > 0 else None
+    latitude = coordinates[1] if len(coordinates) > 1 else None
+
+    seller = listing_data.get('seller', {})
+    media = listing_data.get('media', {})
+    ber = listing_data.get('ber', {})
+
+    price_text = listing_data.get('abbreviatedPrice', listing_data.get('price'))
+    price = _legacy_parse_price(price_text)
+
+    bedrooms_text = listing_data.get('numBedrooms')
+    bedrooms = _legacy_parse_number(bedrooms_text)
+
+    title = listing_data.get('title')
+    county = extract_county(title) if title else None
+
+    return {
+        'property_id': listing_data.get('id'),
+        'daft_shortcode': listing_data.get('daftShortcode'),
+        'title': title,
+        'seo_title': listing_data.get('seoTitle'),
+        'price': price,
+        'price_raw': listing_data.get('price'),
+        'abbreviated_price': listing_data.get('abbreviatedPrice'),
+        'property_type': listing_data.get('propertyType'),
+        'bedrooms': bedrooms,
+        'num_bedrooms_raw': bedrooms_text,
+        'county': county,
+        'sections': ','.join(listing_data.get('sections', [])),
+        'sale_type': ','.join(listing_data.get('saleType', [])),
+        'publish_date': listing_data.get('publishDate'),
+        'date_of_construction': listing_data.get('dateOfConstruction'),
+        'category': listing_data.get('category'),
+        'state': listing_data.get('state'),
+        'featured_level': listing_data.get('featuredLevel'),
+        'featured_level_full': listing_data.get('featuredLevelFull'),
+        'premier_partner': listing_data.get('premierPartner'),
+        'latitude': latitude,
+        'longitude': longitude,
+        'seo_friendly_path': listing_data.get('seoFriendlyPath'),
+        'seller_id': seller.get('sellerId'),
+        'seller_name': seller.get('name'),
+        'seller_phone': seller.get('phone'),
+        'seller_branch': seller.get('branch'),
+        'seller_type': seller.get('sellerType'),
+        'licence_number': seller.get('licenceNumber'),
+        'total_images': media.get('totalImages'),
+        'has_video': media.get('hasVideo'),
+        'has_virtual_tour': media.get('hasVirtualTour'),
+        'has_brochure': media.get('hasBrochure'),
+        'ber_rating': ber.get('rating'),
+        'prs_total_unit_types': listing_data.get('prsTotalUnitTypes'),
+        'prs_tagline': listing_data.get('prsTagline'),
+        'property_url': f"https://www.daft.ie{listing_data.get('seoFriendlyPath', '')}",
+        'scraped_at': datetime.now().isoformat()
+    }
+
+
+def bench_parse(pages_dir: str, synthetic_pages: int, repeat: int):
+    """Per-page parse time: full BeautifulSoup tree + json vs the offset extractor"""
+    import json
+    from bs4 import BeautifulSoup
+
+    from etl.scrapers import daft_parser
+    from etl.utils.county import extract_county
+    from tests.synthetic import synthetic_daft_page
+
+    if pages_dir:
+        pages = [p.read_text(encoding='utf-8') for p in sorted(Path(pages_dir).glob('*.html'))]
+        source = f"{len(pages)} recorded page(s) from {pages_dir}"
+    else:
+        pages = [synthetic_daft_page(n) for n in range(1, synthetic_pages + 1)]
+        source = f"{len(pages)} synthetic page(s)"
+    if not pages:
+        print(f"No .html pages found in {pages_dir}")
+        return
+
+    def legacy():
+        # Previous implementation: full lxml tree, stdlib json, previous listing parser
+        listings = []
+        for html in pages:
+            script_tag = BeautifulSoup(html, 'lxml').find('script', {'id': '__NEXT_DATA__'})
+            data = json.loads(script_tag.string)
+            for item in data.get('props', {}).get('pageProps', {}).get('listings', []):
+                listings.append(_legacy_parse_listing_json(item.get('listing', {}), extract_county))
+        return listings
+
+    def current():
+        listings = []
+        for html in pages:
+            listings += daft_parser.extract_listings_from_html(html)
+        return listings
+
+    from loguru import logger
+    logger.disable('etl.scrapers.daft_parser')
+
+    def comparable(listings):
+        return [{k: v for k, v in listing.items() if k != 'scraped_at'} for listing in listings]
+    assert comparable(legacy()) == comparable(current())
+
+    legacy_seconds = _timeit(legacy, repeat)
+    current_seconds = _timeit(current, repeat)
+    avg_kb = sum(len(p) for p in pages) / len(pages) / 1024
+
+    _print_table(
+        f"Daft page parse ({source}, avg {avg_kb:.0f} KB)",
+        ['path', 'ms/page', 'speedup'],
+        [
+            ['soup + json (previous)', f"{legacy_seconds / len(pages) * 1000:.2f}", '1.0x'],
+            ['offsets + fast json', f"{current_seconds / len(pages) * 1000:.2f}",
+             f"{legacy_seconds / current_seconds:.1f}x"],
+        ]
+    )
+
+
+# Entry-point start-ups measured by the importtime benchmark:
+# (name, interpreter arguments, modules that must not be imported, import-time budget option)
+IMPORT_SCENARIOS = [
+    ('--help', ['run_smart_etl.py', '--help'],
+     ['pandas', 'numpy', 'sqlalchemy', 'psycopg2', 'requests', 'playwright', 'bs4', 'lxml'], 'max_help_ms'),
+    ('--cso-only', ['-c', 'import run_smart_etl, etl.scrapers.smart_cso_scraper'],
+     ['playwright', 'bs4', 'lxml'], 'max_cso_ms'),
+    ('daft stage', ['-c', 'import run_smart_etl, etl.scrapers.smart_daft_scraper'], [], None),
+]
+
+
+def _import_profile(arguments: list, baseline: set = frozenset()) -> tuple:
+    """
+    Run the interpreter with -X importtime
+
+    Args:
+        arguments: Interpreter arguments (script or -c code)
+        baseline: Top-level modules of a bare interpreter start, left out of the total
+
+    Returns:
+        (import ms, process wall ms, {module: cumulative ms} of the top-level imports,
+         set of imported top-level packages, error or None if the process exited 0)
+    """
+    import subprocess
+
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', *arguments],
+                               cwd=Path(__file__).parent, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    top_level, packages, output = {}, set(), []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:'):
+            output.append(line)
+            continue
+        if 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        packages.add(name.strip().split('.')[0])
+        # Nested imports are indented below the module that triggered them
+        if not name[1:].startswith(' ') and name.strip() not in baseline:
+            top_level[name.strip()] = int(cumulative) / 1000
+
+    error = None
+    if completed.returncode != 0:
+        # Last line of the traceback, e.g. "ModuleNotFoundError: No module named 'numpy'"
+        error = f"exit {completed.returncode}" + (f": {output[-1].strip()}" if output else '')
+    return sum(top_level.values()), wall_ms, top_level, packages, error
+
+
+def bench_importtime(repeat: int, budgets: dict) -> bool:
+    """
+    Start-up import cost of the ETL entry points, as a regression guard
+
+    Import time excludes the bare interpreter start-up. A scenario fails when its
+    process exits non-zero (e.g. a missing dependency), it imports a module it must
+    not (e.g. Playwright for --cso-only) or its import time exceeds its budget.
+
+    Returns:
+        True if every scenario is within its limits
+    """
+    # Interpreter start-up (site, encodings, ...) is the same for every scenario
+    baseline = set(_import_profile(['-c', 'pass'])[2])
+
+    rows = []
+    ok = True
+    for name, arguments, forbidden, budget_option in IMPORT_SCENARIOS:
+        runs = [_import_profile(arguments, baseline) for _ in range(repeat)]
+        import_ms, wall_ms, top_level, packages, _ = min(runs, key=lambda run: run[0])
+        heaviest = sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:3]
+
+        # A crashed start-up imports less and looks fast, so it must never pass
+        errors = sorted({run[4] for run in runs if run[4]})
+        unexpected = sorted(set(forbidden) & packages)
+        budget = budgets.get(budget_option) if budget_option else None
+        problems = errors + ([f"imports {', '.join(unexpected)}"] if unexpected else [])
+        if budget is not None and import_ms > budget:
+            problems.append(f"over {budget:.0f} ms")
+        ok = ok and not problems
+
+        rows.append([
+            name, f"{import_ms:.1f}", f"{wall_ms:.0f}",
+            ', '.join(f"{module} {ms:.0f}" for module, ms in heaviest),
+            '; '.join(problems) or 'ok'
+        ])
+
+    _print_table(
+        f"Entry-point start-up (python -X importtime, best of {repeat})",
+        ['scenario', 'import ms', 'wall ms', 'heaviest imports (ms)', 'guard'],
+        rows
+    )
+    return ok
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description='Micro-benchmarks for the Ireland Housing ETL pipeline',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Dedup strategies at 20, 2k and 200k rows per batch (pandas side only)
+  python benchmark_etl.py dedup
+
+  # Include the database-side strategies (read-only against raw_daft_listings)
+  python benchmark_etl.py dedup --db
+
+  # Peak memory of CSO JSON-stat decoding on 1M-4M cell cubes
+  python benchmark_etl.py jsonstat-memory
+
+  # Daft search page parsing over saved pages (or synthetic ones without --pages-dir)
+  python benchmark_etl.py parse --pages-dir data/daft_pages
+
+  # Start-up import cost of run_smart_etl.py; exits 1 on a regression
+  python benchmark_etl.py importtime --max-help-ms 50
+        """
+    )
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    dedup = subparsers.add_parser('dedup', help='Daft listing dedup strategies')
+    dedup.add_argument('--sizes', type=int, nargs='+', default=[20, 2000, 200000], help='Batch sizes')
+    dedup.add_argument('--db', action='store_true', help='Also benchmark the database strategies')
+
+    jsonstat = subparsers.add_parser('jsonstat-memory', help='CSO JSON-stat decoding peak memory (tracemalloc)')
+    jsonstat.add_argument('--cells', type=int, nargs='+', default=[1000000, 2000000, 4000000],
+                          help='Cube sizes in cells')
+    jsonstat.add_argument('--chunk-rows', type=int, default=100000, help='Cells per streamed chunk')
+
+    parse = subparsers.add_parser('parse', help='Daft search page parsing')
+    parse.add_argument('--pages-dir', help='Directory of saved search page .html files')
+    parse.add_argument('--pages', type=int, default=20, help='Synthetic pages when --pages-dir is not given')
+
+    importtime = subparsers.add_parser('importtime', help='Entry-point start-up import cost (regression guard)')
+    importtime.add_argument('--max-help-ms', type=float, default=50,
+                            help='Import-time budget of run_smart_etl.py --help')
+    importtime.add_argument('--max-cso-ms', type=float, default=None,
+                            help='Import-time budget of the --cso-only start-up')
+
+    args = parser.parse_args()
+
+    if args.benchmark == 'dedup':
+        bench_dedup(args.sizes, args.db, args.repeat)
+    elif args.benchmark == 'jsonstat-memory':
+        bench_jsonstat_memory(args.cells, args.chunk_rows)
+    elif args.benchmark == 'parse':
+        bench_parse(args.pages_dir, args.pages, args.repeat)
+    elif args.benchmark == 'importtime':
+        budgets = {'max_help_ms': args.max_help_ms, 'max_cso_ms': args.max_cso_ms}
+        if not bench_importtime(args.repeat, budgets):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
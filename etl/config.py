@@ -1,57 +1,193 @@
 """
 Configuration management for Irish Housing Data Platform
 Loads environment variables and provides centralized config access
+Nothing is read at import time: .env and the environment are loaded on first access
 """
 import os
+import threading
 from pathlib import Path
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
 
+def _read_settings() -> dict:
+    """Load the .env file and read every setting from the environment"""
+    from dotenv import load_dotenv
 
-class Config:
+    # Load environment variables from .env file
+    load_dotenv()
+
+    class Settings:
+        # Database Configuration
+        DB_HOST = os.getenv("DB_HOST", "localhost")
+        DB_PORT = int(os.getenv("DB_PORT", 5432))
+        DB_NAME = os.getenv("DB_NAME", "postgres")
+        DB_USER = os.getenv("DB_USER", "postgres")
+        DB_PASSWORD = os.getenv("DB_PASSWORD", "")
+        DB_SCHEMA = os.getenv("DB_SCHEMA", "public")
+
+        # Connection String
+        DATABASE_URL = os.getenv(
+            "DATABASE_URL",
+            f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+        )
+
+        # Connection Pool (shared by psycopg2 and SQLAlchemy access)
+        DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", 1))
+        DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", 5))
+        # Seconds to wait for a free connection, and before a connection is replaced
+        DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))
+        DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+
+        # Share of the pool each source may hold at once when Daft and CSO run concurrently
+        DB_BUDGET_DAFT = int(os.getenv("DB_BUDGET_DAFT", 2))
+        DB_BUDGET_CSO = int(os.getenv("DB_BUDGET_CSO", 3))
+
+        # Tasks run_pipeline.py runs at once (loaders, SQL scripts, dbt selectors)
+        PIPELINE_WORKERS = int(os.getenv("PIPELINE_WORKERS", 4))
+
+        # Rows fetched per round trip by server-side (streaming) cursors
+        DB_STREAM_ITERSIZE = int(os.getenv("DB_STREAM_ITERSIZE", 10000))
+
+        # Data Sources
+        DAFT_BASE_URL = os.getenv("DAFT_BASE_URL", "https://www.daft.ie")
+        CSO_API_BASE = "https://data.cso.ie"
+        PROPERTY_REGISTER_URL = "https://www.propertypriceregister.ie"
+        ECB_API_BASE = "https://sdw.ecb.europa.eu"
+
+        # Scraping Settings
+        USER_AGENT = os.getenv(
+            "USER_AGENT",
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        )
+        SCRAPE_DELAY_SECONDS = int(os.getenv("SCRAPE_DELAY_SECONDS", 2))
+        MAX_RETRIES = int(os.getenv("MAX_RETRIES", 3))
+        TIMEOUT_SECONDS = int(os.getenv("TIMEOUT_SECONDS", 30))
+
+        # Daft page fetching: browser tabs working in parallel, and a cap on total page
+        # requests per second
+        DAFT_PAGE_CONCURRENCY = int(os.getenv("DAFT_PAGE_CONCURRENCY", 3))
+        DAFT_MAX_RPS = float(os.getenv("DAFT_MAX_RPS", 1.0))
+
+        # Daft page readiness and adaptive pacing (delay follows response latency, backs off
+        # on 429/403/challenges)
+        DAFT_READY_TIMEOUT_MS = int(os.getenv("DAFT_READY_TIMEOUT_MS", 15000))
+        DAFT_MIN_DELAY_SECONDS = float(os.getenv("DAFT_MIN_DELAY_SECONDS", 0.5))
+        DAFT_MAX_DELAY_SECONDS = float(os.getenv("DAFT_MAX_DELAY_SECONDS", 60))
+        DAFT_BLOCK_BACKOFF_SECONDS = float(os.getenv("DAFT_BLOCK_BACKOFF_SECONDS", 5))
+
+        # Daft fetch mode: 'data_route' reads page props from Next.js /_next/data/ JSON once the
+        # first rendered page reveals the build id (falls back to rendering on failure),
+        # 'browser' renders every page
+        DAFT_FETCH_MODE = os.getenv("DAFT_FETCH_MODE", "data_route")
+
+        # Worker processes parsing Daft pages off the event loop (0 = parse inline)
+        DAFT_PARSE_WORKERS = int(os.getenv("DAFT_PARSE_WORKERS", 0))
+
+        # Daft request interception: 'block' aborts matching requests, 'measure' only tallies
+        # them, 'off' disables
+        DAFT_BLOCK_MODE = os.getenv("DAFT_BLOCK_MODE", "block")
+        DAFT_BLOCKED_RESOURCE_TYPES = [t.strip() for t in os.getenv(
+            "DAFT_BLOCKED_RESOURCE_TYPES", "image,media,font,stylesheet"
+        ).split(",") if t.strip()]
+        DAFT_BLOCKED_URL_PATTERNS = [p.strip() for p in os.getenv(
+            "DAFT_BLOCKED_URL_PATTERNS",
+            "google-analytics.com,googletagmanager.com,doubleclick.net,googlesyndication.com,"
+            "facebook.net,connect.facebook,hotjar.com,amazon-adsystem.com,criteo,"
+            "maps.googleapis.com,mapbox,tiles"
+        ).split(",") if p.strip()]
+        DAFT_BLOCK_ALLOWLIST = [p.strip() for p in os.getenv(
+            "DAFT_BLOCK_ALLOWLIST", "challenges.cloudflare.com,/cdn-cgi/"
+        ).split(",") if p.strip()]
+
+        # Daft write-behind loading (pages are written on a background thread)
+        DAFT_WRITE_QUEUE_PAGES = int(os.getenv("DAFT_WRITE_QUEUE_PAGES", 10))
+        DAFT_WRITE_FLUSH_ROWS = int(os.getenv("DAFT_WRITE_FLUSH_ROWS", 200))
+        DAFT_WRITE_FLUSH_SECONDS = float(os.getenv("DAFT_WRITE_FLUSH_SECONDS", 10))
+
+        # Sharded Daft scrapes: worker processes (one browser each), largest shard before it is
+        # split into price bands, and the band edges in EUR/month
+        DAFT_SHARD_WORKERS = int(os.getenv("DAFT_SHARD_WORKERS", 2))
+        DAFT_SHARD_MAX_LISTINGS = int(os.getenv("DAFT_SHARD_MAX_LISTINGS", 1000))
+        DAFT_SHARD_PRICE_BANDS = [int(edge) for edge in os.getenv(
+            "DAFT_SHARD_PRICE_BANDS", "1000,1500,2000,2500,3000"
+        ).split(",") if edge.strip()]
+
+        # Daft dedup against raw_daft_listings: 'temp_table' (DB-side join) or 'pandas'
+        # (MultiIndex.isin)
+        DAFT_DEDUP_STRATEGY = os.getenv("DAFT_DEDUP_STRATEGY", "temp_table")
+
+        # CSO datasets processed concurrently, and how many may write to the database at once
+        CSO_WORKERS = int(os.getenv("CSO_WORKERS", 4))
+        CSO_DB_CONNECTIONS = int(os.getenv("CSO_DB_CONNECTIONS", 2))
+
+        # On-disk cache of PxStat responses, revalidated with ETag/Last-Modified
+        CSO_CACHE_ENABLED = os.getenv("CSO_CACHE_ENABLED", "true").lower() == "true"
+        CSO_CACHE_MAX_MB = int(os.getenv("CSO_CACHE_MAX_MB", 500))
+        CSO_CACHE_MAX_ENTRIES = int(os.getenv("CSO_CACHE_MAX_ENTRIES", 32))
+
+        # JSON-stat cells decoded (and loaded) per chunk when streaming a CSO cube
+        CSO_STREAM_CHUNK_ROWS = int(os.getenv("CSO_STREAM_CHUNK_ROWS", 100000))
+
+        # Bulk Load Settings
+        UPSERT_METHOD = os.getenv("UPSERT_METHOD", "copy")  # 'copy' or 'rows'
+        UPSERT_BATCH_SIZE = int(os.getenv("UPSERT_BATCH_SIZE", 50000))
+
+        # Environment
+        ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+        LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+
+        # Project Paths
+        PROJECT_ROOT = Path(__file__).parent.parent
+        ETL_DIR = PROJECT_ROOT / "etl"
+        SQL_DIR = PROJECT_ROOT / "sql"
+        DBT_DIR = PROJECT_ROOT / "dbt"
+        LOGS_DIR = PROJECT_ROOT / "logs"
+        CACHE_DIR = Path(os.getenv("CACHE_DIR", PROJECT_ROOT / "data" / "cache"))
+
+        # Run metrics: Prometheus textfile rewritten after every run (point at node_exporter's
+        # textfile dir)
+        METRICS_TEXTFILE = Path(os.getenv("METRICS_TEXTFILE", LOGS_DIR / "etl_metrics.prom"))
+
+        # Profiling mode (--profile): milliseconds between wall-clock stack samples
+        PROFILE_SAMPLE_MS = float(os.getenv("PROFILE_SAMPLE_MS", 10))
+
+    return {name: value for name, value in vars(Settings).items() if not name.startswith('__')}
+
+
+class _LazyConfig(type):
+    """Metaclass that loads the settings into the class on first attribute access"""
+
+    def __getattr__(cls, name):
+        # Only called for missing attributes: after loading these are plain class attributes
+        if name.startswith('__') or not cls.load():
+            raise AttributeError(f"Config has no setting {name!r}")
+        return getattr(cls, name)
+
+
+class Config(metaclass=_LazyConfig):
     """Central configuration class for all ETL processes"""
 
-    # Database Configuration
-    DB_HOST = os.getenv("DB_HOST", "localhost")
-    DB_PORT = int(os.getenv("DB_PORT", 5432))
-    DB_NAME = os.getenv("DB_NAME", "postgres")
-    DB_USER = os.getenv("DB_USER", "postgres")
-    DB_PASSWORD = os.getenv("DB_PASSWORD", "")
-    DB_SCHEMA = os.getenv("DB_SCHEMA", "public")
-
-    # Connection String
-    DATABASE_URL = os.getenv(
-        "DATABASE_URL",
-        f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-    )
-
-    # Data Sources
-    DAFT_BASE_URL = os.getenv("DAFT_BASE_URL", "https://www.daft.ie")
-    CSO_API_BASE = "https://data.cso.ie"
-    PROPERTY_REGISTER_URL = "https://www.propertypriceregister.ie"
-    ECB_API_BASE = "https://sdw.ecb.europa.eu"
-
-    # Scraping Settings
-    USER_AGENT = os.getenv(
-        "USER_AGENT",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-    )
-    SCRAPE_DELAY_SECONDS = int(os.getenv("SCRAPE_DELAY_SECONDS", 2))
-    MAX_RETRIES = int(os.getenv("MAX_RETRIES", 3))
-    TIMEOUT_SECONDS = int(os.getenv("TIMEOUT_SECONDS", 30))
-
-    # Environment
-    ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-
-    # Project Paths
-    PROJECT_ROOT = Path(__file__).parent.parent
-    ETL_DIR = PROJECT_ROOT / "etl"
-    SQL_DIR = PROJECT_ROOT / "sql"
-    DBT_DIR = PROJECT_ROOT / "dbt"
-    LOGS_DIR = PROJECT_ROOT / "logs"
+    _loaded = False
+    _lock = threading.Lock()
+
+    @classmethod
+    def load(cls) -> bool:
+        """
+        Read .env and the environment into Config (once per process)
+
+        Settings assigned before the first access (e.g. Config.LOGS_DIR = ... in a
+        test or script) are kept rather than overwritten.
+
+        Returns:
+            True if this call loaded the settings, False if they were already loaded
+        """
+        with cls._lock:
+            if cls._loaded:
+                return False
+            for name, value in _read_settings().items():
+                if name not in cls.__dict__:
+                    setattr(cls, name, value)
+            cls._loaded = True
+            return True
 
     @classmethod
     def validate(cls):
@@ -63,7 +199,3 @@ class Config:
             raise ValueError(f"Missing required configuration: {', '.join(missing)}")
 
         return True
-
-
-# Create logs directory if it doesn't exist
-Config.LOGS_DIR.mkdir(exist_ok=True)
@@ -3,9 +3,13 @@ Data Loader - Loads scraped data into PostgreSQL raw tables with complete field
 """
 from datetime import datetime
 import pandas as pd
-from typing import List, Dict, Any
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterator, Set, Tuple
 
+from etl.config import Config
 from etl.utils.database import db
+from etl.utils.county import extract_county_series
+from etl.utils.metrics import metrics
 from etl.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -16,8 +20,10 @@ class DataLoader:
 
     def __init__(self):
         self.db = db
+        # table -> {'years': years read, 'keys': their keys} while a CSO dataset is loading
+        self._cso_snapshots: Dict[str, Dict[str, set]] = {}
 
-    def load_daft_listings(self, listings: List[Dict]) -> int:
+    def load_daft_listings(self, listings: List[Dict], dedup_strategy: str = None) -> int:
         """
         Load Daft.ie rental listings into raw_daft_listings table
         Maps all 38 fields from scraper output
@@ -25,6 +31,7 @@ class DataLoader:
 
         Args:
             listings: List of property listing dictionaries
+            dedup_strategy: 'temp_table' or 'pandas' (defaults to Config.DAFT_DEDUP_STRATEGY)
 
         Returns:
             Number of rows inserted (excluding duplicates)
@@ -49,38 +56,18 @@ class DataLoader:
         if 'publish_date' in df.columns:
             df['publish_date'] = pd.to_numeric(df['publish_date'], errors='coerce').astype('Int64')
 
-        # Check for existing records in database to avoid duplicates
+        # Check for existing records in database to avoid duplicates (anti-join on the batch keys)
         if len(df) > 0:
-            # Filter to rows with valid property_id and publish_date before querying
-            valid_df = df[df['property_id'].notna() & df['publish_date'].notna()]
-
-            if len(valid_df) > 0:
-                property_ids = valid_df['property_id'].tolist()
-                publish_dates = valid_df['publish_date'].tolist()
-
-                # Build query to check existing combinations
-                # property_id is VARCHAR (needs quotes), publish_date is bigint (no quotes)
-                placeholders = ','.join([f"('{pid}',{pd})" for pid, pd in zip(property_ids, publish_dates)])
-
-                if placeholders:
-                    check_query = f"""
-                        SELECT property_id, publish_date
-                        FROM raw_daft_listings
-                        WHERE (property_id, publish_date) IN ({placeholders})
-                    """
-
-                    try:
-                        existing = self.db.execute_query(check_query)
-                        if existing:
-                            existing_set = {(row['property_id'], row['publish_date']) for row in existing}
-
-                            # Filter out existing records
-                            df = df[~df.apply(lambda row: (row['property_id'], row['publish_date']) in existing_set, axis=1)]
-
-                            db_dupes = len(existing)
-                            logger.info(f"Filtered out {db_dupes} records that already exist in database")
-                    except Exception as e:
-                        logger.warning(f"Could not check for existing records: {e}. Proceeding with all records.")
+            try:
+                before = len(df)
+                with metrics.stage('daft', 'dedup') as stage:
+                    df = self._filter_existing_daft(df, strategy=dedup_strategy)
+                    stage.rows = before
+                db_dupes = before - len(df)
+                if db_dupes > 0:
+                    logger.info(f"Filtered out {db_dupes} records that already exist in database")
+            except Exception as e:
+                logger.warning(f"Could not check for existing records: {e}. Proceeding with all records.")
 
         if len(df) == 0:
             logger.info("No new records to load after deduplication")
@@ -105,6 +92,11 @@ class DataLoader:
             if col not in df.columns:
                 df[col] = None
 
+        # Resolve county from the title for rows the scraper left without one
+        missing_county = df['county'].isna()
+        if missing_county.any():
+            df.loc[missing_county, 'county'] = extract_county_series(df.loc[missing_county, 'title'])
+
         # Type conversions and cleaning
         df['price'] = pd.to_numeric(df['price'], errors='coerce')
         df['bedrooms'] = pd.to_numeric(df['bedrooms'], errors='coerce').astype('Int64')
@@ -130,15 +122,192 @@ class DataLoader:
 
         # Load to database with proper conflict handling
         # Uses ON CONFLICT DO NOTHING to skip duplicates
-        rows_loaded = self.db.bulk_upsert(
-            df=df,
-            table='raw_daft_listings',
-            conflict_columns=['property_id', 'publish_date']
-        )
+        with metrics.stage('daft', 'upsert') as stage:
+            rows_loaded = self.db.bulk_upsert(
+                df=df,
+                table='raw_daft_listings',
+                conflict_columns=['property_id', 'publish_date']
+            )
+            stage.rows = rows_loaded
 
         logger.info(f"Loaded {rows_loaded} Daft listings with all 38 fields to raw_daft_listings")
         return rows_loaded
 
+    def _filter_existing_daft(self, df: pd.DataFrame, strategy: str = None) -> pd.DataFrame:
+        """
+        Drop rows whose (property_id, publish_date) already exists in raw_daft_listings
+
+        Strategies:
+            temp_table: COPY the batch keys into a temp table and join on the DB side
+            pandas: fetch existing keys for the batch's property_ids with = ANY(%s)
+                    and anti-join with a vectorized MultiIndex.isin
+
+        Args:
+            df: Batch with property_id and publish_date (Int64) columns
+            strategy: 'temp_table' or 'pandas' (defaults to Config.DAFT_DEDUP_STRATEGY)
+
+        Returns:
+            DataFrame without the rows already in the database
+        """
+        strategy = strategy or Config.DAFT_DEDUP_STRATEGY
+        key_columns = ['property_id', 'publish_date']
+
+        # Only rows with a complete key can conflict; property_id is VARCHAR in the DB
+        valid = df['property_id'].notna() & df['publish_date'].notna()
+        if not valid.any():
+            return df
+
+        keys = pd.DataFrame({
+            'property_id': df.loc[valid, 'property_id'].astype(str),
+            'publish_date': df.loc[valid, 'publish_date'].astype('int64')
+        })
+
+        if strategy == 'temp_table':
+            existing = self.db.existing_keys(keys, 'raw_daft_listings', key_columns)
+        elif strategy == 'pandas':
+            rows = self.db.execute_query(
+                """
+                    SELECT property_id, publish_date
+                    FROM raw_daft_listings
+                    WHERE property_id = ANY(%s)
+                """,
+                (keys['property_id'].unique().tolist(),)
+            )
+            existing = pd.DataFrame(rows, columns=key_columns)
+        else:
+            raise ValueError(f"Unknown dedup strategy: {strategy}")
+
+        if existing.empty:
+            return df
+
+        existing_index = pd.MultiIndex.from_arrays([
+            existing['property_id'].astype(str),
+            existing['publish_date'].astype('int64')
+        ])
+        batch_index = pd.MultiIndex.from_frame(keys)
+
+        is_existing = pd.Series(False, index=df.index)
+        is_existing[valid] = batch_index.isin(existing_index)
+        return df[~is_existing]
+
+    def iter_daft_listings(self, columns: List[str] = None, since_publish_date: int = None,
+                           chunksize: int = None) -> Iterator[pd.DataFrame]:
+        """
+        Stream raw_daft_listings in DataFrame chunks through a server-side cursor
+        Memory stays bounded by chunksize, so this is safe for exports and re-validation
+
+        Args:
+            columns: Columns to read (None = all)
+            since_publish_date: Only rows with publish_date greater than this (Unix ms)
+            chunksize: Rows per chunk (defaults to Config.DB_STREAM_ITERSIZE)
+
+        Yields:
+            DataFrame chunks ordered by id
+        """
+        col_list = ', '.join(columns) if columns else '*'
+        query = f"SELECT {col_list} FROM raw_daft_listings"
+        params = None
+
+        if since_publish_date is not None:
+            query += " WHERE publish_date > %s"
+            params = (since_publish_date,)
+
+        query += " ORDER BY id"
+
+        yield from self.db.stream_dataframes(query, params, chunksize=chunksize)
+
+    def backfill_daft_counties(self, chunksize: int = None) -> int:
+        """
+        Re-resolve county from title for every stored Daft listing
+        Fixes rows written by the old substring matcher (e.g. Westmeath stored as Meath)
+
+        Titles are streamed in chunks and resolved with the vectorized matcher;
+        only rows whose county changes are sent back, via COPY into a temp
+        table and one UPDATE ... FROM.
+
+        Args:
+            chunksize: Rows per streamed chunk (defaults to Config.DB_STREAM_ITERSIZE)
+
+        Returns:
+            Number of rows updated
+        """
+        changed = []
+        for chunk in self.iter_daft_listings(columns=['id', 'title', 'county'], chunksize=chunksize):
+            resolved = extract_county_series(chunk['title'])
+            # Keep the stored county where the title names none
+            resolved = resolved.where(resolved.notna(), chunk['county'])
+            differs = resolved.ne(chunk['county']) & resolved.notna()
+            if differs.any():
+                changed.append(pd.DataFrame({'id': chunk.loc[differs, 'id'], 'county': resolved[differs]}))
+
+        if not changed:
+            logger.info("County backfill: all stored counties already match their titles")
+            return 0
+
+        updates = pd.concat(changed, ignore_index=True)
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    CREATE TEMP TABLE county_backfill (id BIGINT PRIMARY KEY, county VARCHAR(100))
+                    ON COMMIT DROP
+                """)
+                self.db.copy_dataframe(cur, updates, 'county_backfill')
+                cur.execute("""
+                    UPDATE raw_daft_listings r
+                    SET county = b.county
+                    FROM county_backfill b
+                    WHERE r.id = b.id
+                """)
+                updated = cur.rowcount
+
+        logger.info(f"✅ County backfill: updated {updated:,} Daft listings")
+        return updated
+
+    @contextmanager
+    def cso_dataset_load(self, table: str):
+        """
+        Dedup every chunk of one CSO dataset load against the table as it was before the load
+
+        A streamed dataset is loaded in several chunks within one transaction, so a
+        plain check would see the rows the earlier chunks just inserted and drop
+        later rows sharing their key (e.g. the other months of a year in CPM01).
+        Inside this block each year's keys are read once, before anything of that
+        year has been inserted, and reused for the following chunks.
+        """
+        self._cso_snapshots[table] = {'years': set(), 'keys': set()}
+        try:
+            yield
+        finally:
+            self._cso_snapshots.pop(table, None)
+
+    def _existing_cso_keys(self, table: str, key_columns: List[str],
+                           years: List[int]) -> Set[Tuple]:
+        """Keys of a CSO raw table for the given years (see cso_dataset_load)"""
+        snapshot = self._cso_snapshots.get(table)
+        years = {int(y) for y in years}
+        if snapshot is not None:
+            years -= snapshot['years']
+
+        existing = set()
+        if years:
+            year_list = ','.join(str(y) for y in sorted(years))
+            check_query = f"""
+                SELECT DISTINCT {', '.join(key_columns)}
+                FROM {table}
+                WHERE year IN ({year_list})
+            """
+            # Stream existing keys instead of materialising every row at once
+            existing = {
+                tuple(row[col] for col in key_columns)
+                for row in self.db.stream_query(check_query)
+            }
+
+        if snapshot is None:
+            return existing
+        snapshot['years'] |= years
+        snapshot['keys'] |= existing
+        return snapshot['keys']
+
     def load_cso_rent(self, df: pd.DataFrame) -> int:
         """
         Load CSO Rent Index data (RIA02) with complete field mapping and deduplication
@@ -208,17 +377,8 @@ class DataLoader:
                     # Get unique years to check
                     years = df_renamed['year'].dropna().unique().tolist()
                     if years:
-                        year_list = ','.join([str(int(y)) for y in years])
-                        check_query = f"""
-                            SELECT DISTINCT {', '.join(valid_cols)}
-                            FROM raw_cso_rent
-                            WHERE year IN ({year_list})
-                        """
-
-                        existing = self.db.execute_query(check_query)
-                        if existing:
-                            # Create set of existing combinations
-                            existing_set = {tuple(row[col] for col in valid_cols) for row in existing}
+                        existing_set = self._existing_cso_keys('raw_cso_rent', valid_cols, years)
+                        if existing_set:
 
                             # Filter out existing records
                             df_renamed = df_renamed[~df_renamed.apply(
@@ -306,16 +466,8 @@ class DataLoader:
                 try:
                     years = df_renamed['year'].dropna().unique().tolist()
                     if years:
-                        year_list = ','.join([str(int(y)) for y in years])
-                        check_query = f"""
-                            SELECT DISTINCT {', '.join(valid_cols)}
-                            FROM raw_cso_cpi
-                            WHERE year IN ({year_list})
-                        """
-
-                        existing = self.db.execute_query(check_query)
-                        if existing:
-                            existing_set = {tuple(row[col] for col in valid_cols) for row in existing}
+                        existing_set = self._existing_cso_keys('raw_cso_cpi', valid_cols, years)
+                        if existing_set:
                             df_renamed = df_renamed[~df_renamed.apply(
                                 lambda row: tuple(row[col] for col in valid_cols) in existing_set, axis=1
                             )]
@@ -402,16 +554,9 @@ class DataLoader:
                 try:
                     years = df_renamed['year'].dropna().unique().tolist()
                     if years:
-                        year_list = ','.join([str(int(y)) for y in years])
-                        check_query = f"""
-                            SELECT DISTINCT {', '.join(valid_cols)}
-                            FROM raw_cso_population
-                            WHERE year IN ({year_list})
-                        """
-
-                        existing = self.db.execute_query(check_query)
-                        if existing:
-                            existing_set = {tuple(row[col] for col in valid_cols) for row in existing}
+                        existing_set = self._existing_cso_keys('raw_cso_population', valid_cols,
+                                                               years)
+                        if existing_set:
                             df_renamed = df_renamed[~df_renamed.apply(
                                 lambda row: tuple(row[col] for col in valid_cols) in existing_set, axis=1
                             )]
@@ -495,16 +640,8 @@ class DataLoader:
                 try:
                     years = df_renamed['year'].dropna().unique().tolist()
                     if years:
-                        year_list = ','.join([str(int(y)) for y in years])
-                        check_query = f"""
-                            SELECT DISTINCT {', '.join(valid_cols)}
-                            FROM raw_cso_income
-                            WHERE year IN ({year_list})
-                        """
-
-                        existing = self.db.execute_query(check_query)
-                        if existing:
-                            existing_set = {tuple(row[col] for col in valid_cols) for row in existing}
+                        existing_set = self._existing_cso_keys('raw_cso_income', valid_cols, years)
+                        if existing_set:
                             df_renamed = df_renamed[~df_renamed.apply(
                                 lambda row: tuple(row[col] for col in valid_cols) in existing_set, axis=1
                             )]
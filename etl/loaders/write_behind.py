@@ -0,0 +1,165 @@
+"""
+Write-Behind Loader - Loads scraped pages on a background writer thread
+Lets the browser fetch the next page while earlier pages are written to PostgreSQL
+"""
+import asyncio
+import contextvars
+import queue
+import threading
+import time
+from typing import List, Dict, Callable, Optional
+
+from etl.config import Config
+from etl.utils.logger import get_logger
+from etl.utils.profiling import profiler
+
+logger = get_logger(__name__)
+
+# Sentinel telling the writer thread to flush and exit
+_STOP = object()
+
+
+class WriteBehindLoader:
+    """
+    Drains parsed pages from a bounded queue on a dedicated writer thread
+
+    Pages are coalesced into a single load call once flush_rows listings are
+    buffered, or once flush_seconds have passed since the oldest buffered page.
+    submit() blocks while the queue is full, so a slow database throttles the
+    scraper instead of letting pages pile up in memory.
+
+    on_flush is called on the writer thread after each successful batch, with
+    the batch's page numbers, listings and rows inserted. Batches are written
+    in submission order and the callback stops after the first failed batch,
+    so it only ever sees an unbroken prefix of the submitted pages.
+    """
+
+    def __init__(self, load_fn: Callable[[List[Dict]], int], max_pages: int = None,
+                 flush_rows: int = None, flush_seconds: float = None,
+                 on_flush: Callable[[List[Optional[int]], List[Dict], int], None] = None):
+        """
+        Args:
+            load_fn: Function that loads a list of listings and returns rows inserted
+            max_pages: Queue capacity in pages (defaults to Config.DAFT_WRITE_QUEUE_PAGES)
+            flush_rows: Buffered listings that trigger a flush
+                (defaults to Config.DAFT_WRITE_FLUSH_ROWS)
+            flush_seconds: Maximum age of buffered listings
+                (defaults to Config.DAFT_WRITE_FLUSH_SECONDS)
+            on_flush: Called with (pages, listings, rows_loaded) after each committed batch
+        """
+        self.load_fn = load_fn
+        self.on_flush = on_flush
+        self.flush_rows = flush_rows or Config.DAFT_WRITE_FLUSH_ROWS
+        self.flush_seconds = flush_seconds or Config.DAFT_WRITE_FLUSH_SECONDS
+        self.queue = queue.Queue(maxsize=max_pages or Config.DAFT_WRITE_QUEUE_PAGES)
+
+        self.total_loaded = 0
+        self.pages_written = 0
+        self.batches = 0
+        self.errors = []
+
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def start(self):
+        """Start the writer thread"""
+        if self._thread is None:
+            # Run in a copy of the caller's context, so a DB connection budget applies to the writer
+            context = contextvars.copy_context()
+            self._thread = threading.Thread(target=context.run, args=(self._run,),
+                                            name='daft-writer', daemon=True)
+            self._thread.start()
+
+    def submit(self, listings: List[Dict], page_num: Optional[int] = None):
+        """Queue a page of listings, blocking while the queue is full"""
+        self.start()
+        self.queue.put((page_num, listings))
+
+    async def submit_async(self, listings: List[Dict], page_num: Optional[int] = None):
+        """Queue a page of listings without blocking the event loop"""
+        self.start()
+        try:
+            self.queue.put_nowait((page_num, listings))
+        except queue.Full:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.queue.put, (page_num, listings))
+
+    def close(self) -> int:
+        """
+        Flush everything still queued and stop the writer thread
+
+        Returns:
+            Total number of rows inserted by this writer
+        """
+        if self._thread is not None:
+            self.queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+        if self.errors:
+            logger.error(f"Write-behind loader finished with {len(self.errors)} failed batch(es)")
+
+        logger.info(
+            f"Write-behind loader: {self.total_loaded} rows from {self.pages_written} pages "
+            f"in {self.batches} batches"
+        )
+        return self.total_loaded
+
+    def _run(self):
+        """Writer loop: coalesce queued pages and flush by size or age"""
+        buffer = []
+        pages = []
+        deadline = None
+
+        while True:
+            timeout = None if not pages else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                self._flush(buffer, pages)
+                buffer, pages = [], []
+                continue
+
+            if item is _STOP:
+                self._flush(buffer, pages)
+                break
+
+            page_num, listings = item
+            if not pages:
+                deadline = time.monotonic() + self.flush_seconds
+            buffer.extend(listings)
+            pages.append(page_num)
+
+            if len(buffer) >= self.flush_rows or time.monotonic() >= deadline:
+                self._flush(buffer, pages)
+                buffer, pages = [], []
+
+    def _flush(self, buffer: List[Dict], pages: List[Optional[int]]):
+        """Load one coalesced batch"""
+        if not pages:
+            return
+
+        page_range = f"{pages[0]}-{pages[-1]}" if len(pages) > 1 else f"{pages[0]}"
+        try:
+            with profiler.stage('daft.load'):
+                rows_loaded = self.load_fn(buffer) if buffer else 0
+            self.total_loaded += rows_loaded
+            self.pages_written += len(pages)
+            self.batches += 1
+            logger.info(f"💾 Loaded {rows_loaded} listings from page(s) {page_range} to database")
+        except Exception as e:
+            self.errors.append(e)
+            logger.error(f"Failed to load listings from page(s) {page_range}: {e}")
+            return
+
+        if self.on_flush and not self.errors:
+            try:
+                self.on_flush(pages, buffer, rows_loaded)
+            except Exception as e:
+                logger.warning(f"Flush callback failed for page(s) {page_range}: {e}")
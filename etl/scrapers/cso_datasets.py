@@ -0,0 +1,33 @@
+"""
+CSO dataset definitions - StatBank table IDs and the raw tables they load into
+Kept free of heavy imports so the pipeline scheduler can read it without
+loading the scraper (pandas, numpy, requests)
+"""
+
+# Dataset configurations with StatBank table IDs
+CSO_DATASETS = {
+    'rent': {
+        'code': 'RIA02',  # RTB Rent Index by Year, Type of Accommodation and County
+        'table': 'raw_cso_rent',
+        'date_column': 'year',
+        'description': 'RTB Private Rent Index'
+    },
+    'cpi': {
+        'code': 'CPM01',  # Consumer Price Index
+        'table': 'raw_cso_cpi',
+        'date_column': 'year',
+        'description': 'Consumer Price Index'
+    },
+    'population': {
+        'code': 'PEA01',  # Population Estimates
+        'table': 'raw_cso_population',
+        'date_column': 'year',
+        'description': 'Population Estimates'
+    },
+    'income': {
+        'code': 'CIA01',  # County Incomes and Regional GDP
+        'table': 'raw_cso_income',
+        'date_column': 'year',
+        'description': 'Household Income'
+    }
+}
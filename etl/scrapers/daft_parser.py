@@ -0,0 +1,248 @@
+"""
+Daft search page parsing - listings from rendered pages and data-route JSON
+Stateless module-level functions, so parse worker processes only import this
+module (no browser, database or scraper state)
+"""
+import json
+import re
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+
+from etl.utils.county import extract_county
+from etl.utils.logger import ensure_logger, get_logger
+
+logger = get_logger(__name__)
+
+try:
+    # Optional: several times faster than json for the __NEXT_DATA__ blob
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+_NON_PRICE_CHARS = re.compile(r'[^\d.]')
+_NON_DIGITS = re.compile(r'[^\d]')
+_LISTING_HREF = re.compile(r'/for-rent/.*/\d+')
+
+
+def extract_listings_from_data_route(body: bytes) -> Optional[List[Dict]]:
+    """
+    Extract listings from a Next.js data-route response
+
+    Returns:
+        Parsed listings, or None if the response has no pageProps.listings
+    """
+    page_props = _json_loads(body).get('pageProps') or {}
+    if 'listings' not in page_props:
+        return None
+
+    logger.info(f"Found {len(page_props['listings'])} listings in data route")
+    return parse_listings(page_props['listings'])
+
+
+def extract_listings_from_html(html_content: str) -> List[Dict]:
+    """Extract listings from HTML content"""
+    # Try to find __NEXT_DATA__ script (most reliable method)
+    next_data = find_next_data(html_content)
+
+    if next_data:
+        try:
+            data = _json_loads(next_data)
+            page_props = (data.get('props') or {}).get('pageProps') or {}
+            listings_data = page_props.get('listings') or []
+
+            logger.info(f"Found {len(listings_data)} listings in __NEXT_DATA__")
+
+            return parse_listings(listings_data)
+        except Exception as e:
+            logger.warning(f"Failed to parse __NEXT_DATA__: {e}, falling back to HTML parsing")
+
+    # BeautifulSoup/lxml are only needed on this fallback path
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, 'lxml')
+    listings = []
+
+    # Fallback: HTML parsing if JSON extraction fails
+    logger.warning("__NEXT_DATA__ not found, trying HTML parsing")
+    cards = (
+        soup.find_all('div', {'data-testid': 'search-result'}) or
+        soup.find_all('div', {'data-testid': 'listing'}) or
+        soup.find_all('a', href=_LISTING_HREF)
+    )
+
+    if not cards:
+        logger.warning("No listing cards found on page")
+        return []
+
+    logger.info(f"Found {len(cards)} listing cards via HTML parsing")
+
+    for card in cards:
+        listing = parse_listing_card(card)
+        if listing:
+            listings.append(listing)
+
+    return listings
+
+
+def find_next_data(html_content: str) -> Optional[str]:
+    """
+    Text of the __NEXT_DATA__ script, located by string offsets
+
+    Falls back to a parse restricted to that one script tag when the markup
+    doesn't match the expected shape.
+    """
+    marker = html_content.find('id="__NEXT_DATA__"')
+    if marker != -1:
+        start = html_content.find('>', marker) + 1
+        end = html_content.find('</script>', start)
+        if start and end != -1:
+            return html_content[start:end]
+
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    strained = BeautifulSoup(html_content, 'lxml',
+                             parse_only=SoupStrainer('script', id='__NEXT_DATA__'))
+    script_tag = strained.find('script')
+    return str(script_tag.string) if script_tag and script_tag.string else None
+
+
+def parse_listings(listings_data: List[Dict]) -> List[Dict]:
+    """Parse the pageProps.listings array of a search results page"""
+    # One timestamp per page rather than per listing
+    scraped_at = datetime.now().isoformat()
+
+    listings = []
+    for item in listings_data:
+        listing = parse_listing_json(item.get('listing') or {}, scraped_at)
+        if listing:
+            listings.append(listing)
+    return listings
+
+
+def parse_listing_json(listing_data: Dict, scraped_at: str = None) -> Optional[Dict]:
+    """
+    Extract all data from JSON listing object
+
+    Args:
+        listing_data: One listing from pageProps.listings[].listing
+        scraped_at: ISO timestamp shared by the page (defaults to now)
+    """
+    try:
+        get = listing_data.get
+
+        coordinates = (get('point') or {}).get('coordinates') or ()
+        longitude = coordinates[0] if len(coordinates) > 0 else None
+        latitude = coordinates[1] if len(coordinates) > 1 else None
+
+        seller = get('seller') or {}
+        media = get('media') or {}
+
+        price_raw = get('price')
+        abbreviated_price = get('abbreviatedPrice')
+        bedrooms_text = get('numBedrooms')
+        title = get('title')
+        seo_friendly_path = get('seoFriendlyPath')
+
+        return {
+            'property_id': get('id'),
+            'daft_shortcode': get('daftShortcode'),
+            'title': title,
+            'seo_title': get('seoTitle'),
+            'price': parse_price(abbreviated_price if 'abbreviatedPrice' in listing_data
+                                 else price_raw),
+            'price_raw': price_raw,
+            'abbreviated_price': abbreviated_price,
+            'property_type': get('propertyType'),
+            'bedrooms': parse_number(bedrooms_text),
+            'num_bedrooms_raw': bedrooms_text,
+            'county': extract_county(title) if title else None,
+            'sections': ','.join(get('sections') or ()),
+            'sale_type': ','.join(get('saleType') or ()),
+            'publish_date': get('publishDate'),
+            'date_of_construction': get('dateOfConstruction'),
+            'category': get('category'),
+            'state': get('state'),
+            'featured_level': get('featuredLevel'),
+            'featured_level_full': get('featuredLevelFull'),
+            'premier_partner': get('premierPartner'),
+            'latitude': latitude,
+            'longitude': longitude,
+            'seo_friendly_path': seo_friendly_path,
+            'seller_id': seller.get('sellerId'),
+            'seller_name': seller.get('name'),
+            'seller_phone': seller.get('phone'),
+            'seller_branch': seller.get('branch'),
+            'seller_type': seller.get('sellerType'),
+            'licence_number': seller.get('licenceNumber'),
+            'total_images': media.get('totalImages'),
+            'has_video': media.get('hasVideo'),
+            'has_virtual_tour': media.get('hasVirtualTour'),
+            'has_brochure': media.get('hasBrochure'),
+            'ber_rating': (get('ber') or {}).get('rating'),
+            'prs_total_unit_types': get('prsTotalUnitTypes'),
+            'prs_tagline': get('prsTagline'),
+            'property_url': f"https://www.daft.ie{seo_friendly_path or ''}",
+            'scraped_at': scraped_at or datetime.now().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Error parsing listing JSON: {e}")
+        return None
+
+
+def parse_listing_card(card) -> Optional[Dict]:
+    """Fallback HTML parsing"""
+    try:
+        return {
+            'property_id': None,
+            'title': card.get_text(strip=True)[:200] if card else None,
+            'scraped_at': datetime.now().isoformat()
+        }
+    except Exception:
+        return None
+
+
+def parse_price(price_text) -> Optional[float]:
+    """Parse price from text"""
+    if not price_text:
+        return None
+    try:
+        price_str = str(price_text).replace('€', '').replace(',', '').strip()
+        return float(_NON_PRICE_CHARS.sub('', price_str))
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_number(text) -> Optional[int]:
+    """Parse number from text"""
+    if not text:
+        return None
+    try:
+        return int(_NON_DIGITS.sub('', str(text)))
+    except (ValueError, TypeError):
+        return None
+
+
+def init_parse_worker():
+    """Parse pool initializer: configure logging once, before the first page arrives"""
+    ensure_logger()
+
+
+def parse_in_worker(parser, payload) -> Tuple[Optional[List[str]], Optional[List[tuple]]]:
+    """
+    Parse a page in a worker process
+
+    Args:
+        parser: extract_listings_from_html or extract_listings_from_data_route
+        payload: Page HTML or data-route response body
+
+    Returns:
+        (columns, rows) with one tuple per listing - smaller to pickle than a
+        list of dicts - or (None, None) if the parser returned None
+    """
+    listings = parser(payload)
+    if listings is None:
+        return None, None
+
+    columns = list(listings[0]) if listings else []
+    return columns, [tuple(listing.get(column) for column in columns) for listing in listings]
@@ -0,0 +1,379 @@
+"""
+Sharded Daft scraping - splits the rental search into independent partitions
+Each county is its own search; counties too large for one shard are split into
+price bands. Shards are balanced across worker processes, each driving its own
+browser, and the merged results are deduplicated before loading
+"""
+import asyncio
+import json
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import List, Dict, Optional, Any, Callable, Awaitable, Tuple
+
+from etl.config import Config
+from etl.utils.checkpoints import CheckpointStore
+from etl.utils.county import IRISH_COUNTIES
+from etl.utils.logger import get_logger
+from etl.utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+PAGE_SIZE = 20
+DEDUP_KEY = ('property_id', 'publish_date')
+
+
+def county_shards() -> List[Dict[str, Any]]:
+    """One shard per county search path"""
+    return [
+        {'name': county, 'path': county.lower(), 'filters': {}, 'expected': None}
+        for county in IRISH_COUNTIES
+    ]
+
+
+def split_by_price(shard: Dict[str, Any], edges: List[int]) -> List[Dict[str, Any]]:
+    """
+    Split a shard into rent bands
+
+    Bands share their edges (Daft price filters are inclusive), so a listing
+    priced exactly on an edge can appear in two bands; the merge removes it.
+
+    Args:
+        shard: Shard to split
+        edges: Ascending band edges in EUR/month
+
+    Returns:
+        One shard per band, the first open below and the last open above
+    """
+    bounds = [None] + sorted(edges) + [None]
+    bands = []
+    for low, high in zip(bounds, bounds[1:]):
+        filters = dict(shard['filters'])
+        if low is not None:
+            filters['rentalPrice_from'] = low
+        if high is not None:
+            filters['rentalPrice_to'] = high
+        label = f"{low or 0}-{high}" if high is not None else f"{low}+"
+        bands.append({'name': f"{shard['name']} €{label}", 'path': shard['path'],
+                      'filters': filters, 'expected': None})
+    return bands
+
+
+async def plan_shards(probe: Callable[[str, Dict[str, Any]], Awaitable[Optional[int]]],
+                      max_listings: int = None,
+                      price_bands: List[int] = None) -> List[Dict[str, Any]]:
+    """
+    Build shards sized from each search's reported result count
+
+    Args:
+        probe: Coroutine returning a search's total results for (path, filters)
+        max_listings: Shards above this are split into price bands
+            (defaults to Config.DAFT_SHARD_MAX_LISTINGS)
+        price_bands: Band edges (defaults to Config.DAFT_SHARD_PRICE_BANDS)
+
+    Returns:
+        Non-empty shards with their expected listing counts (None if the probe failed)
+    """
+    max_listings = max_listings or Config.DAFT_SHARD_MAX_LISTINGS
+    price_bands = price_bands or Config.DAFT_SHARD_PRICE_BANDS
+
+    shards = []
+    for shard in county_shards():
+        shard['expected'] = await probe(shard['path'], shard['filters'])
+        if shard['expected'] == 0:
+            continue
+
+        if shard['expected'] and shard['expected'] > max_listings and price_bands:
+            bands = split_by_price(shard, price_bands)
+            for band in bands:
+                band['expected'] = await probe(band['path'], band['filters'])
+            shards.extend(band for band in bands if band['expected'] != 0)
+            logger.info(f"Shard {shard['name']}: {shard['expected']} listings, "
+                        f"split into {len(bands)} price bands")
+        else:
+            shards.append(shard)
+
+    return shards
+
+
+def assign_shards(shards: List[Dict[str, Any]], workers: int) -> List[List[Dict[str, Any]]]:
+    """
+    Balance shards across workers by expected size (longest-processing-time first)
+
+    Shards are taken largest first and each goes to the currently lightest
+    worker. Shards whose size is unknown are weighted as the largest known one,
+    so a failed probe cannot pile work onto a single worker.
+
+    Returns:
+        One list of shards per worker (empty workers are dropped)
+    """
+    known = [s['expected'] for s in shards if s['expected'] is not None]
+    fallback = max(known) if known else 1
+
+    def weight(shard):
+        return shard['expected'] if shard['expected'] is not None else fallback
+
+    groups = [[] for _ in range(max(1, workers))]
+    loads = [0] * len(groups)
+    for shard in sorted(shards, key=weight, reverse=True):
+        lightest = loads.index(min(loads))
+        groups[lightest].append(shard)
+        loads[lightest] += weight(shard)
+
+    return [group for group in groups if group]
+
+
+def merge_shard_results(results: List[Dict[str, Any]]) -> Tuple[List[Dict], int]:
+    """
+    Merge shard listings, keeping the first of each (property_id, publish_date)
+
+    Returns:
+        (merged listings, number of duplicates removed)
+    """
+    merged = {}
+    duplicates = 0
+    for result in results:
+        for listing in result['listings']:
+            key = tuple(listing.get(col) for col in DEDUP_KEY)
+            if key in merged:
+                duplicates += 1
+            else:
+                merged[key] = listing
+    return list(merged.values()), duplicates
+
+
+def coverage_report(results: List[Dict[str, Any]], merged: List[Dict], duplicates: int,
+                    reference_total: Optional[int],
+                    reference_listings: List[Dict] = None) -> Dict[str, Any]:
+    """
+    Compare the sharded crawl with the single-list crawl
+
+    Args:
+        results: Per-shard results (shard, listings, pages, seconds, error)
+        merged: Deduplicated listings
+        duplicates: Duplicates removed by the merge
+        reference_total: totalResults of the unsharded search
+        reference_listings: Listings of a full single-list crawl, if one was run
+
+    Returns:
+        Report dict; 'complete' is True when nothing was lost
+    """
+    shards = []
+    for result in results:
+        shard = result['shard']
+        collected = len(result['listings'])
+        shards.append({
+            'name': shard['name'],
+            'path': shard['path'],
+            'filters': shard['filters'],
+            'expected': shard['expected'],
+            'collected': collected,
+            'pages': result['pages'],
+            'seconds': round(result['seconds'], 1),
+            'error': result['error'],
+            'short': shard['expected'] is not None and collected < shard['expected']
+        })
+
+    report = {
+        'generated_at': datetime.now().isoformat(),
+        'reference_total': reference_total,
+        'shard_expected_total': sum(s['expected'] or 0 for s in shards),
+        'collected': sum(s['collected'] for s in shards),
+        'unique': len(merged),
+        'duplicates_removed': duplicates,
+        'failed_shards': [s['name'] for s in shards if s['error']],
+        'short_shards': [s['name'] for s in shards if s['short']],
+        'shards': shards
+    }
+
+    complete = not report['failed_shards'] and not report['short_shards']
+    if reference_total is not None:
+        report['missing_vs_reference_total'] = max(0, reference_total - len(merged))
+        complete = complete and report['missing_vs_reference_total'] == 0
+
+    if reference_listings is not None:
+        merged_keys = {tuple(listing.get(col) for col in DEDUP_KEY) for listing in merged}
+        missing = [listing for listing in reference_listings
+                   if tuple(listing.get(col) for col in DEDUP_KEY) not in merged_keys]
+        report['reference_crawled'] = len(reference_listings)
+        report['missing_vs_reference_crawl'] = len(missing)
+        report['missing_property_ids'] = sorted({str(listing.get('property_id'))
+                                                 for listing in missing})[:100]
+        complete = complete and not missing
+
+    report['complete'] = complete
+    return report
+
+
+def _scrape_shard_group(shards: List[Dict[str, Any]], max_rps: float,
+                        headless: bool) -> List[Dict[str, Any]]:
+    """
+    Worker process entry point: scrape a group of shards on one browser
+
+    A failing shard is reported and the worker moves on to the next one.
+    """
+    return asyncio.run(_scrape_shard_group_async(shards, max_rps, headless))
+
+
+async def _scrape_shard_group_async(shards: List[Dict[str, Any]], max_rps: float,
+                                    headless: bool) -> List[Dict[str, Any]]:
+    from etl.scrapers.smart_daft_scraper import SmartDaftScraper
+
+    results = []
+    async with SmartDaftScraper(headless=headless, max_rps=max_rps) as scraper:
+        for shard in shards:
+            scraper.search_path = shard['path']
+            scraper.search_filters = dict(shard['filters'])
+            # The data route is keyed by search path; re-learn the build id per shard
+            scraper.build_id = None
+
+            max_pages = math.ceil(shard['expected'] / PAGE_SIZE) + 1 if shard['expected'] else None
+            start = time.monotonic()
+            result = {'shard': shard, 'listings': [], 'pages': 0, 'seconds': 0.0, 'error': None}
+            try:
+                logger.info(f"🧩 Shard {shard['name']}: expecting {shard['expected']} listings")
+                metrics_before = len(scraper.page_metrics)
+                result['listings'] = await scraper.collect_listings(max_pages=max_pages)
+                result['pages'] = len({m['page'] for m in scraper.page_metrics[metrics_before:]})
+            except Exception as e:
+                result['error'] = str(e)
+                logger.error(f"Shard {shard['name']} failed: {e}")
+            result['seconds'] = time.monotonic() - start
+            logger.info(f"🧩 Shard {shard['name']}: {len(result['listings'])} listings "
+                        f"in {result['seconds']:.0f}s")
+            metrics.record('daft', 'crawl', result['seconds'], calls=result['pages'],
+                           rows=len(result['listings']), errors=1 if result['error'] else 0)
+            # This process's metrics go back to the parent with the shard
+            result['metrics'] = metrics.snapshot(reset=True)
+            results.append(result)
+
+    return results
+
+
+def scrape_shards(shards: List[Dict[str, Any]], workers: int = None,
+                  headless: bool = True) -> List[Dict[str, Any]]:
+    """
+    Scrape shards on worker processes, one browser per worker
+
+    The overall request rate stays at Config.DAFT_MAX_RPS: each worker gets an
+    equal share of it.
+
+    Returns:
+        Per-shard results (shard, listings, pages, seconds, error)
+    """
+    workers = max(1, workers or Config.DAFT_SHARD_WORKERS)
+    groups = assign_shards(shards, workers)
+    max_rps = Config.DAFT_MAX_RPS / len(groups) if Config.DAFT_MAX_RPS > 0 else 0
+
+    for i, group in enumerate(groups, start=1):
+        logger.info(
+            f"Worker {i}: {len(group)} shard(s), "
+            f"~{sum(s['expected'] or 0 for s in group)} listings "
+            f"({', '.join(s['name'] for s in group)})"
+        )
+
+    results = []
+    # spawn: a fork of a process that already runs an event loop and browser is unsafe
+    with ProcessPoolExecutor(max_workers=len(groups),
+                             mp_context=multiprocessing.get_context('spawn')) as pool:
+        futures = {pool.submit(_scrape_shard_group, group, max_rps, headless): group
+                   for group in groups}
+        for future in as_completed(futures):
+            try:
+                for result in future.result():
+                    metrics.merge(result.pop('metrics', {}))
+                    results.append(result)
+            except Exception as e:
+                # The whole worker died (e.g. the browser crashed): report each of its shards
+                for shard in futures[future]:
+                    results.append({'shard': shard, 'listings': [], 'pages': 0, 'seconds': 0.0,
+                                    'error': str(e)})
+                logger.error(f"Shard worker failed: {e}")
+
+    return results
+
+
+def write_coverage_report(report: Dict[str, Any]):
+    """Log the coverage summary and write the full report to the logs directory"""
+    path = Config.LOGS_DIR / 'daft_shard_coverage.json'
+    path.write_text(json.dumps(report, indent=2, default=str))
+
+    status = "✅ complete" if report['complete'] else "⚠️  INCOMPLETE"
+    logger.info(
+        f"Shard coverage {status}: {report['unique']} unique listings "
+        f"(reference total {report['reference_total']}, "
+        f"{report['duplicates_removed']} duplicates removed)"
+    )
+    if 'missing_vs_reference_crawl' in report:
+        logger.info(f"   vs. single-list crawl: {report['reference_crawled']} crawled, "
+                    f"{report['missing_vs_reference_crawl']} missing from shards")
+    for name in report['failed_shards']:
+        logger.warning(f"   Shard failed: {name}")
+    for name in report['short_shards']:
+        logger.warning(f"   Shard short of its expected count: {name}")
+    logger.info(f"   Report written to {path}")
+
+
+async def run_sharded_scrape(workers: int = None, verify: bool = False,
+                             headless: bool = True) -> Dict[str, Any]:
+    """
+    Full Daft scrape split into shards across worker processes
+
+    Args:
+        workers: Worker processes (defaults to Config.DAFT_SHARD_WORKERS)
+        verify: Also crawl the single unsharded list and report listings the shards missed
+        headless: Run Chromium headless
+
+    Returns:
+        Coverage report, plus 'loaded' (rows inserted)
+    """
+    from etl.scrapers.smart_daft_scraper import SmartDaftScraper
+    from etl.loaders.data_loader import DataLoader
+
+    checkpoints = CheckpointStore('daft')
+    start = time.monotonic()
+
+    # Plan on one browser: the unsharded total, then each shard's size
+    async with SmartDaftScraper(headless=headless) as planner:
+        reference_total = await planner.probe_total_results()
+        logger.info(f"Unsharded search reports {reference_total} listings")
+        shards = await plan_shards(planner.probe_total_results)
+        reference_listings = await planner.collect_listings() if verify else None
+
+    logger.info(f"🧩 {len(shards)} shards planned")
+    try:
+        checkpoints.start_run('sharded')
+    except Exception as e:
+        logger.warning(f"Checkpoint start_run failed: {e}")
+
+    results = await asyncio.to_thread(scrape_shards, shards, workers, headless)
+
+    merged, duplicates = merge_shard_results(results)
+    report = coverage_report(results, merged, duplicates, reference_total, reference_listings)
+    write_coverage_report(report)
+
+    # to_thread copies the context, so the load draws from the caller's connection budget
+    loaded = await asyncio.to_thread(DataLoader().load_daft_listings, merged) if merged else 0
+    report['loaded'] = loaded
+
+    # The watermark only advances when every shard finished: a failed or short shard
+    # has listings older than the new watermark that the next incremental run would skip
+    try:
+        publish_dates = [listing['publish_date'] for listing in merged
+                         if listing.get('publish_date')]
+        checkpoints.advance(page=0, max_publish_date=max(publish_dates) if publish_dates else None,
+                            rows=loaded)
+        unfinished = report['failed_shards'] + report['short_shards']
+        if unfinished:
+            checkpoints.fail(f"{len(report['failed_shards'])} shard(s) failed, "
+                             f"{len(report['short_shards'])} short of their expected count")
+        else:
+            checkpoints.complete()
+    except Exception as e:
+        logger.warning(f"Checkpoint update failed: {e}")
+
+    logger.info(f"✅ Sharded scrape: {loaded} listings loaded from {len(shards)} shards "
+                f"in {time.monotonic() - start:.0f}s")
+    return report
@@ -0,0 +1,117 @@
+"""
+Request interception for scraper browser contexts
+Aborts images, fonts, stylesheets, trackers and map tiles the scrapers never read
+"""
+from typing import Dict, List, Any
+
+from etl.config import Config
+from etl.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ResourceBlocker:
+    """
+    Playwright context.route handler that aborts unneeded requests
+
+    Requests are blocked by resource type or URL substring; URLs matching the
+    allowlist (e.g. the Cloudflare challenge) always pass. Modes:
+      - 'block':   abort matching requests
+      - 'measure': let everything through, but tally the bytes blocking would save
+      - 'off':     no interception
+
+    Per-tab counters (requests blocked, bytes transferred, bytes that were
+    blockable) are collected with take_stats() after each page.
+    """
+
+    def __init__(self, resource_types: List[str], url_patterns: List[str],
+                 allowlist: List[str], mode: str = 'block'):
+        """
+        Args:
+            resource_types: Playwright resource types to block (e.g. 'image', 'font')
+            url_patterns: URL substrings to block (e.g. 'googletagmanager.com')
+            allowlist: URL substrings that are never blocked
+            mode: 'block', 'measure' or 'off'
+        """
+        self.resource_types = set(resource_types)
+        self.url_patterns = list(url_patterns)
+        self.allowlist = list(allowlist)
+        self.mode = mode
+
+        self.page_stats = {}
+        self.totals = self._empty_stats()
+
+    @classmethod
+    def from_config(cls) -> 'ResourceBlocker':
+        """Build a blocker from the DAFT_BLOCK_* settings"""
+        return cls(
+            resource_types=Config.DAFT_BLOCKED_RESOURCE_TYPES,
+            url_patterns=Config.DAFT_BLOCKED_URL_PATTERNS,
+            allowlist=Config.DAFT_BLOCK_ALLOWLIST,
+            mode=Config.DAFT_BLOCK_MODE
+        )
+
+    async def install(self, context):
+        """Register the route handler and byte accounting on a browser context"""
+        if self.mode == 'off':
+            return
+
+        if self.mode == 'block':
+            await context.route('**/*', self._route)
+        context.on('requestfinished', self._on_request_finished)
+
+        logger.info(
+            f"Resource blocking ({self.mode}): types={sorted(self.resource_types)}, "
+            f"{len(self.url_patterns)} URL pattern(s), {len(self.allowlist)} allowlisted"
+        )
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        """Whether a request of this type and URL is blocked"""
+        if any(allowed in url for allowed in self.allowlist):
+            return False
+        return (resource_type in self.resource_types
+                or any(pattern in url for pattern in self.url_patterns))
+
+    async def _route(self, route):
+        """Abort blocked requests, continue everything else"""
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            stats = self._stats_for(request)
+            stats['requests_blocked'] += 1
+            self.totals['requests_blocked'] += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _on_request_finished(self, request):
+        """Add a finished request's transfer size to its tab's counters"""
+        try:
+            sizes = await request.sizes()
+            transferred = sizes.get('responseBodySize', 0) + sizes.get('responseHeadersSize', 0)
+        except Exception:
+            return
+
+        blockable = self.mode == 'measure' and self.should_block(request.resource_type, request.url)
+        for stats in (self._stats_for(request), self.totals):
+            stats['bytes_transferred'] += transferred
+            if blockable:
+                stats['requests_blockable'] += 1
+                stats['bytes_blockable'] += transferred
+
+    def take_stats(self, page) -> Dict[str, int]:
+        """Counters for a tab since the last call, then reset them"""
+        return self.page_stats.pop(page, None) or self._empty_stats()
+
+    def _stats_for(self, request) -> Dict[str, int]:
+        """Counters of the tab that issued a request"""
+        try:
+            page = request.frame.page
+        except Exception:
+            # Service worker requests have no frame
+            page = None
+        return self.page_stats.setdefault(page, self._empty_stats())
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, Any]:
+        return {'requests_blocked': 0, 'bytes_transferred': 0,
+                'requests_blockable': 0, 'bytes_blockable': 0}
@@ -2,15 +2,30 @@
 Smart CSO Data Scraper with Dynamic Full/Incremental Loading
 Automatically detects existing data and only fetches new records
 """
+import contextvars
+import json
+import ijson
+import itertools
+import os
 import requests
+import numpy as np
 import pandas as pd
-from datetime import datetime
-from typing import Optional, Dict, List
-import io
-
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Optional, Dict, List, Tuple, Any, Iterator
+
+from etl.config import Config
 from etl.utils.logger import get_logger
 from etl.utils.database import db
+from etl.utils.http_cache import HTTPCache
+from etl.utils.metrics import metrics
+from etl.utils.profiling import profiler
 from etl.loaders.data_loader import DataLoader
+from etl.scrapers.cso_datasets import CSO_DATASETS
 
 logger = get_logger(__name__)
 
@@ -23,37 +38,29 @@ class SmartCSOScraper:
 
     # PxStat API endpoint (JSON-stat 2.0 format)
     BASE_URL = "https://ws.cso.ie/public/api.restful/PxStat.Data.Cube_API.ReadDataset"
+    # JSON-RPC endpoint, used for metadata and dimension-filtered queries
+    JSONRPC_URL = "https://ws.cso.ie/public/api.jsonrpc"
 
-    # Dataset configurations with StatBank table IDs
-    DATASETS = {
-        'rent': {
-            'code': 'RIA02',  # RTB Rent Index by Year, Type of Accommodation and County
-            'table': 'raw_cso_rent',
-            'date_column': 'year',
-            'description': 'RTB Private Rent Index'
-        },
-        'cpi': {
-            'code': 'CPM01',  # Consumer Price Index
-            'table': 'raw_cso_cpi',
-            'date_column': 'year',
-            'description': 'Consumer Price Index'
-        },
-        'population': {
-            'code': 'PEA01',  # Population Estimates
-            'table': 'raw_cso_population',
-            'date_column': 'year',
-            'description': 'Population Estimates'
-        },
-        'income': {
-            'code': 'CIA01',  # County Incomes and Regional GDP
-            'table': 'raw_cso_income',
-            'date_column': 'year',
-            'description': 'Household Income'
-        }
+    HEADERS = {
+        'Accept': 'application/json',
+        'User-Agent': 'Mozilla/5.0 (compatible; Ireland Housing Data Platform/1.0)'
     }
 
+    # Dataset configurations with StatBank table IDs (see etl.scrapers.cso_datasets)
+    DATASETS = CSO_DATASETS
+
     def __init__(self):
         self.loader = DataLoader()
+        # Limits concurrent loads so parallel datasets don't exhaust the connection pool
+        self.load_slots = threading.BoundedSemaphore(Config.CSO_DB_CONNECTIONS)
+        self.cache = HTTPCache(
+            Config.CACHE_DIR / "cso",
+            max_bytes=Config.CSO_CACHE_MAX_MB * 1024 * 1024,
+            max_entries=Config.CSO_CACHE_MAX_ENTRIES
+        ) if Config.CSO_CACHE_ENABLED else None
+        # Bytes downloaded and parse time per dataset code for the current run
+        self.transfer_stats = {}
+        self._transfer_lock = threading.Lock()
         logger.info("Initialized Smart CSO Scraper")
 
     def _check_existing_data(self, dataset_key: str) -> tuple[bool, Optional[int]]:
@@ -96,9 +103,10 @@ class SmartCSOScraper:
             logger.warning(f"[{dataset_key.upper()}] Could not check existing data: {e}")
             return False, None
 
-    def _fetch_cso_dataset(self, dataset_code: str, api_method: str = None) -> Optional[pd.DataFrame]:
+    def _fetch_cso_dataset(self, dataset_code: str,
+                           api_method: str = None) -> Optional[pd.DataFrame]:
         """
-        Fetch complete dataset from CSO PxStat API
+        Fetch complete dataset from CSO PxStat API as a single DataFrame
 
         Args:
             dataset_code: CSO dataset code (e.g., 'RIA02', 'CPM01')
@@ -107,42 +115,223 @@ class SmartCSOScraper:
         Returns:
             DataFrame with all available data
         """
+        chunks = self._fetch_cso_stream(dataset_code)
+        if chunks is None:
+            return None
+
         try:
-            # PxStat API: JSON-stat 2.0 format
-            url = f"{self.BASE_URL}/{dataset_code}/JSON-stat/2.0/en"
-            logger.info(f"Fetching from PxStat API: {url}")
+            frames = list(chunks)
+        except Exception as e:
+            logger.error(f"Failed to parse {dataset_code}: {e}")
+            return None
 
-            headers = {
-                'Accept': 'application/json',
-                'User-Agent': 'Mozilla/5.0 (compatible; Ireland Housing Data Platform/1.0)'
-            }
+        if not frames:
+            logger.warning(f"No data in response from {dataset_code}")
+            return None
+
+        df = pd.concat(frames, ignore_index=True)
+        logger.info(f"Fetched {len(df)} records from {dataset_code}")
+        return df
+
+    def _fetch_cso_stream(self, dataset_code: str,
+                          skip_unchanged: bool = False) -> Optional[Iterator[pd.DataFrame]]:
+        """
+        Download a dataset and decode it lazily in chunks
+
+        Args:
+            dataset_code: CSO dataset code (e.g., 'RIA02', 'CPM01')
+            skip_unchanged: Yield nothing when the dataset is not modified
+                and its cached copy has already been loaded
+
+        Returns:
+            Iterator of DataFrame chunks, or None if the download failed
+        """
+        try:
+            path, temporary = self._download_cso_dataset(dataset_code,
+                                                         skip_unchanged=skip_unchanged)
+        except Exception as e:
+            logger.error(f"Failed to fetch {dataset_code}: {e}")
+            import traceback
+            logger.error(traceback.format_exc())
+            return None
+
+        if path is None:
+            logger.info(f"ℹ️  {dataset_code} unchanged since last load - skipping parse and load")
+            return iter(())
+
+        return self._iter_jsonstat_file(path, dataset_code, delete=temporary)
+
+    def _download_cso_dataset(self, dataset_code: str,
+                              skip_unchanged: bool = False) -> Tuple[Optional[Path], bool]:
+        """
+        Stream a dataset's JSON-stat body to disk from the PxStat API
+
+        Cached responses are revalidated with If-None-Match/If-Modified-Since;
+        on 304 Not Modified the cached body is used instead of downloading again.
+
+        Args:
+            dataset_code: CSO dataset code (e.g., 'RIA02', 'CPM01')
+            skip_unchanged: Return no path when the dataset is not modified
+                and its cached copy has already been loaded
+
+        Returns:
+            (path to the body or None if skipped, True if the file is temporary
+            and should be deleted after parsing)
+        """
+        # PxStat API: JSON-stat 2.0 format
+        url = f"{self.BASE_URL}/{dataset_code}/JSON-stat/2.0/en"
+        logger.info(f"Fetching from PxStat API: {url}")
+
+        headers = dict(self.HEADERS)
+        cached = self.cache.get(dataset_code) if self.cache else None
+        if cached:
+            headers.update(self.cache.conditional_headers(dataset_code))
+
+        with requests.get(url, headers=headers, timeout=60, stream=True) as response:
+            if response.status_code == 304 and cached:
+                self.cache.record_hit(dataset_code)
+                logger.info(f"♻️  {dataset_code} not modified since last download (HTTP 304)")
+
+                if skip_unchanged and cached.get('loaded'):
+                    return None, False
+
+                body_path = self.cache.body_path(dataset_code)
+                if not body_path.exists():
+                    # Entry was evicted after revalidation - download it again
+                    return self._download_cso_dataset(dataset_code, skip_unchanged=skip_unchanged)
+                return body_path, False
 
-            response = requests.get(url, headers=headers, timeout=60)
             response.raise_for_status()
 
-            # Parse JSON-stat format
-            data = response.json()
+            # Write the body to disk as it arrives instead of holding it in memory
+            fd, tmp_name = tempfile.mkstemp(
+                prefix=f"{dataset_code}_", suffix='.json',
+                dir=self.cache.directory if self.cache else None
+            )
+            bytes_downloaded = 0
+            with os.fdopen(fd, 'wb') as f:
+                for block in response.iter_content(chunk_size=1024 * 1024):
+                    f.write(block)
+                    bytes_downloaded += len(block)
+
+        self._record_transfer(dataset_code, bytes_downloaded, 0.0)
+        logger.info(f"Downloaded {bytes_downloaded / 1024 / 1024:.1f} MB for {dataset_code}")
+
+        if self.cache:
+            self.cache.record_miss(dataset_code)
+            self.cache.store_file(dataset_code, Path(tmp_name), response.headers)
+            return self.cache.body_path(dataset_code), False
 
-            # Convert JSON-stat to DataFrame
+        return Path(tmp_name), True
+
+    def _fetch_cso_periods(self, dataset_code: str, latest_year: int) -> Optional[pd.DataFrame]:
+        """
+        Fetch only the time periods after latest_year using a PxStat JSON-RPC query
+
+        The cube's metadata is read first to find its TLIST dimension and period
+        codes; the dataset is then requested with a dimension filter on the
+        periods whose year is greater than latest_year.
+
+        Args:
+            dataset_code: CSO dataset code (e.g., 'RIA02', 'CPM01')
+            latest_year: Latest year already in the database
+
+        Returns:
+            DataFrame with the new periods (empty if there are none),
+            or None if the filtered query failed
+        """
+        try:
+            metadata, metadata_bytes = self._jsonrpc('PxStat.Data.Cube_API.ReadMetadata', {
+                'matrix': dataset_code,
+                'language': 'en',
+                'format': {'type': 'JSON-stat', 'version': '2.0'}
+            })
+
+            dim_info = self._jsonstat_dimensions(metadata)
+            time_dim = next((d for d in dim_info if d['id'].startswith('TLIST(')), None)
+            if time_dim is None:
+                logger.warning(f"No TLIST dimension in {dataset_code} metadata")
+                return None
+
+            years = pd.to_numeric(pd.Series(time_dim['values'], dtype=str).str[:4], errors='coerce')
+            new_periods = [code for code, year in zip(time_dim['values'], years)
+                           if year > latest_year]
+
+            if not new_periods:
+                self._record_transfer(dataset_code, metadata_bytes, 0.0)
+                logger.info(f"No periods after {latest_year} in {dataset_code} "
+                            f"({metadata_bytes / 1024:.1f} KB metadata)")
+                return pd.DataFrame()
+
+            logger.info(f"Requesting {len(new_periods)} period(s) of {time_dim['id']} "
+                        f"after {latest_year} from {dataset_code}")
+            data, data_bytes = self._jsonrpc('PxStat.Data.Cube_API.ReadDataset', {
+                'class': 'query',
+                'id': [time_dim['id']],
+                'dimension': {time_dim['id']: {'category': {'index': new_periods}}},
+                'extension': {
+                    'pivot': None,
+                    'codes': False,
+                    'language': {'code': 'en'},
+                    'format': {'type': 'JSON-stat', 'version': '2.0'},
+                    'matrix': dataset_code
+                },
+                'version': '2.0'
+            })
+
+            parse_start = time.perf_counter()
             df = self._parse_jsonstat(data)
+            parse_seconds = time.perf_counter() - parse_start
+            self._record_transfer(dataset_code, metadata_bytes + data_bytes, parse_seconds)
 
-            if df is not None and not df.empty:
-                logger.info(f"Fetched {len(df)} records from {dataset_code}")
-                return df
-            else:
-                logger.warning(f"No data in response from {dataset_code}")
+            if df is None:
                 return None
 
+            logger.info(
+                f"Fetched {len(df)} records from {dataset_code} with server-side time filter "
+                f"({(metadata_bytes + data_bytes) / 1024:.1f} KB transferred, "
+                f"parsed in {parse_seconds:.2f}s)"
+            )
+            return df
+
         except Exception as e:
-            logger.error(f"Failed to fetch {dataset_code}: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.warning(f"Filtered query for {dataset_code} failed: {e}")
             return None
 
+    def _jsonrpc(self, method: str, params: Dict[str, Any]) -> Tuple[Dict, int]:
+        """
+        Call a PxStat JSON-RPC method
+
+        Returns:
+            (result, response size in bytes)
+        """
+        payload = {'jsonrpc': '2.0', 'method': method, 'params': params,
+                   'id': int(time.time() * 1000)}
+        response = requests.post(self.JSONRPC_URL, json=payload, headers=self.HEADERS, timeout=60)
+        response.raise_for_status()
+
+        body = response.content
+        data = json.loads(body)
+        if 'error' in data:
+            raise RuntimeError(f"{method} error: {data['error']}")
+
+        return data['result'], len(body)
+
+    def _record_transfer(self, dataset_code: str, bytes_downloaded: int, parse_seconds: float):
+        """Accumulate bytes downloaded and parse time for a dataset"""
+        with self._transfer_lock:
+            stats = self.transfer_stats.setdefault(dataset_code, {'bytes': 0, 'parse_seconds': 0.0})
+            stats['bytes'] += bytes_downloaded
+            stats['parse_seconds'] += parse_seconds
+
     def _parse_jsonstat(self, json_data: dict) -> Optional[pd.DataFrame]:
         """
         Parse JSON-stat 2.0 format response from PxStat API
 
+        Cell coordinates are decoded with stride arithmetic over the 'size' array
+        instead of materialising the cartesian product, and code/label columns are
+        built as Categoricals. Null cells are dropped before the frame is built.
+
         Args:
             json_data: JSON response from PxStat API
 
@@ -155,74 +344,11 @@ class SmartCSOScraper:
                 logger.error("Invalid JSON-stat format: missing dimension or value")
                 return None
 
-            dimensions = json_data['dimension']
-            values = json_data['value']
-
-            # Get dimension metadata
-            dim_roles = json_data.get('role', {})
-            dim_ids = json_data.get('id', [])
-
-            # Get size array to understand data structure
-            sizes = json_data.get('size', [])
-
-            # Build list of dimension info
-            dim_info = []
-            for dim_id in dim_ids:
-                dim = dimensions[dim_id]
-                categories = dim.get('category', {})
-                cat_index = categories.get('index', [])
-                cat_labels = categories.get('label', {})
+            dim_info = self._jsonstat_dimensions(json_data)
+            sizes = json_data.get('size') or [len(d['values']) for d in dim_info]
 
-                # Get category values in order
-                if isinstance(cat_index, list):
-                    cat_values = cat_index
-                else:
-                    # cat_index is a dict mapping values to positions
-                    cat_values = sorted(cat_index.keys(), key=lambda x: cat_index[x])
-
-                dim_info.append({
-                    'id': dim_id,
-                    'label': dim.get('label', dim_id),
-                    'values': cat_values,
-                    'labels': {v: cat_labels.get(v, v) for v in cat_values}
-                })
-
-            # Generate all combinations
-            import itertools
-            import numpy as np
-
-            # Create cartesian product
-            all_combos = list(itertools.product(*[d['values'] for d in dim_info]))
-
-            # Build rows
-            rows = []
-            for idx, combo in enumerate(all_combos):
-                if idx < len(values):
-                    row = {}
-                    for dim_idx, value in enumerate(combo):
-                        dim = dim_info[dim_idx]
-                        # Use both ID and label
-                        row[dim['id']] = value
-                        row[f"{dim['id']}_Label"] = dim['labels'].get(value, value)
-
-                    # Add the metric value
-                    row['VALUE'] = values[idx]
-                    rows.append(row)
-
-            df = pd.DataFrame(rows)
-
-            # Clean up column names and extract year
-            if 'TLIST(A1)' in df.columns:
-                # Annual data - extract year directly
-                df['Year'] = pd.to_numeric(df['TLIST(A1)'], errors='coerce').astype('Int64')
-            elif 'TLIST(M1)' in df.columns:
-                # Monthly data - extract year from YYYYMM format
-                df['Year'] = df['TLIST(M1)'].astype(str).str[:4]
-                df['Year'] = pd.to_numeric(df['Year'], errors='coerce').astype('Int64')
-            elif 'TLIST(Q1)' in df.columns:
-                # Quarterly data - extract year from format like "2024Q1"
-                df['Year'] = df['TLIST(Q1)'].astype(str).str[:4]
-                df['Year'] = pd.to_numeric(df['Year'], errors='coerce').astype('Int64')
+            indices, values = self._jsonstat_values(json_data['value'], int(np.prod(sizes)))
+            df = self._jsonstat_frame(dim_info, sizes, indices, values)
 
             logger.info(f"Parsed JSON-stat: {len(df)} rows, {len(df.columns)} columns")
             logger.info(f"Columns: {list(df.columns)}")
@@ -235,6 +361,216 @@ class SmartCSOScraper:
             logger.error(traceback.format_exc())
             return None
 
+    def _iter_jsonstat_file(self, path: Path, dataset_code: str, chunk_rows: int = None,
+                            delete: bool = False) -> Iterator[pd.DataFrame]:
+        """
+        Decode a JSON-stat 2.0 file in chunks without loading it into memory
+
+        The file is read twice with a streaming parser: first for the dimension
+        metadata, then for the 'value' member, which is decoded chunk_rows cells
+        at a time. Peak memory depends on chunk_rows, not on the cube size.
+
+        Args:
+            path: JSON-stat 2.0 document
+            dataset_code: CSO dataset code, for parse-time accounting
+            chunk_rows: Cells decoded per chunk (defaults to Config.CSO_STREAM_CHUNK_ROWS)
+            delete: Remove the file once it has been parsed
+
+        Yields:
+            DataFrames of at most chunk_rows records
+        """
+        chunk_rows = chunk_rows or Config.CSO_STREAM_CHUNK_ROWS
+        total_rows = 0
+        chunks = 0
+
+        try:
+            with open(path, 'rb') as f:
+                parse_start = time.perf_counter()
+                header, value_event = self._jsonstat_header(f)
+                if 'dimension' not in header or value_event is None:
+                    raise ValueError("Invalid JSON-stat format: missing dimension or value")
+
+                dim_info = self._jsonstat_dimensions(header)
+                sizes = header.get('size') or [len(d['values']) for d in dim_info]
+                total_cells = int(np.prod(sizes))
+
+                # Second pass: only the cells
+                f.seek(0)
+                sparse = value_event == 'start_map'
+                if sparse:
+                    cells = ijson.kvitems(f, 'value', use_float=True)
+                else:
+                    cells = ijson.items(f, 'value.item', use_float=True)
+
+                offset = 0
+                while True:
+                    batch = list(itertools.islice(cells, chunk_rows))
+                    if not batch:
+                        break
+
+                    if sparse:
+                        indices, values = self._jsonstat_values(dict(batch), total_cells)
+                    else:
+                        indices, values = self._jsonstat_values(batch, total_cells, offset=offset)
+                        offset += len(batch)
+
+                    df = self._jsonstat_frame(dim_info, sizes, indices, values)
+                    self._record_transfer(dataset_code, 0, time.perf_counter() - parse_start)
+
+                    if not df.empty:
+                        total_rows += len(df)
+                        chunks += 1
+                        yield df
+
+                    parse_start = time.perf_counter()
+
+            logger.info(f"Parsed JSON-stat stream for {dataset_code}: {total_rows} rows "
+                        f"in {chunks} chunk(s)")
+
+        finally:
+            if delete:
+                Path(path).unlink(missing_ok=True)
+
+    @staticmethod
+    def _jsonstat_header(f) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        Top-level members of a JSON-stat document other than 'value', read from a stream
+
+        Reading stops at the 'value' member once id, size and dimension have been seen.
+
+        Returns:
+            (members, first parser event of 'value': 'start_array' for dense
+            values, 'start_map' for sparse values, None if absent)
+        """
+        builders = {}
+        key = None
+        value_event = None
+
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix == '':
+                if event == 'map_key':
+                    key = value
+                    if key != 'value':
+                        builders[key] = ijson.ObjectBuilder()
+                continue
+
+            if key == 'value':
+                if value_event is None:
+                    value_event = event
+                    if all(member in builders for member in ('id', 'size', 'dimension')):
+                        break
+                continue
+
+            builders[key].event(event, value)
+
+        return {member: builder.value for member, builder in builders.items()}, value_event
+
+    @staticmethod
+    def _jsonstat_dimensions(json_data: dict) -> List[Dict]:
+        """
+        Ordered dimension metadata from a JSON-stat 2.0 dataset
+
+        Returns:
+            List of dicts with id, label, values (category codes in index order)
+            and labels (category labels in the same order)
+        """
+        dimensions = json_data['dimension']
+        dim_info = []
+
+        for dim_id in json_data.get('id', []):
+            dim = dimensions[dim_id]
+            categories = dim.get('category', {})
+            cat_index = categories.get('index', [])
+            cat_labels = categories.get('label', {})
+
+            # Get category values in order
+            if isinstance(cat_index, list):
+                cat_values = cat_index
+            else:
+                # cat_index is a dict mapping values to positions
+                cat_values = sorted(cat_index.keys(), key=lambda x: cat_index[x])
+
+            dim_info.append({
+                'id': dim_id,
+                'label': dim.get('label', dim_id),
+                'values': cat_values,
+                'labels': [cat_labels.get(v, v) for v in cat_values]
+            })
+
+        return dim_info
+
+    @staticmethod
+    def _jsonstat_values(value, total_cells: int, offset: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Non-null cells of a JSON-stat 'value' member
+
+        Args:
+            value: Dense list of cell values, or sparse dict of {"cell index": value}
+            total_cells: Number of cells in the cube (product of 'size')
+            offset: Cell index of the first element of a dense list (for chunked decoding)
+
+        Returns:
+            (cell indices, float values) with null cells removed
+        """
+        if isinstance(value, dict):
+            indices = np.fromiter((int(k) for k in value.keys()), dtype=np.int64, count=len(value))
+            raw = list(value.values())
+        else:
+            raw = value[:max(total_cells - offset, 0)]
+            indices = np.arange(offset, offset + len(raw), dtype=np.int64)
+
+        try:
+            values = np.asarray(raw, dtype=np.float64)
+        except (TypeError, ValueError):
+            # Status markers such as '..' are treated as missing
+            values = pd.to_numeric(pd.Series(raw, dtype=object),
+                                   errors='coerce').to_numpy(dtype=np.float64)
+
+        keep = ~np.isnan(values) & (indices < total_cells)
+        indices, values = indices[keep], values[keep]
+
+        order = np.argsort(indices, kind='stable')
+        return indices[order], values[order]
+
+    @staticmethod
+    def _jsonstat_frame(dim_info: List[Dict], sizes: List[int],
+                        indices: np.ndarray, values: np.ndarray) -> pd.DataFrame:
+        """
+        Build the code/label/VALUE frame for a set of cells
+
+        Column i's category code is (cell // stride_i) % size_i, where stride_i is
+        the product of the sizes of the dimensions after i (row-major order).
+        """
+        strides = np.cumprod([1] + list(sizes[::-1]))[:-1][::-1]
+        columns = {}
+
+        for dim, size, stride in zip(dim_info, sizes, strides):
+            codes = (indices // stride) % size
+
+            columns[dim['id']] = pd.Categorical.from_codes(codes, categories=dim['values'])
+
+            # Labels are not guaranteed unique, so factorize them into their own categories
+            label_codes, label_categories = pd.factorize(pd.Index(dim['labels'], dtype=object))
+            columns[f"{dim['id']}_Label"] = pd.Categorical.from_codes(
+                label_codes[codes], categories=label_categories
+            )
+
+        columns['VALUE'] = values
+        df = pd.DataFrame(columns)
+
+        # Clean up column names and extract year (from the categories, not per row)
+        for time_col in ('TLIST(A1)', 'TLIST(M1)', 'TLIST(Q1)'):
+            if time_col in df.columns:
+                periods = pd.Series(df[time_col].cat.categories.astype(str))
+                if time_col != 'TLIST(A1)':
+                    # Monthly (YYYYMM) and quarterly (2024Q1) codes start with the year
+                    periods = periods.str[:4]
+                years = pd.to_numeric(periods, errors='coerce').astype('Int64')
+                df['Year'] = years.array.take(df[time_col].cat.codes.to_numpy())
+                break
+
+        return df
+
     def scrape_dataset(self, dataset_key: str, force_full: bool = False) -> bool:
         """
         Smart scrape a specific CSO dataset with automatic mode detection
@@ -246,6 +582,104 @@ class SmartCSOScraper:
         Returns:
             True if successful, False otherwise
         """
+        return self._run_dataset(dataset_key, force_full=force_full)['success']
+
+    def _run_dataset(self, dataset_key: str, force_full: bool = False) -> Dict[str, Any]:
+        """
+        Fetch, parse and load one dataset, timing each stage
+
+        Returns:
+            Dictionary with success, rows, fetch_seconds, load_seconds, seconds,
+            bytes (downloaded) and parse_seconds
+        """
+        result = {'success': False, 'rows': 0, 'fetch_seconds': 0.0, 'load_seconds': 0.0,
+                  'seconds': 0.0, 'bytes': 0, 'parse_seconds': 0.0}
+        start = time.perf_counter()
+        load_seconds = 0.0
+        rows_parsed = 0
+        failed_stage = 'fetch'
+
+        try:
+            # Fetch/parse time is profiled as cso.<dataset>.fetch, loading as cso.<dataset>.load
+            with profiler.stage(f'cso.{dataset_key}.fetch'):
+                chunks = self._fetch_new_records(dataset_key, force_full=force_full)
+                if chunks is None:
+                    return result
+
+                # Chunks are parsed lazily, so fetching/parsing interleaves with loading.
+                # All chunks of a dataset are loaded in one transaction: incremental runs
+                # resume from MAX(year), so a partially committed load would never be completed.
+                # Every chunk is deduped against the table as it was before the transaction
+                rows_loaded = 0
+                with ExitStack() as load:
+                    table = self.DATASETS[dataset_key]['table']
+                    load.enter_context(self.loader.cso_dataset_load(table))
+                    in_transaction = False
+                    for df in chunks:
+                        rows_parsed += len(df)
+                        if not in_transaction:
+                            # Bound the number of concurrent database writers
+                            load.enter_context(self.load_slots)
+                            load.enter_context(db.transaction())
+                            in_transaction = True
+
+                        with profiler.stage(f'cso.{dataset_key}.load'):
+                            load_start = time.perf_counter()
+                            chunk_loaded = self._load_dataset(dataset_key, df)
+                        chunk_seconds = time.perf_counter() - load_start
+                        load_seconds += chunk_seconds
+
+                        metrics.record('cso', 'load', chunk_seconds, dataset=dataset_key,
+                                       rows=chunk_loaded or 0,
+                                       errors=1 if chunk_loaded is None else 0)
+                        if chunk_loaded is None:
+                            failed_stage = None  # Already counted on the load stage
+                            raise RuntimeError(f"loading {dataset_key} failed, rolled back")
+                        rows_loaded += chunk_loaded
+
+            result['success'] = True
+            result['rows'] = rows_loaded
+            failed_stage = None
+            self._mark_loaded(dataset_key)
+            return result
+
+        except Exception as e:
+            logger.error(f"❌ Error processing {dataset_key}: {e}")
+            return result
+
+        finally:
+            result['seconds'] = time.perf_counter() - start
+            result['load_seconds'] = load_seconds
+            result['fetch_seconds'] = result['seconds'] - load_seconds
+            with self._transfer_lock:
+                result.update(self.transfer_stats.pop(self.DATASETS[dataset_key]['code'], {}))
+            self._record_metrics(dataset_key, result, rows_parsed, failed_stage)
+
+    @staticmethod
+    def _record_metrics(dataset_key: str, result: Dict[str, Any], rows_parsed: int,
+                        failed_stage: Optional[str]):
+        """Count a dataset's fetch and parse stages in the run metrics (loads count per chunk)"""
+        fetch_seconds = max(0.0, result['fetch_seconds'] - result['parse_seconds'])
+        metrics.record('cso', 'fetch', fetch_seconds, dataset=dataset_key, bytes=result['bytes'],
+                       errors=1 if failed_stage == 'fetch' else 0)
+        if result['parse_seconds'] or rows_parsed:
+            metrics.record('cso', 'parse', result['parse_seconds'], dataset=dataset_key,
+                           rows=rows_parsed)
+
+    def _mark_loaded(self, dataset_key: str):
+        """Record that the cached response for a dataset is fully loaded, so a 304 can skip it"""
+        if self.cache:
+            self.cache.annotate(self.DATASETS[dataset_key]['code'], loaded=True)
+
+    def _fetch_new_records(self, dataset_key: str,
+                           force_full: bool = False) -> Optional[Iterator[pd.DataFrame]]:
+        """
+        Fetch and parse a dataset, keeping only records newer than the database in incremental mode
+
+        Returns:
+            Iterator of DataFrame chunks to load (no chunks if up to date),
+            or None if the fetch failed
+        """
         dataset_info = self.DATASETS[dataset_key]
         dataset_code = dataset_info['code']
         description = dataset_info['description']
@@ -267,38 +701,60 @@ class SmartCSOScraper:
             mode = 'incremental'
             logger.info(f"⚡ MODE: INCREMENTAL LOAD - Will load data after {latest_year}")
 
+        # Incremental: ask PxStat for the new periods only
+        if mode == 'incremental' and latest_year is not None:
+            df = self._fetch_cso_periods(dataset_code, int(latest_year))
+            if df is not None:
+                if df.empty:
+                    logger.info(f"ℹ️  No new data for {dataset_code} - database is up to date!")
+                    return iter(())
+                return iter([df])
+            logger.info(f"Falling back to full cube download for {dataset_code}")
+
         # Fetch data from CSO
-        api_method = dataset_info.get('api_method', 'responseinstance')
-        df = self._fetch_cso_dataset(dataset_code, api_method)
+        chunks = self._fetch_cso_stream(dataset_code, skip_unchanged=(mode == 'incremental'))
 
-        if df is None or df.empty:
+        if chunks is None:
             logger.error(f"Failed to fetch {dataset_code}")
-            return False
+            return None
 
         # Filter for incremental mode
         if mode == 'incremental' and latest_year is not None:
+            chunks = self._filter_new_years(chunks, dataset_code, latest_year)
+
+        return chunks
+
+    def _filter_new_years(self, chunks: Iterator[pd.DataFrame], dataset_code: str,
+                          latest_year: int) -> Iterator[pd.DataFrame]:
+        """Keep only records after latest_year from a stream of parsed chunks"""
+        original_count = 0
+        new_count = 0
+
+        for df in chunks:
+            original_count += len(df)
             # Use the Year column already extracted by JSON-stat parser
             if 'Year' in df.columns:
-                original_count = len(df)
                 df = df[df['Year'] > latest_year]
-                new_count = len(df)
-                logger.info(f"Filtered: {original_count} total records → {new_count} new records (year > {latest_year})")
-
-                if new_count == 0:
-                    logger.info(f"ℹ️  No new data for {dataset_code} - database is up to date!")
-                    return True
             elif 'TIME_PERIOD' in df.columns:
                 # Fallback for CSV format
-                df['year'] = pd.to_numeric(df['TIME_PERIOD'].str[:4], errors='coerce')
-                original_count = len(df)
-                df = df[df['year'] > latest_year]
-                new_count = len(df)
-                logger.info(f"Filtered: {original_count} total records → {new_count} new records")
+                df = df[pd.to_numeric(df['TIME_PERIOD'].str[:4], errors='coerce') > latest_year]
+            new_count += len(df)
 
-                if new_count == 0:
-                    logger.info(f"ℹ️  No new data for {dataset_code} - database is up to date!")
-                    return True
+            if not df.empty:
+                yield df
+
+        logger.info(f"Filtered: {original_count} total records → {new_count} new records "
+                    f"(year > {latest_year})")
+        if new_count == 0:
+            logger.info(f"ℹ️  No new data for {dataset_code} - database is up to date!")
 
+    def _load_dataset(self, dataset_key: str, df: pd.DataFrame) -> Optional[int]:
+        """
+        Load parsed records into the dataset's raw table
+
+        Returns:
+            Rows inserted, or None if loading failed
+        """
         # Load into database
         logger.info(f"💾 Loading {len(df)} records into database...")
 
@@ -313,69 +769,110 @@ class SmartCSOScraper:
                 rows_loaded = self.loader.load_cso_income(df)
             else:
                 logger.error(f"Unknown dataset: {dataset_key}")
-                return False
+                return None
 
             # rows_loaded is the number of rows inserted (can be 0 if all duplicates)
             if rows_loaded == 0:
-                logger.info(f"ℹ️  No new records inserted (all records already exist in database)")
-                return True
+                logger.info("ℹ️  No new records inserted (all records already exist in database)")
             else:
                 logger.info(f"✅ Successfully loaded {rows_loaded} new records")
-                return True
+            return rows_loaded or 0
 
         except Exception as e:
             logger.error(f"❌ Error loading {dataset_key}: {e}")
-            return False
+            return None
 
-    def scrape_all_datasets(self, force_full: bool = False) -> Dict[str, bool]:
+    def scrape_all_datasets(self, force_full: bool = False,
+                            max_workers: int = None) -> Dict[str, Dict[str, Any]]:
         """
         Scrape all CSO datasets with smart incremental loading
 
+        Datasets are fetched and parsed concurrently on a thread pool; database
+        writes are limited to Config.CSO_DB_CONNECTIONS at a time.
+
         Args:
             force_full: Force full load for all datasets
+            max_workers: Concurrent datasets (defaults to Config.CSO_WORKERS, 1 = sequential)
 
         Returns:
             Dictionary with results for each dataset
+            (success, rows, fetch_seconds, load_seconds, seconds, bytes, parse_seconds)
         """
+        max_workers = max_workers or Config.CSO_WORKERS
+
         logger.info("\n" + "="*70)
-        logger.info("🚀 Starting Smart CSO Data Collection")
+        logger.info(f"🚀 Starting Smart CSO Data Collection ({max_workers} worker(s))")
         logger.info("="*70)
 
+        start = time.perf_counter()
         results = {}
 
-        for dataset_key in self.DATASETS.keys():
-            try:
-                success = self.scrape_dataset(dataset_key, force_full=force_full)
-                results[dataset_key] = success
-            except Exception as e:
-                logger.error(f"Error processing {dataset_key}: {e}")
-                results[dataset_key] = False
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='cso') as executor:
+            # Each worker runs in a copy of the caller's context, so a DB connection budget
+            # applies to it
+            futures = {
+                executor.submit(contextvars.copy_context().run, self._run_dataset, dataset_key,
+                                force_full): dataset_key
+                for dataset_key in self.DATASETS.keys()
+            }
+            for future in as_completed(futures):
+                dataset_key = futures[future]
+                try:
+                    results[dataset_key] = future.result()
+                except Exception as e:
+                    logger.error(f"Error processing {dataset_key}: {e}")
+                    results[dataset_key] = {'success': False, 'rows': 0, 'fetch_seconds': 0.0,
+                                            'load_seconds': 0.0, 'seconds': 0.0,
+                                            'bytes': 0, 'parse_seconds': 0.0}
+
+        # Keep the configured dataset order in the results
+        results = {key: results[key] for key in self.DATASETS.keys()}
+        elapsed = time.perf_counter() - start
 
         # Summary
         logger.info("\n" + "="*70)
         logger.info("📊 CSO Data Collection Summary")
         logger.info("="*70)
 
-        for dataset_key, success in results.items():
-            status = "✅ SUCCESS" if success else "❌ FAILED"
+        for dataset_key, result in results.items():
+            status = "✅ SUCCESS" if result['success'] else "❌ FAILED"
             dataset_name = self.DATASETS[dataset_key]['description']
-            logger.info(f"{status}: {dataset_name}")
+            logger.info(
+                f"{status}: {dataset_name} - {result['rows']} rows in {result['seconds']:.1f}s "
+                f"(fetch {result['fetch_seconds']:.1f}s, load {result['load_seconds']:.1f}s, "
+                f"{result['bytes'] / 1024:.0f} KB downloaded, parse {result['parse_seconds']:.2f}s)"
+            )
 
-        successful = sum(1 for s in results.values() if s)
+        successful = sum(1 for r in results.values() if r['success'])
         total = len(results)
-        logger.info(f"\nOverall: {successful}/{total} datasets processed successfully")
+        total_bytes = sum(r['bytes'] for r in results.values())
+        logger.info(f"\nOverall: {successful}/{total} datasets processed successfully "
+                    f"in {elapsed:.1f}s ({total_bytes / 1024 / 1024:.1f} MB downloaded)")
+        if self.cache:
+            stats = self.cache.stats()
+            logger.info(
+                f"HTTP cache: {stats['hits']} hit(s), {stats['misses']} miss(es), "
+                f"{stats['bytes_saved'] / 1024 / 1024:.1f} MB not re-downloaded, "
+                f"{stats['entries']} entries ({stats['bytes'] / 1024 / 1024:.1f} MB)"
+            )
         logger.info("="*70)
 
         return results
 
 
-def run_smart_cso_scraper(datasets: Optional[List[str]] = None, force_full: bool = False):
+def run_smart_cso_scraper(datasets: Optional[List[str]] = None, force_full: bool = False,
+                          max_workers: int = None) -> Dict[str, Dict[str, Any]]:
     """
     Main function to run the smart CSO scraper
 
     Args:
         datasets: List of dataset keys to scrape (None = all)
         force_full: Force full load
+        max_workers: Concurrent datasets (defaults to Config.CSO_WORKERS)
+
+    Returns:
+        Dictionary with results for each dataset
+        (success, rows, fetch_seconds, load_seconds, seconds, bytes, parse_seconds)
     """
     scraper = SmartCSOScraper()
 
@@ -384,16 +881,28 @@ def run_smart_cso_scraper(datasets: Optional[List[str]] = None, force_full: bool
         results = {}
         for dataset in datasets:
             if dataset in scraper.DATASETS:
-                results[dataset] = scraper.scrape_dataset(dataset, force_full=force_full)
+                results[dataset] = scraper._run_dataset(dataset, force_full=force_full)
             else:
                 logger.error(f"Unknown dataset: {dataset}")
                 logger.info(f"Available: {list(scraper.DATASETS.keys())}")
         return results
     else:
         # Scrape all datasets
-        return scraper.scrape_all_datasets(force_full=force_full)
+        return scraper.scrape_all_datasets(force_full=force_full, max_workers=max_workers)
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Smart CSO statistics scraper')
+    parser.add_argument('--profile', action='store_true',
+                        help='Profile the run (per-stage files in logs/)')
+    args = parser.parse_args()
+
+    if args.profile:
+        profiler.enable()
+
     # Run all CSO scrapers
     run_smart_cso_scraper()
+    metrics.flush()
+    profiler.write()
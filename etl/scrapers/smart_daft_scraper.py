@@ -4,16 +4,23 @@ Automatically detects if database is empty and switches between modes
 """
 import asyncio
 import json
+import multiprocessing
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Any, Callable
 import re
-from bs4 import BeautifulSoup
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 
 from etl.config import Config
 from etl.utils.logger import get_logger
 from etl.utils.database import db
+from etl.utils.checkpoints import CheckpointStore
+from etl.utils.metrics import metrics
+from etl.utils.profiling import profiler
+from etl.utils.rate_limit import AsyncTokenBucket, AdaptiveDelay
+from etl.scrapers import daft_parser
+from etl.scrapers.resource_blocker import ResourceBlocker
 from etl.loaders.data_loader import DataLoader
 
 logger = get_logger(__name__)
@@ -24,25 +31,121 @@ class SmartDaftScraper:
     Smart scraper that automatically handles full vs incremental loads
     """
 
-    def __init__(self, headless: bool = True):
+    # Resolves once __NEXT_DATA__ is attached: 'listings' when it holds listings, 'empty' when
+    # its paging shows a page without results (no matches, or past the last page)
+    LISTINGS_READY_JS = """
+        () => {
+            const el = document.getElementById('__NEXT_DATA__');
+            if (!el) return false;
+            try {
+                const pageProps = (JSON.parse(el.textContent).props || {}).pageProps || {};
+                const listings = pageProps.listings;
+                if (!Array.isArray(listings)) return false;
+                if (listings.length > 0) return 'listings';
+                return pageProps.paging ? 'empty' : false;
+            } catch (e) {
+                return false;
+            }
+        }
+    """
+
+    # Markers of a Cloudflare interstitial instead of search results
+    CHALLENGE_MARKERS = ('challenge-platform', 'cf-challenge', 'Just a moment...')
+
+    # Next.js build id embedded in __NEXT_DATA__, needed for /_next/data/ routes
+    BUILD_ID_PATTERN = re.compile(r'"buildId"\s*:\s*"([^"]+)"')
+
+    DATA_ROUTE_HEADERS = {'Accept': 'application/json', 'x-nextjs-data': '1'}
+
+    # Consecutive data-route failures before the run falls back to rendering every page
+    DATA_ROUTE_MAX_FAILURES = 3
+
+    # Result count of a rendered search page
+    TOTAL_RESULTS_JS = """
+        () => {
+            const el = document.getElementById('__NEXT_DATA__');
+            if (!el) return null;
+            try {
+                const paging = ((JSON.parse(el.textContent).props || {}).pageProps || {}).paging;
+                return paging ? paging.totalResults : null;
+            } catch (e) {
+                return null;
+            }
+        }
+    """
+
+    # featuredLevel values that follow the publishDateDesc sort (others are pinned to the top)
+    IN_ORDER_FEATURED_LEVELS = frozenset({'STANDARD'})
+
+    def __init__(self, headless: bool = True, concurrency: int = None, max_rps: float = None,
+                 search_path: str = 'ireland', search_filters: Dict[str, Any] = None):
+        """
+        Args:
+            headless: Run Chromium headless
+            concurrency: Browser tabs fetching pages in parallel
+                (defaults to Config.DAFT_PAGE_CONCURRENCY)
+            max_rps: Cap on page requests per second across all tabs
+                (defaults to Config.DAFT_MAX_RPS)
+            search_path: Location segment of the search URL (e.g. 'ireland', 'cork')
+            search_filters: Extra search parameters (e.g. {'rentalPrice_from': 1000})
+        """
         self.base_url = Config.DAFT_BASE_URL
         self.headless = headless
+        self.search_path = search_path
+        self.search_filters = dict(search_filters or {})
+        self.concurrency = max(1, concurrency or Config.DAFT_PAGE_CONCURRENCY)
         self.playwright = None
         self.browser = None
         self.context = None
         self.page = None
+        self.pages = []
+        self.page_pool = None  # Idle tabs, handed out per page fetch
+        self.rate_limiter = AsyncTokenBucket(
+            max_rps if max_rps is not None else Config.DAFT_MAX_RPS
+        )
+        self.throttle = AdaptiveDelay(
+            min_delay=Config.DAFT_MIN_DELAY_SECONDS,
+            max_delay=Config.DAFT_MAX_DELAY_SECONDS,
+            block_delay=Config.DAFT_BLOCK_BACKOFF_SECONDS
+        )
+        self.page_metrics = []  # One record per page fetch attempt
+        self.resource_blocker = ResourceBlocker.from_config()
+        self.parse_workers = Config.DAFT_PARSE_WORKERS  # 0 = parse inline on the event loop
+        self.parse_pool = None
+        self.parse_slots = None
+        self.fetch_mode = Config.DAFT_FETCH_MODE  # 'data_route' or 'browser'
+        self.build_id = None
+        self.data_route_failures = 0
         self.mode = None  # Will be 'full' or 'incremental'
         self.latest_publish_date = None
+        self.checkpoints = CheckpointStore('daft')
+        self.resume_page = None  # Last committed page of an interrupted run
+        self.pages_saved = 0  # Page loads avoided by the incremental watermark stop
 
-        logger.info(f"Initialized Smart Daft scraper (headless={headless})")
+        logger.info(f"Initialized Smart Daft scraper (headless={headless}, "
+                    f"tabs={self.concurrency})")
 
     def _check_existing_data(self) -> tuple[bool, Optional[int]]:
         """
         Check if we have existing Daft data in database
+        The watermark comes from the checkpoint row; the raw table is only
+        scanned once, to seed a missing checkpoint
 
         Returns:
             (has_data, latest_publish_date)
         """
+        try:
+            checkpoint = self.checkpoints.get()
+            if checkpoint:
+                latest_date = checkpoint.get('last_publish_date')
+                logger.info(
+                    f"Checkpoint: status={checkpoint.get('status')}, watermark={latest_date}, "
+                    f"last page={checkpoint.get('last_page')} ({checkpoint.get('run_mode')} run)"
+                )
+                return latest_date is not None, latest_date
+        except Exception as e:
+            logger.warning(f"Could not read scraping checkpoint: {e}. Falling back to table scan.")
+
         try:
             query = """
                 SELECT
@@ -63,6 +166,7 @@ class SmartDaftScraper:
                 logger.info(f"Database check: {count} existing listings found")
                 if latest_date:
                     logger.info(f"Latest publish_date in DB: {latest_date}")
+                    self._seed_checkpoint(latest_date)
 
                 return has_data, latest_date
 
@@ -72,8 +176,21 @@ class SmartDaftScraper:
             logger.warning(f"Could not check existing data: {e}. Defaulting to full load.")
             return False, None
 
-    def _determine_scraping_strategy(self):
-        """Automatically determine if we should do full or incremental load"""
+    def _seed_checkpoint(self, latest_publish_date: int):
+        """Store a watermark found by table scan so later runs read it from the checkpoint"""
+        try:
+            self.checkpoints.seed(latest_publish_date)
+        except Exception as e:
+            logger.warning(f"Could not seed scraping checkpoint: {e}")
+
+    def _determine_scraping_strategy(self, restart: bool = False):
+        """
+        Automatically determine if we should do full or incremental load,
+        and whether an interrupted run of that mode can be resumed
+
+        Args:
+            restart: Ignore an interrupted run's cursor and start from page 1
+        """
         has_data, latest_publish_date = self._check_existing_data()
 
         if not has_data:
@@ -85,6 +202,20 @@ class SmartDaftScraper:
             self.latest_publish_date = latest_publish_date
             logger.info(f"⚡ MODE: INCREMENTAL LOAD - Will scrape only listings after {latest_publish_date}")
 
+        self.resume_page = None
+        try:
+            resume_page = self.checkpoints.resumable_page(self.mode)
+        except Exception as e:
+            logger.warning(f"Could not read resume point: {e}")
+            resume_page = None
+
+        if resume_page and restart:
+            logger.info(f"🔁 Restart requested: discarding interrupted {self.mode} run "
+                        f"at page {resume_page}")
+        elif resume_page:
+            self.resume_page = resume_page
+            logger.info(f"⏯️  Resuming interrupted {self.mode} run from page {resume_page}")
+
         return self.mode
 
     async def __aenter__(self):
@@ -169,20 +300,32 @@ class SmartDaftScraper:
             'Upgrade-Insecure-Requests': '1',
         })
 
-        self.page = await self.context.new_page()
+        # Skip images, fonts, stylesheets, trackers and map tiles - only __NEXT_DATA__ is read
+        await self.resource_blocker.install(self.context)
 
-        # Set default timeouts
-        self.page.set_default_timeout(60000)
-        self.page.set_default_navigation_timeout(60000)
+        # Tab pool sharing the context (and its Cloudflare cookies)
+        self.page_pool = asyncio.Queue()
+        for _ in range(self.concurrency):
+            page = await self.context.new_page()
 
-        logger.info("Browser started successfully")
+            # Set default timeouts
+            page.set_default_timeout(60000)
+            page.set_default_navigation_timeout(60000)
 
-    async def wait_for_cloudflare(self, timeout: int = 30000):
+            self.pages.append(page)
+            self.page_pool.put_nowait(page)
+
+        self.page = self.pages[0]
+
+        logger.info(f"Browser started successfully ({self.concurrency} tab(s))")
+
+    async def wait_for_cloudflare(self, timeout: int = 30000, page=None):
         """Wait for Cloudflare challenge to complete and page content to load"""
+        page = page or self.page
         logger.info("Waiting for page content to load...")
         try:
             # Wait for any of these selectors that indicate the page has loaded
-            await self.page.wait_for_selector(
+            await page.wait_for_selector(
                 'div[data-testid="search-result"], a[href*="/for-rent/"], script#__NEXT_DATA__',
                 timeout=timeout,
                 state='attached'
@@ -192,7 +335,7 @@ class SmartDaftScraper:
         except Exception as e:
             logger.warning(f"Page load timeout: {e}")
             # Check if we got any content anyway
-            content = await self.page.content()
+            content = await page.content()
             if '__NEXT_DATA__' in content or 'search-result' in content:
                 logger.info("Page content found despite timeout, continuing...")
                 return True
@@ -201,8 +344,10 @@ class SmartDaftScraper:
 
     async def close_browser(self):
         """Close browser and cleanup"""
-        if self.page:
-            await self.page.close()
+        for page in self.pages:
+            await page.close()
+        self.pages = []
+        self.page = None
         if self.context:
             await self.context.close()
         if self.browser:
@@ -210,339 +355,703 @@ class SmartDaftScraper:
         if self.playwright:
             await self.playwright.stop()
 
-    async def scrape_rentals(self, max_pages: int = None) -> int:
+    async def scrape_rentals(self, max_pages: int = None, restart: bool = False) -> int:
         """
         Smart scraping with automatic full/incremental mode detection
         Loads data to database PAGE BY PAGE to avoid memory issues
+        Progress is checkpointed after every committed batch, so an interrupted
+        run resumes from its last committed page
 
         Args:
             max_pages: Maximum pages to scrape (None = scrape until no more listings found)
+            restart: Start from page 1 even if an interrupted run could be resumed
 
         Returns:
             Total number of listings loaded to database
+
+        Raises:
+            RuntimeError: If any batch failed to load (the checkpoint is marked failed)
         """
         # Determine strategy
-        mode = self._determine_scraping_strategy()
+        mode = self._determine_scraping_strategy(restart=restart)
 
-        # Import loader here to avoid circular imports
-        from etl.loaders.data_loader import DataLoader
+        # Import the write-behind loader here to avoid circular imports
+        from etl.loaders.write_behind import WriteBehindLoader
         loader = DataLoader()
 
-        page_num = 1
+        # Resume on the last committed page itself: listings removed since the
+        # interruption shift later ones back onto it (repeats are deduplicated)
+        first_page = self.resume_page or 1
+        self._checkpoint('start_run', mode, resume=self.resume_page is not None)
+
+        # Pages are loaded on a background writer thread so the browser keeps fetching;
+        # each committed batch advances the checkpoint
+        writer = WriteBehindLoader(loader.load_daft_listings, on_flush=self._commit_checkpoint)
+        writer.start()
+
         consecutive_empty_pages = 0
-        total_loaded = 0
-        max_retries_per_page = 3  # Retry same page up to 3 times on error
+        pages_scraped = 0
+        page_num = first_page
 
-        # OPTIMIZATION: In incremental mode with chronological sort, we can stop after first empty page
-        # because all subsequent pages will be even older (since we sort by publishDateDesc)
-        # In FULL mode, allow more empty pages to handle transient errors
+        # Consecutive empty pages that mean the end of results (full mode tolerates transient
+        # errors)
         max_empty_pages = 3 if mode == 'incremental' else 5
 
-        # For incremental mode, check more pages to ensure we don't miss any
-        if mode == 'incremental' and max_pages is None:
-            max_pages = 20  # Check up to 20 pages for new listings
-            logger.info(f"Incremental mode: Will check up to {max_pages} pages, stop after {max_empty_pages} consecutive empty pages")
+        # OPTIMIZATION: Listings are sorted by publishDateDesc, so in incremental mode the
+        # first page whose oldest in-order listing is at or before the watermark is the last
+        # page with new listings - stop right there instead of probing further pages
+        if mode == 'incremental':
+            logger.info(f"Incremental mode: Will scrape until a page reaches back past "
+                        f"{self.latest_publish_date}")
         elif mode == 'full' and max_pages is None:
             logger.info(f"Full mode: Will scrape ALL available pages (stop after {max_empty_pages} consecutive empty pages)")
 
+        # Pages are fetched ahead on the tab pool and consumed strictly in page order,
+        # so the empty-page/early-stop logic below sees the same sequence as a serial scrape
+        in_flight = {}
+        pages = self._iter_pages(first_page, max_pages, in_flight)
+        start_time = time.monotonic()
+        completed = False
+        self._start_parse_pool()
+
+        try:
+            async for page_num, listings in pages:
+                pages_scraped += 1
+
+                # Progress logging every 10 pages
+                if page_num % 10 == 0:
+                    logger.info(f"📊 Progress: Page {page_num} | Loaded {writer.total_loaded} listings so far")
+
+                if listings is None:
+                    # Every attempt errored - don't count as an empty page
+                    continue
+
+                if not listings:
+                    consecutive_empty_pages += 1
+                    if consecutive_empty_pages >= max_empty_pages:
+                        logger.info(f"Found {consecutive_empty_pages} consecutive pages with no listings (end of results)")
+                        break
+                    continue
+
+                # In incremental mode: filter listings client-side by timestamp
+                if mode == 'incremental' and self.latest_publish_date:
+                    # Client-side filter: only keep listings newer than checkpoint
+                    new_listings = [
+                        listing for listing in listings
+                        if listing.get('publish_date')
+                        and listing['publish_date'] > self.latest_publish_date
+                    ]
+
+                    logger.info(f"Page {page_num}: Fetched {len(listings)} listings, "
+                                f"{len(new_listings)} are new (after {self.latest_publish_date})")
+
+                    if not new_listings:
+                        consecutive_empty_pages += 1
+                    else:
+                        consecutive_empty_pages = 0
+                        # Hand the page to the write-behind loader
+                        await writer.submit_async(new_listings, page_num)
+
+                    oldest = self._oldest_in_order_publish_date(listings)
+                    if oldest is not None and oldest <= self.latest_publish_date:
+                        self._log_watermark_stop(page_num, max_empty_pages - consecutive_empty_pages,
+                                                 len(in_flight))
+                        break
+                else:
+                    # Full mode: take all listings
+                    consecutive_empty_pages = 0
+                    # Hand the page to the write-behind loader
+                    logger.info(f"Page {page_num}: Found {len(listings)} listings")
+                    await writer.submit_async(listings, page_num)
+
+            completed = True
+        finally:
+            # Pages fetched past the stopping point are not needed
+            await pages.aclose()
+            await self._cancel_in_flight(in_flight)
+
+            # Wait for the writer to flush the remaining pages so the count is exact
+            total_loaded = await asyncio.get_running_loop().run_in_executor(None, writer.close)
+            self._stop_parse_pool()
+
+            # The watermark only advances when every page reached the database
+            if completed and not writer.errors:
+                self._checkpoint('complete')
+            elif writer.errors:
+                self._checkpoint('fail', f"{len(writer.errors)} batch(es) failed to load: "
+                                         f"{writer.errors[0]}")
+            else:
+                self._checkpoint('fail', f"Interrupted at page {page_num}")
+
+        elapsed = time.monotonic() - start_time
+        metrics.record('daft', 'crawl', elapsed, calls=pages_scraped, rows=total_loaded,
+                       errors=len(writer.errors))
+        self._export_page_metrics()
+        logger.info(
+            f"⏱️  {pages_scraped} pages in {elapsed:.0f}s "
+            f"({pages_scraped / max(elapsed, 1e-9) * 60:.1f} pages/min, {self.concurrency} tab(s), "
+            f"{self.rate_limiter.waited_seconds:.0f}s waiting on rate limit)"
+        )
+        if writer.errors:
+            # Listings were scraped but not stored: the run must not count as a success
+            raise RuntimeError(
+                f"{len(writer.errors)} batch(es) failed to load, only {total_loaded} listings "
+                f"reached the database: {writer.errors[0]}"
+            )
+        logger.info(f"✅ Scraping complete: {total_loaded} total listings loaded to database "
+                    f"across {pages_scraped} pages")
+        return total_loaded
+
+    async def collect_listings(self, max_pages: int = None, max_empty_pages: int = 2) -> List[Dict]:
+        """
+        Walk the configured search to the end of its results and return every listing
+        Nothing is loaded or checkpointed; used by shard workers, whose results
+        are merged before loading
+
+        Args:
+            max_pages: Last page to fetch (None = until the results run out)
+            max_empty_pages: Consecutive empty pages that mean the end of results
+
+        Returns:
+            Listings in page order
+        """
+        collected = []
+        consecutive_empty_pages = 0
+        in_flight = {}
+        pages = self._iter_pages(1, max_pages, in_flight)
+        self._start_parse_pool()
+
+        try:
+            async for page_num, listings in pages:
+                if listings is None:
+                    continue
+                if not listings:
+                    consecutive_empty_pages += 1
+                    if consecutive_empty_pages >= max_empty_pages:
+                        break
+                    continue
+                consecutive_empty_pages = 0
+                collected.extend(listings)
+        finally:
+            await pages.aclose()
+            await self._cancel_in_flight(in_flight)
+            self._stop_parse_pool()
+
+        return collected
+
+    async def _iter_pages(self, first_page: int, max_pages: Optional[int],
+                          in_flight: Dict[int, asyncio.Task]):
+        """
+        Fetch pages ahead on the tab pool and yield them strictly in page order
+
+        Args:
+            first_page: Page to start from
+            max_pages: Last page to fetch (None = no limit)
+            in_flight: Caller-owned map of prefetched page tasks, cancelled by the
+                       caller once it stops consuming
+
+        Yields:
+            (page_num, listings) with listings as returned by _fetch_listings_page
+        """
+        page_num = next_page = first_page
         while True:
-            # Check if we should stop
             if max_pages and page_num > max_pages:
                 logger.info(f"Reached max pages limit ({max_pages})")
-                break
+                return
+
+            # Keep the tab pool busy; the first page runs alone so the Cloudflare check clears first
+            window = 1 if page_num == first_page else self.concurrency
+            while len(in_flight) < window and (not max_pages or next_page <= max_pages):
+                in_flight[next_page] = asyncio.create_task(self._fetch_listings_page(next_page))
+                next_page += 1
+
+            listings = await in_flight.pop(page_num)
+            yield page_num, listings
+            page_num += 1
+
+    @staticmethod
+    async def _cancel_in_flight(in_flight: Dict[int, asyncio.Task]):
+        """Cancel prefetched pages that are no longer needed"""
+        for task in in_flight.values():
+            task.cancel()
+        await asyncio.gather(*in_flight.values(), return_exceptions=True)
+        in_flight.clear()
+
+    def _oldest_in_order_publish_date(self, listings: List[Dict]) -> Optional[int]:
+        """
+        Oldest publish_date among the listings that follow the publishDateDesc sort
 
-            if consecutive_empty_pages >= max_empty_pages:
-                if mode == 'incremental':
-                    logger.info(f"Found {consecutive_empty_pages} consecutive page(s) with no new listings, stopping")
-                    logger.info("   ⚡ Since listings are sorted chronologically (newest first), all remaining pages are older")
-                else:
-                    logger.info(f"Found {consecutive_empty_pages} consecutive pages with no listings (end of results)")
-                break
+        Featured/premium listings are pinned regardless of date, so only standard
+        listings are trusted; None if the page has none with a publish_date
+        """
+        dates = [
+            listing['publish_date'] for listing in listings
+            if listing.get('publish_date')
+            and (listing.get('featured_level') or 'STANDARD') in self.IN_ORDER_FEATURED_LEVELS
+        ]
+        return min(dates) if dates else None
+
+    def _log_watermark_stop(self, page_num: int, rule_pages: int, prefetched: int):
+        """
+        Log an exact early stop and the page loads it saved
+
+        Args:
+            page_num: Page that reached back past the watermark
+            rule_pages: Further pages the old "3 empty pages" rule would have loaded
+            prefetched: Pages already in flight on the tab pool (loaded anyway)
+        """
+        self.pages_saved = max(0, rule_pages - prefetched)
+        logger.info(
+            f"⚡ Page {page_num} reaches back past the watermark ({self.latest_publish_date}): "
+            f"all later pages are older, stopping"
+        )
+        logger.info(
+            f"   Saved {self.pages_saved} page load(s) vs. probing {rule_pages} more empty page(s) "
+            f"({prefetched} prefetched page(s) discarded)"
+        )
+
+    def _checkpoint(self, action: str, *args, **kwargs):
+        """Call a CheckpointStore method; checkpoint failures never stop the scrape"""
+        try:
+            getattr(self.checkpoints, action)(*args, **kwargs)
+        except Exception as e:
+            logger.warning(f"Checkpoint {action} failed: {e}")
+
+    def _commit_checkpoint(self, pages: List[Optional[int]], listings: List[Dict],
+                           rows_loaded: int):
+        """Writer callback: record the highest committed page and its newest publish_date"""
+        publish_dates = [listing['publish_date'] for listing in listings
+                         if listing.get('publish_date')]
+        self._checkpoint(
+            'advance',
+            page=max(p for p in pages if p is not None),
+            max_publish_date=max(publish_dates) if publish_dates else None,
+            rows=rows_loaded,
+            last_property_id=str(listings[-1].get('property_id')) if listings else None
+        )
+
+    def _search_query(self, page_num: int, filters: Dict[str, Any] = None) -> str:
+        """Search query string for a page, sorted by publish_date descending (newest first)"""
+        from_param = (page_num - 1) * 20
+        filters = self.search_filters if filters is None else filters
+        extra = ''.join(f"&{key}={value}" for key, value in filters.items())
+        return f"pageSize=20&from={from_param}&sort=publishDateDesc{extra}"
+
+    def _search_url(self, page_num: int, path: str = None, filters: Dict[str, Any] = None) -> str:
+        """Search results URL for a page"""
+        path = path or self.search_path
+        return f"{self.base_url}/property-for-rent/{path}?{self._search_query(page_num, filters)}"
 
-            # Progress logging every 10 pages
-            if page_num % 10 == 0:
-                logger.info(f"📊 Progress: Page {page_num} | Loaded {total_loaded} listings so far")
+    def _data_route_url(self, page_num: int) -> str:
+        """Next.js data route returning a page's props as JSON"""
+        return (f"{self.base_url}/_next/data/{self.build_id}/property-for-rent/{self.search_path}.json"
+                f"?{self._search_query(page_num)}")
 
-            logger.info(f"Scraping page {page_num}...")
+    async def probe_total_results(self, path: str = None, filters: Dict[str, Any] = None) -> Optional[int]:
+        """
+        Number of listings a search reports (pageProps.paging.totalResults)
+
+        Renders the search's first page on a pooled tab, paced like any other fetch.
+
+        Args:
+            path: Location segment (defaults to the scraper's search_path)
+            filters: Extra search parameters (defaults to the scraper's search_filters)
+
+        Returns:
+            Total results, or None if the page could not be read
+        """
+        url = self._search_url(1, path, filters)
+        page = await self.page_pool.get()
+        try:
+            await self.throttle.wait()
+            await self.rate_limiter.acquire()
+            start = time.monotonic()
+            await page.goto(url, wait_until='domcontentloaded', timeout=45000)
+            await self.wait_for_cloudflare(timeout=20000, page=page)
+            self.throttle.record_response(time.monotonic() - start)
+            await self._wait_for_listings(page)
+            total = await page.evaluate(self.TOTAL_RESULTS_JS)
+            return int(total) if total is not None else None
+        except Exception as e:
+            logger.warning(f"Could not read total results for {url}: {e}")
+            self.throttle.record_block()
+            return None
+        finally:
+            self.page_pool.put_nowait(page)
 
-            # Build URL with pageSize and sort by publish_date descending (newest first)
-            from_param = (page_num - 1) * 20
-            url = f"{self.base_url}/property-for-rent/ireland?pageSize=20&from={from_param}&sort=publishDateDesc"
+    async def _fetch_listings_page(self, page_num: int,
+                                   max_retries: int = 3) -> Optional[List[Dict]]:
+        """
+        Fetch and parse one search results page on a tab from the pool
+
+        Every navigation waits for the adaptive delay and takes a token from the
+        shared rate limiter. The page is read as soon as __NEXT_DATA__ holds
+        listings rather than after a fixed sleep.
+
+        Args:
+            page_num: 1-based results page
+            max_retries: Attempts before giving up on the page
+
+        Returns:
+            Listings on the page (empty if none were found after all attempts),
+            or None if every attempt failed with an error
+        """
+        url = self._search_url(page_num)
+        page = await self.page_pool.get()
 
-            # Retry logic for the same page
-            page_success = False
-            for retry in range(max_retries_per_page):
+        try:
+            # Fast path: page props straight from the data route, no rendering
+            if self.fetch_mode == 'data_route' and self.build_id:
+                listings = await self._fetch_listings_data_route(page_num)
+                if listings is not None:
+                    return listings
+
+            for retry in range(max_retries):
+                metric = {'page': page_num, 'attempt': retry + 1, 'fetch_mode': 'browser', 'status': None,
+                          'delay_seconds': 0.0, 'latency_seconds': None, 'ready_seconds': None,
+                          'ready': False, 'listings': 0}
                 try:
-                    # Navigate to page - use 'domcontentloaded' instead of 'networkidle' for faster loading
-                    await self.page.goto(url, wait_until='domcontentloaded', timeout=45000)
+                    metric['delay_seconds'] = await self.throttle.wait()
+                    await self.rate_limiter.acquire()
+                    self.resource_blocker.take_stats(page)  # Count this navigation only
+                    logger.info(f"Scraping page {page_num}...")
+
+                    # Navigate to page - use 'domcontentloaded' instead of 'networkidle' for
+                    # faster loading
+                    nav_start = time.monotonic()
+                    response = await page.goto(url, wait_until='domcontentloaded', timeout=45000)
+                    metric['latency_seconds'] = time.monotonic() - nav_start
+                    metric['status'] = response.status if response else None
+
+                    blocked = metric['status'] in (403, 429)
+                    if blocked:
+                        retry_after = self._retry_after(response)
+                        logger.warning(f"HTTP {metric['status']} on page {page_num}, backing off"
+                                       + (f" {retry_after:.0f}s (Retry-After)" if retry_after else ""))
+                        self.throttle.record_block(retry_after)
 
                     # Wait for Cloudflare challenge if needed
-                    if page_num == 1 or retry > 0:
-                        await self.wait_for_cloudflare(timeout=20000)
+                    if page_num == 1 or retry > 0 or blocked:
+                        await self.wait_for_cloudflare(timeout=20000, page=page)
 
-                    # Wait for dynamic content to load
-                    await asyncio.sleep(3)
+                    # Wait until the listings are actually in the page
+                    ready_start = time.monotonic()
+                    ready = await self._wait_for_listings(page)
+                    metric['ready'] = ready is not None
+                    metric['ready_seconds'] = time.monotonic() - ready_start
 
                     # Get page content
-                    content = await self.page.content()
+                    content = await page.content()
 
-                    # Parse listings
-                    listings = self._extract_listings_from_html(content)
-
-                    if not listings:
-                        if retry < max_retries_per_page - 1:
-                            logger.warning(f"No listings found on page {page_num}, retry {retry + 1}/{max_retries_per_page}")
-                            await asyncio.sleep(5)
-                            continue
-                        else:
-                            logger.warning(f"No listings found on page {page_num} after {max_retries_per_page} attempts")
-                            consecutive_empty_pages += 1
-                            page_success = True  # Move to next page
-                            break
-
-                    # Successfully got listings
-                    page_success = True
-
-                    # In incremental mode: filter listings client-side by timestamp
-                    if mode == 'incremental' and self.latest_publish_date:
-                        # Client-side filter: only keep listings newer than checkpoint
-                        new_listings = [
-                            l for l in listings
-                            if l.get('publish_date') and l['publish_date'] > self.latest_publish_date
-                        ]
-
-                        logger.info(f"Page {page_num}: Fetched {len(listings)} listings, {len(new_listings)} are new (after {self.latest_publish_date})")
-
-                        if not new_listings:
-                            consecutive_empty_pages += 1
-                        else:
-                            consecutive_empty_pages = 0
-                            # LOAD TO DATABASE IMMEDIATELY (page by page)
-                            rows_loaded = loader.load_daft_listings(new_listings)
-                            total_loaded += rows_loaded
-                            logger.info(f"💾 Loaded {rows_loaded} listings from page {page_num} to database")
-                    else:
-                        # Full mode: take all listings
-                        consecutive_empty_pages = 0
-                        # LOAD TO DATABASE IMMEDIATELY (page by page)
-                        rows_loaded = loader.load_daft_listings(listings)
-                        total_loaded += rows_loaded
-                        logger.info(f"Page {page_num}: Found {len(listings)} listings")
-                        logger.info(f"💾 Loaded {rows_loaded} listings from page {page_num} to database")
+                    if self.fetch_mode == 'data_route':
+                        self._capture_build_id(content)
 
-                    break  # Success, exit retry loop
+                    if not metric['ready'] and self._is_challenge(content):
+                        logger.warning(f"Challenge page served for page {page_num} (attempt {retry + 1}/{max_retries})")
+                        self.throttle.record_block()
+                        continue
 
-                except PlaywrightTimeoutError as e:
-                    logger.error(f"Timeout on page {page_num} (attempt {retry + 1}/{max_retries_per_page}): {e}")
-                    if retry < max_retries_per_page - 1:
-                        wait_time = 10 * (retry + 1)  # Exponential backoff: 10, 20, 30 seconds
-                        logger.info(f"Waiting {wait_time} seconds before retry...")
-                        await asyncio.sleep(wait_time)
-                    else:
-                        logger.error(f"Failed to scrape page {page_num} after {max_retries_per_page} attempts, skipping")
-                        # Don't count timeout as empty page - it's an error
-                        page_success = True  # Move to next page but don't increment empty counter
+                    if not blocked:
+                        self.throttle.record_response(metric['latency_seconds'])
 
-                except Exception as e:
-                    logger.error(f"Error scraping page {page_num} (attempt {retry + 1}/{max_retries_per_page}): {e}")
-                    if retry < max_retries_per_page - 1:
-                        wait_time = 10 * (retry + 1)
-                        logger.info(f"Waiting {wait_time} seconds before retry...")
-                        await asyncio.sleep(wait_time)
+                    if ready == 'empty':
+                        # The page itself says there are no results: nothing to retry
+                        logger.info(f"No results on page {page_num}")
+                        return []
+
+                    # Parse listings
+                    parse_start = time.monotonic()
+                    listings = await self._parse(daft_parser.extract_listings_from_html, content)
+                    metric['parse_seconds'] = time.monotonic() - parse_start
+                    metric['listings'] = len(listings)
+
+                    if listings:
+                        return listings
+
+                    if retry < max_retries - 1:
+                        logger.warning(f"No listings found on page {page_num}, "
+                                       f"retry {retry + 1}/{max_retries}")
                     else:
-                        logger.error(f"Failed to scrape page {page_num} after {max_retries_per_page} attempts, skipping")
-                        page_success = True
+                        logger.warning(f"No listings found on page {page_num} "
+                                       f"after {max_retries} attempts")
+                        return []
 
-            if page_success:
-                page_num += 1
-                # Delay between pages to avoid rate limiting
-                sleep_time = 3 if mode == 'full' else 2
-                await asyncio.sleep(sleep_time)
+                except PlaywrightTimeoutError as e:
+                    logger.error(f"Timeout on page {page_num} "
+                                 f"(attempt {retry + 1}/{max_retries}): {e}")
+                    self.throttle.record_block()
 
-        logger.info(f"✅ Scraping complete: {total_loaded} total listings loaded to database across {page_num-1} pages")
-        return total_loaded
+                except Exception as e:
+                    logger.error(f"Error scraping page {page_num} "
+                                 f"(attempt {retry + 1}/{max_retries}): {e}")
+                    self.throttle.record_block()
 
-    def _extract_listings_from_html(self, html_content: str) -> List[Dict]:
-        """Extract listings from HTML content"""
-        soup = BeautifulSoup(html_content, 'lxml')
-        listings = []
-
-        # Try to find __NEXT_DATA__ script (most reliable method)
-        script_tag = soup.find('script', {'id': '__NEXT_DATA__'})
-
-        if script_tag and script_tag.string:
-            try:
-                data = json.loads(script_tag.string)
-                page_props = data.get('props', {}).get('pageProps', {})
-                listings_data = page_props.get('listings', [])
-
-                logger.info(f"Found {len(listings_data)} listings in __NEXT_DATA__")
-
-                for item in listings_data:
-                    listing = self._parse_listing_json(item.get('listing', {}))
-                    if listing:
-                        listings.append(listing)
-
-                return listings
-            except Exception as e:
-                logger.warning(f"Failed to parse __NEXT_DATA__: {e}, falling back to HTML parsing")
-
-        # Fallback: HTML parsing if JSON extraction fails
-        logger.warning("__NEXT_DATA__ not found, trying HTML parsing")
-        cards = (
-            soup.find_all('div', {'data-testid': 'search-result'}) or
-            soup.find_all('div', {'data-testid': 'listing'}) or
-            soup.find_all('a', href=re.compile(r'/for-rent/.*/\d+'))
-        )
+                finally:
+                    metric.update(self.resource_blocker.take_stats(page))
+                    self._record_page_metric(metric)
 
-        if not cards:
-            logger.warning("No listing cards found on page")
-            return []
+            logger.error(f"Failed to scrape page {page_num} after {max_retries} attempts, skipping")
+            return None
 
-        logger.info(f"Found {len(cards)} listing cards via HTML parsing")
+        finally:
+            self.page_pool.put_nowait(page)
 
-        for card in cards:
-            listing = self._parse_listing_card(card)
-            if listing:
-                listings.append(listing)
+    async def _fetch_listings_data_route(self, page_num: int) -> Optional[List[Dict]]:
+        """
+        Fetch a results page from the Next.js data route through the context's
+        request client, reusing the browser's cookies
 
-        return listings
+        Returns:
+            Listings on the page, or None if the route failed and the page
+            should be rendered instead
+        """
+        build_id = self.build_id
+        url = self._data_route_url(page_num)
+        metric = {'page': page_num, 'attempt': 1, 'fetch_mode': 'data_route', 'status': None,
+                  'delay_seconds': 0.0, 'latency_seconds': None, 'ready_seconds': None,
+                  'ready': False, 'listings': 0}
 
-    def _parse_listing_json(self, listing_data: Dict) -> Optional[Dict]:
-        """Extract all data from JSON listing object"""
         try:
-            coordinates = listing_data.get('point', {}).get('coordinates', [])
-            longitude = coordinates[0] if len(coordinates) > 0 else None
-            latitude = coordinates[1] if len(coordinates) > 1 else None
-
-            seller = listing_data.get('seller', {})
-            media = listing_data.get('media', {})
-            ber = listing_data.get('ber', {})
-
-            price_text = listing_data.get('abbreviatedPrice', listing_data.get('price'))
-            price = self._parse_price(price_text)
-
-            bedrooms_text = listing_data.get('numBedrooms')
-            bedrooms = self._parse_number(bedrooms_text)
-
-            title = listing_data.get('title')
-            county = self._extract_county(title) if title else None
-
-            return {
-                'property_id': listing_data.get('id'),
-                'daft_shortcode': listing_data.get('daftShortcode'),
-                'title': title,
-                'seo_title': listing_data.get('seoTitle'),
-                'price': price,
-                'price_raw': listing_data.get('price'),
-                'abbreviated_price': listing_data.get('abbreviatedPrice'),
-                'property_type': listing_data.get('propertyType'),
-                'bedrooms': bedrooms,
-                'num_bedrooms_raw': bedrooms_text,
-                'county': county,
-                'sections': ','.join(listing_data.get('sections', [])),
-                'sale_type': ','.join(listing_data.get('saleType', [])),
-                'publish_date': listing_data.get('publishDate'),
-                'date_of_construction': listing_data.get('dateOfConstruction'),
-                'category': listing_data.get('category'),
-                'state': listing_data.get('state'),
-                'featured_level': listing_data.get('featuredLevel'),
-                'featured_level_full': listing_data.get('featuredLevelFull'),
-                'premier_partner': listing_data.get('premierPartner'),
-                'latitude': latitude,
-                'longitude': longitude,
-                'seo_friendly_path': listing_data.get('seoFriendlyPath'),
-                'seller_id': seller.get('sellerId'),
-                'seller_name': seller.get('name'),
-                'seller_phone': seller.get('phone'),
-                'seller_branch': seller.get('branch'),
-                'seller_type': seller.get('sellerType'),
-                'licence_number': seller.get('licenceNumber'),
-                'total_images': media.get('totalImages'),
-                'has_video': media.get('hasVideo'),
-                'has_virtual_tour': media.get('hasVirtualTour'),
-                'has_brochure': media.get('hasBrochure'),
-                'ber_rating': ber.get('rating'),
-                'prs_total_unit_types': listing_data.get('prsTotalUnitTypes'),
-                'prs_tagline': listing_data.get('prsTagline'),
-                'property_url': f"https://www.daft.ie{listing_data.get('seoFriendlyPath', '')}",
-                'scraped_at': datetime.now().isoformat()
-            }
+            metric['delay_seconds'] = await self.throttle.wait()
+            await self.rate_limiter.acquire()
+            logger.info(f"Fetching page {page_num} from data route...")
+
+            request_start = time.monotonic()
+            response = await self.context.request.get(url, headers=self.DATA_ROUTE_HEADERS, timeout=30000)
+            metric['latency_seconds'] = time.monotonic() - request_start
+            metric['status'] = response.status
+
+            if response.status == 404:
+                # A new deployment changed the build id; the next rendered page picks it up
+                logger.info(f"Data route not found for build {build_id}, rendering page {page_num} instead")
+                if self.build_id == build_id:
+                    self.build_id = None
+                return None
+
+            if response.status in (403, 429):
+                self.throttle.record_block(self._retry_after(response))
+                self._data_route_failed(f"HTTP {response.status}")
+                return None
+
+            if not response.ok:
+                self._data_route_failed(f"HTTP {response.status}")
+                return None
+
+            body = await response.body()
+            metric['bytes_transferred'] = len(body)
+            parse_start = time.monotonic()
+            listings = await self._parse(daft_parser.extract_listings_from_data_route, body)
+            metric['parse_seconds'] = time.monotonic() - parse_start
+            if listings is None:
+                self._data_route_failed("no listings in pageProps")
+                return None
+
+            self.throttle.record_response(metric['latency_seconds'])
+            self.data_route_failures = 0
+
+            metric['ready'] = True
+            metric['listings'] = len(listings)
+            return listings
+
         except Exception as e:
-            logger.error(f"Error parsing listing JSON: {e}")
+            # Includes a challenge page served instead of JSON
+            self._data_route_failed(str(e))
             return None
 
-    def _parse_listing_card(self, card) -> Optional[Dict]:
-        """Fallback HTML parsing"""
+        finally:
+            self._record_page_metric(metric)
+
+    def _data_route_failed(self, reason: str):
+        """Count a data-route failure, switching the run to rendered pages after too many in a row"""
+        self.data_route_failures += 1
+        logger.warning(f"Data route failed ({reason}), rendering page instead")
+
+        if self.data_route_failures >= self.DATA_ROUTE_MAX_FAILURES and self.fetch_mode == 'data_route':
+            logger.warning(f"Data route failed {self.data_route_failures} times in a row, "
+                           f"rendering all remaining pages")
+            self.fetch_mode = 'browser'
+
+    def _capture_build_id(self, html_content: str):
+        """Remember the Next.js build id from a rendered page's __NEXT_DATA__"""
+        match = self.BUILD_ID_PATTERN.search(html_content)
+        if match and match.group(1) != self.build_id:
+            self.build_id = match.group(1)
+            logger.info(f"Next.js build id: {self.build_id} - using data route for subsequent pages")
+
+    async def _wait_for_listings(self, page) -> Optional[str]:
+        """
+        Wait for __NEXT_DATA__ to hold listings or to show an empty results page
+
+        Returns:
+            'listings' or 'empty', whichever the page showed, or None if neither
+            appeared within Config.DAFT_READY_TIMEOUT_MS
+        """
         try:
-            return {
-                'property_id': None,
-                'title': card.get_text(strip=True)[:200] if card else None,
-                'scraped_at': datetime.now().isoformat()
-            }
-        except Exception:
+            handle = await page.wait_for_function(self.LISTINGS_READY_JS,
+                                                  timeout=Config.DAFT_READY_TIMEOUT_MS)
+            return await handle.json_value()
+        except PlaywrightTimeoutError:
             return None
 
-    def _parse_price(self, price_text) -> Optional[float]:
-        """Parse price from text"""
-        if not price_text:
-            return None
+    def _is_challenge(self, html_content: str) -> bool:
+        """Whether the page is a Cloudflare challenge rather than search results"""
+        return any(marker in html_content for marker in self.CHALLENGE_MARKERS)
+
+    @staticmethod
+    def _retry_after(response) -> Optional[float]:
+        """Retry-After header of a response in seconds, if present and numeric"""
         try:
-            price_str = str(price_text).replace('€', '').replace(',', '').strip()
-            return float(re.sub(r'[^\d.]', '', price_str))
-        except (ValueError, TypeError):
+            value = response.headers.get('retry-after')
+            return float(value) if value else None
+        except (TypeError, ValueError):
             return None
 
-    def _parse_number(self, text) -> Optional[int]:
-        """Parse number from text"""
-        if not text:
-            return None
+    def _record_page_metric(self, metric: Dict[str, Any]):
+        """Keep a page fetch attempt for the run summary and count it in the run metrics"""
+        self.page_metrics.append(metric)
+
+        status = metric['status']
+        metrics.record(
+            'daft', 'fetch', (metric['latency_seconds'] or 0.0) + (metric['ready_seconds'] or 0.0),
+            bytes=metric.get('bytes_transferred', 0),
+            retries=1 if metric['attempt'] > 1 else 0,
+            errors=1 if status is None or status >= 400 else 0
+        )
+        if metric.get('parse_seconds') is not None:
+            metrics.record('daft', 'parse', metric['parse_seconds'], rows=metric['listings'])
+
+    def _export_page_metrics(self):
+        """Append this run's per-page wait metrics to logs/ and log a summary"""
+        if not self.page_metrics:
+            return
+
+        ready = sorted(m['ready_seconds'] for m in self.page_metrics if m['ready_seconds'] is not None)
+        delays = [m['delay_seconds'] for m in self.page_metrics]
+        if ready:
+            p50 = ready[len(ready) // 2]
+            p95 = ready[min(len(ready) - 1, int(len(ready) * 0.95))]
+            logger.info(
+                f"⏱️  Page readiness: p50 {p50:.2f}s, p95 {p95:.2f}s over {len(ready)} attempt(s); "
+                f"delay {sum(delays):.0f}s total, {self.throttle.blocks} block signal(s)"
+            )
+
+        totals = self.resource_blocker.totals
+        pages = len(self.page_metrics)
+        if self.resource_blocker.mode == 'block':
+            logger.info(
+                f"🚫 Resource blocking: {totals['requests_blocked']} request(s) blocked "
+                f"({totals['requests_blocked'] / pages:.1f}/page), "
+                f"{totals['bytes_transferred'] / pages / 1024:.0f} KB transferred/page"
+            )
+        elif self.resource_blocker.mode == 'measure':
+            logger.info(
+                f"🚫 Resource blocking (measure): {totals['requests_blockable']} blockable request(s), "
+                f"{totals['bytes_blockable'] / pages / 1024:.0f} of "
+                f"{totals['bytes_transferred'] / pages / 1024:.0f} KB/page would be saved"
+            )
+
+        run_at = datetime.now().isoformat()
+        metrics_file = Config.LOGS_DIR / "daft_page_metrics.jsonl"
         try:
-            return int(re.sub(r'[^\d]', '', str(text)))
-        except (ValueError, TypeError):
-            return None
+            with open(metrics_file, 'a') as f:
+                for metric in self.page_metrics:
+                    f.write(json.dumps({'run_at': run_at, **metric}) + '\n')
+        except OSError as e:
+            logger.warning(f"Could not write page metrics: {e}")
+
+    def _start_parse_pool(self):
+        """Start the parse process pool if DAFT_PARSE_WORKERS > 0"""
+        if self.parse_workers <= 0 or self.parse_pool is not None:
+            return
+
+        # spawn: the parent has a writer thread and an event loop, which don't survive fork
+        self.parse_pool = ProcessPoolExecutor(
+            max_workers=self.parse_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=daft_parser.init_parse_worker
+        )
+        # Back-pressure: at most two pages queued per worker
+        self.parse_slots = asyncio.Semaphore(self.parse_workers * 2)
+        logger.info(f"Parsing pages on {self.parse_workers} worker process(es)")
+
+    def _stop_parse_pool(self):
+        """Shut down the parse process pool"""
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown(wait=True, cancel_futures=True)
+            self.parse_pool = None
+            self.parse_slots = None
+
+    async def _parse(self, parser: Callable, payload) -> Optional[List[Dict]]:
+        """
+        Run one of the page parsers, on the process pool when it is running
 
-    def _extract_county(self, title: str) -> Optional[str]:
-        """Extract county from title"""
-        if not title:
-            return None
+        Args:
+            parser: daft_parser.extract_listings_from_html or extract_listings_from_data_route
+            payload: Page HTML or data-route response body
 
-        irish_counties = [
-            'Dublin', 'Cork', 'Galway', 'Limerick', 'Waterford', 'Kilkenny',
-            'Wexford', 'Carlow', 'Kildare', 'Meath', 'Louth', 'Wicklow',
-            'Offaly', 'Laois', 'Westmeath', 'Longford', 'Roscommon', 'Sligo',
-            'Leitrim', 'Donegal', 'Mayo', 'Kerry', 'Clare', 'Tipperary',
-            'Cavan', 'Monaghan'
-        ]
+        Returns:
+            Parsed listings (None if the parser found no listings array)
+        """
+        if self.parse_pool is None:
+            return parser(payload)
 
-        title_upper = title.upper()
-        for county in irish_counties:
-            if county.upper() in title_upper:
-                return county
+        async with self.parse_slots:
+            columns, rows = await asyncio.get_running_loop().run_in_executor(
+                self.parse_pool, daft_parser.parse_in_worker, parser, payload
+            )
 
-        return None
+        if rows is None:
+            return None
+        return [dict(zip(columns, row)) for row in rows]
 
 
-async def run_smart_scraper():
-    """Main function to run the smart scraper with page-by-page loading"""
+async def run_smart_scraper(restart: bool = False):
+    """
+    Main function to run the smart scraper with page-by-page loading
+
+    Args:
+        restart: Ignore an interrupted run's checkpoint and start from page 1
+
+    Raises:
+        RuntimeError: If scraped listings failed to load to the database
+    """
     logger.info("🚀 Starting Smart Daft Scraper")
     logger.info("=" * 70)
 
-    async with SmartDaftScraper(headless=True) as scraper:
-        # Scrape with automatic mode detection
-        # Data is loaded to database PAGE BY PAGE inside scrape_rentals()
-        total_loaded = await scraper.scrape_rentals(max_pages=None)
+    # Browser start-up, Playwright waits and parsing on the event loop; loading is profiled as daft.load
+    with profiler.stage('daft.crawl'):
+        async with SmartDaftScraper(headless=True) as scraper:
+            # Scrape with automatic mode detection
+            # Data is loaded to database PAGE BY PAGE inside scrape_rentals()
+            total_loaded = await scraper.scrape_rentals(max_pages=None, restart=restart)
 
-        if total_loaded > 0:
-            logger.info(f"\n✅ Successfully loaded {total_loaded} listings to database (page by page)")
-            logger.info("=" * 70)
-            return True
-        else:
-            logger.info("ℹ️  No new listings found")
-            logger.info("=" * 70)
-            return True
+    if total_loaded > 0:
+        logger.info(f"\n✅ Successfully loaded {total_loaded} listings to database (page by page)")
+        logger.info("=" * 70)
+        return True
+    else:
+        logger.info("ℹ️  No new listings found")
+        logger.info("=" * 70)
+        return True
 
 
 if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description='Smart Daft.ie rental scraper')
+    parser.add_argument('--profile', action='store_true', help='Profile the run (per-stage files in logs/)')
+    args = parser.parse_args()
+
+    if args.profile:
+        profiler.enable()
+
     # Run the scraper
-    asyncio.run(run_smart_scraper())
+    try:
+        success = asyncio.run(run_smart_scraper())
+    except Exception as e:
+        logger.error(f"❌ Daft scraper failed: {e}")
+        success = False
+    metrics.flush()
+    profiler.write()
+    sys.exit(0 if success else 1)
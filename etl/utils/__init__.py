@@ -1,7 +1,20 @@
 """
 Utility modules for ETL pipeline
+Re-exports are resolved on first access, so importing a light utility
+(e.g. etl.utils.logger) does not pull in the database stack
 """
-from etl.utils.database import db, DatabaseManager
-from etl.utils.logger import get_logger
+import importlib
 
-__all__ = ['db', 'DatabaseManager', 'get_logger']
+_EXPORTS = {
+    'db': 'etl.utils.database',
+    'DatabaseManager': 'etl.utils.database',
+    'get_logger': 'etl.utils.logger'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'etl.utils' has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name]), name)
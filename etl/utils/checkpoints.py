@@ -0,0 +1,179 @@
+"""
+Scraping checkpoints - per-source progress and watermark in scraping_checkpoints
+Lets an interrupted scrape resume from its last committed page and gives
+incremental runs their watermark without scanning the raw table
+"""
+from typing import Dict, Optional, Any
+
+from etl.utils.database import db
+from etl.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Columns added on top of the original scraping_checkpoints definition
+_RUN_COLUMNS = """
+    ALTER TABLE scraping_checkpoints
+        ADD COLUMN IF NOT EXISTS run_mode VARCHAR(20),
+        ADD COLUMN IF NOT EXISTS run_started_at TIMESTAMP,
+        ADD COLUMN IF NOT EXISTS last_page INTEGER,
+        ADD COLUMN IF NOT EXISTS run_max_publish_date BIGINT
+"""
+
+
+class CheckpointStore:
+    """
+    Checkpoint row of one data source
+
+    A run moves the row through in_progress -> completed/failed:
+      - start_run() marks it in_progress (keeping the page cursor when resuming)
+      - advance() records each committed page: cursor, newest publish_date seen, row count
+      - complete() folds the run's newest publish_date into the watermark
+        (last_publish_date); the watermark never moves on a partial run, so an
+        interrupted incremental run cannot skip listings
+      - fail() records the error and leaves the cursor for the next run to resume from
+    """
+
+    def __init__(self, data_source: str):
+        """
+        Args:
+            data_source: Source name stored in scraping_checkpoints.data_source (e.g. 'daft')
+        """
+        self.data_source = data_source
+        self.db = db
+        self._schema_checked = False
+
+    def ensure_schema(self):
+        """Add the run-tracking columns to scraping_checkpoints if missing"""
+        if not self._schema_checked:
+            self.db.execute_sql(_RUN_COLUMNS)
+            self._schema_checked = True
+
+    def get(self) -> Optional[Dict[str, Any]]:
+        """
+        Checkpoint row for this source
+
+        Returns:
+            Dict with status, last_publish_date, last_page, run_mode, ... or None if never run
+        """
+        self.ensure_schema()
+        rows = self.db.execute_query(
+            "SELECT * FROM scraping_checkpoints WHERE data_source = %s",
+            (self.data_source,)
+        )
+        return rows[0] if rows else None
+
+    def resumable_page(self, mode: str) -> Optional[int]:
+        """
+        Last committed page of an unfinished run in the same mode
+
+        Returns:
+            Page number to resume from, or None if there is nothing to resume
+        """
+        checkpoint = self.get()
+        if not checkpoint or checkpoint.get('status') == 'completed':
+            return None
+        if checkpoint.get('run_mode') != mode or not checkpoint.get('last_page'):
+            return None
+        return checkpoint['last_page']
+
+    def seed(self, last_publish_date: Optional[int]):
+        """Create the row from an existing watermark (first run after upgrading)"""
+        self.ensure_schema()
+        self.db.execute_sql(
+            """
+                INSERT INTO scraping_checkpoints (data_source, last_publish_date, status)
+                VALUES (%s, %s, 'completed')
+                ON CONFLICT (data_source) DO UPDATE
+                SET last_publish_date = GREATEST(scraping_checkpoints.last_publish_date,
+                                                 EXCLUDED.last_publish_date)
+            """,
+            (self.data_source, last_publish_date)
+        )
+
+    def start_run(self, mode: str, resume: bool = False):
+        """
+        Mark a run as in progress
+
+        Args:
+            mode: 'full' or 'incremental'
+            resume: Keep the page cursor and run counters of the interrupted run
+        """
+        self.ensure_schema()
+        if resume:
+            self.db.execute_sql(
+                """
+                    UPDATE scraping_checkpoints
+                    SET status = 'in_progress', error_message = NULL,
+                        last_scraped_at = CURRENT_TIMESTAMP
+                    WHERE data_source = %s
+                """,
+                (self.data_source,)
+            )
+            return
+
+        self.db.execute_sql(
+            """
+                INSERT INTO scraping_checkpoints
+                    (data_source, status, run_mode, run_started_at, last_page,
+                     run_max_publish_date, total_records_scraped)
+                VALUES (%s, 'in_progress', %s, CURRENT_TIMESTAMP, 0, NULL, 0)
+                ON CONFLICT (data_source) DO UPDATE
+                SET status = 'in_progress',
+                    error_message = NULL,
+                    run_mode = EXCLUDED.run_mode,
+                    run_started_at = EXCLUDED.run_started_at,
+                    last_scraped_at = CURRENT_TIMESTAMP,
+                    last_page = 0,
+                    run_max_publish_date = NULL,
+                    total_records_scraped = 0
+            """,
+            (self.data_source, mode)
+        )
+
+    def advance(self, page: int, max_publish_date: Optional[int], rows: int,
+                last_property_id: Optional[str] = None):
+        """
+        Record a committed page
+
+        Args:
+            page: Highest page whose listings are now in the database
+            max_publish_date: Newest publish_date among the committed listings
+            rows: Rows inserted by the commit
+            last_property_id: property_id of the last committed listing
+        """
+        self.db.execute_sql(
+            """
+                UPDATE scraping_checkpoints
+                SET last_page = GREATEST(COALESCE(last_page, 0), %s),
+                    run_max_publish_date = GREATEST(run_max_publish_date, %s),
+                    total_records_scraped = COALESCE(total_records_scraped, 0) + %s,
+                    last_property_id = COALESCE(%s, last_property_id),
+                    last_scraped_at = CURRENT_TIMESTAMP
+                WHERE data_source = %s
+            """,
+            (page, max_publish_date, rows, last_property_id, self.data_source)
+        )
+
+    def complete(self):
+        """Mark the run completed and advance the watermark"""
+        self.db.execute_sql(
+            """
+                UPDATE scraping_checkpoints
+                SET status = 'completed',
+                    last_publish_date = GREATEST(last_publish_date, run_max_publish_date),
+                    last_scraped_at = CURRENT_TIMESTAMP
+                WHERE data_source = %s
+            """,
+            (self.data_source,)
+        )
+
+    def fail(self, error: str):
+        """Mark the run failed, keeping the cursor for a resume"""
+        self.db.execute_sql(
+            """
+                UPDATE scraping_checkpoints
+                SET status = 'failed', error_message = %s, last_scraped_at = CURRENT_TIMESTAMP
+                WHERE data_source = %s
+            """,
+            (error[:1000], self.data_source)
+        )
@@ -0,0 +1,57 @@
+"""
+Irish county resolution from free-text addresses
+One precompiled word-boundary regex shared by the scraper (per listing) and
+the loader (per batch), so county is resolved once at ingest time
+"""
+import re
+from typing import Optional
+
+import pandas as pd
+
+IRISH_COUNTIES = (
+    'Dublin', 'Cork', 'Galway', 'Limerick', 'Waterford', 'Kilkenny',
+    'Wexford', 'Carlow', 'Kildare', 'Meath', 'Louth', 'Wicklow',
+    'Offaly', 'Laois', 'Westmeath', 'Longford', 'Roscommon', 'Sligo',
+    'Leitrim', 'Donegal', 'Mayo', 'Kerry', 'Clare', 'Tipperary',
+    'Cavan', 'Monaghan'
+)
+
+_CANONICAL = {county.lower(): county for county in IRISH_COUNTIES}
+
+# Longest names first, word boundaries on both sides: "Westmeath" never resolves to "Meath"
+_ALTERNATION = '|'.join(sorted(_CANONICAL, key=len, reverse=True))
+
+# The greedy prefix makes the match land on the last county in the text:
+# addresses end with the county ("Cork Street, Dublin 8" is in Dublin)
+_COUNTY_PATTERN = re.compile(rf'(?s).*\b({_ALTERNATION})\b', re.IGNORECASE)
+
+
+def extract_county(text: Optional[str]) -> Optional[str]:
+    """
+    Resolve the county named in an address or listing title
+
+    Args:
+        text: Free-text address, e.g. "2 Bed Apartment, Main Street, Mullingar, Co. Westmeath"
+
+    Returns:
+        Canonical county name, or None if no county is named
+    """
+    if not text:
+        return None
+    match = _COUNTY_PATTERN.match(text)
+    return _CANONICAL[match.group(1).lower()] if match else None
+
+
+def extract_county_series(texts: pd.Series) -> pd.Series:
+    """
+    Vectorized extract_county for a whole batch
+
+    Args:
+        texts: Series of addresses/titles (None/NaN allowed)
+
+    Returns:
+        Series of canonical county names (None where no county is named), same index
+    """
+    matches = texts.astype('string').str.extract(_COUNTY_PATTERN, expand=False)
+    counties = matches.str.lower().map(_CANONICAL)
+    return counties.astype(object).where(counties.notna(), None)
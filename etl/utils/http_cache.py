@@ -0,0 +1,203 @@
+"""
+On-disk HTTP response cache with conditional revalidation
+Stores response bodies with their ETag/Last-Modified validators so unchanged
+resources can be revalidated with a cheap 304 instead of a full download
+"""
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+from etl.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class HTTPCache:
+    """
+    Cache of HTTP response bodies keyed by a caller-chosen key (e.g. a dataset code)
+
+    Each entry is a body file plus a small JSON metadata file holding the
+    validators. Entries are evicted least-recently-used first once the cache
+    exceeds max_bytes or max_entries.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, max_entries: int):
+        """
+        Args:
+            directory: Cache directory (created if missing)
+            max_bytes: Maximum total size of cached bodies
+            max_entries: Maximum number of cached entries
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, key: str):
+        """Body and metadata paths for a key"""
+        safe_key = re.sub(r'[^A-Za-z0-9_.-]', '_', key)
+        return self.directory / f"{safe_key}.body", self.directory / f"{safe_key}.meta.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Metadata for a cached entry
+
+        Returns:
+            Dict with etag, last_modified, size, stored_at and last_used, or None if not cached
+        """
+        body_path, meta_path = self._paths(key)
+        if not body_path.exists() or not meta_path.exists():
+            return None
+        try:
+            return json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for revalidating a cached entry"""
+        meta = self.get(key)
+        if not meta:
+            return {}
+
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def body_path(self, key: str) -> Path:
+        """Path of the cached body for a key"""
+        return self._paths(key)[0]
+
+    def read_body(self, key: str) -> Optional[bytes]:
+        """Cached body for a key, or None if not cached"""
+        body_path = self.body_path(key)
+        try:
+            return body_path.read_bytes()
+        except OSError:
+            return None
+
+    def store(self, key: str, body: bytes, headers: Dict[str, str]):
+        """
+        Store a response body with its validators
+
+        Args:
+            key: Cache key
+            body: Decoded response body
+            headers: Response headers (ETag and Last-Modified are kept)
+        """
+        body_path, _ = self._paths(key)
+        tmp_path = body_path.with_suffix('.tmp')
+        tmp_path.write_bytes(body)
+        self.store_file(key, tmp_path, headers)
+
+    def store_file(self, key: str, path: Path, headers: Dict[str, str]):
+        """
+        Move an already-downloaded body file into the cache with its validators
+
+        Args:
+            key: Cache key
+            path: File holding the decoded response body (moved, not copied)
+            headers: Response headers (ETag and Last-Modified are kept)
+        """
+        body_path, meta_path = self._paths(key)
+        now = time.time()
+        meta = {
+            'key': key,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'size': Path(path).stat().st_size,
+            'stored_at': now,
+            'last_used': now
+        }
+
+        with self._lock:
+            os.replace(path, body_path)
+            self._write_meta(meta_path, meta)
+            self._evict(keep=key)
+
+    def annotate(self, key: str, **fields):
+        """Update fields in an entry's metadata (no-op if the key is not cached)"""
+        _, meta_path = self._paths(key)
+        with self._lock:
+            meta = self.get(key)
+            if meta:
+                meta.update(fields)
+                self._write_meta(meta_path, meta)
+
+    def touch(self, key: str):
+        """Mark an entry as recently used"""
+        self.annotate(key, last_used=time.time())
+
+    def record_hit(self, key: str):
+        """Count a successful revalidation (304) served from the cache"""
+        meta = self.get(key)
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += meta['size'] if meta else 0
+        self.touch(key)
+
+    def record_miss(self, key: str):
+        """Count a full download"""
+        with self._lock:
+            self.misses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current cache size"""
+        entries = self._entries()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'bytes_saved': self.bytes_saved,
+            'entries': len(entries),
+            'bytes': sum(m.get('size', 0) for m in entries)
+        }
+
+    def _entries(self) -> List[Dict[str, Any]]:
+        """Metadata of every cached entry, dropping unreadable metadata files"""
+        entries = []
+        for meta_path in self.directory.glob('*.meta.json'):
+            try:
+                entries.append(json.loads(meta_path.read_text()))
+            except (OSError, ValueError):
+                meta_path.unlink(missing_ok=True)
+        return entries
+
+    def _write_meta(self, meta_path: Path, meta: Dict[str, Any]):
+        """Atomically write an entry's metadata"""
+        tmp_path = meta_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(meta))
+        os.replace(tmp_path, meta_path)
+
+    def _evict(self, keep: str = None):
+        """Remove least-recently-used entries until the cache is within its limits"""
+        entries = self._entries()
+        entries.sort(key=lambda m: m.get('last_used', 0))
+        total_bytes = sum(m.get('size', 0) for m in entries)
+
+        while entries and (total_bytes > self.max_bytes or len(entries) > self.max_entries):
+            victim = entries.pop(0)
+            if victim.get('key') == keep and entries:
+                # Never evict the entry that was just stored while older ones remain
+                entries.append(victim)
+                continue
+
+            body_path, meta_path = self._paths(victim['key'])
+            body_path.unlink(missing_ok=True)
+            meta_path.unlink(missing_ok=True)
+            total_bytes -= victim.get('size', 0)
+            self.evictions += 1
+            logger.info(f"HTTP cache: evicted {victim['key']} ({victim.get('size', 0):,} bytes)")
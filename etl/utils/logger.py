@@ -1,14 +1,23 @@
 """
 Logging configuration for the ETL pipeline
 Uses loguru for better logging experience
+loguru is imported and its sinks configured on the first log call, not at import time
 """
 import sys
-from loguru import logger
+import threading
 from etl.config import Config
 
+_setup_lock = threading.Lock()
+_configured = False
+
 
 def setup_logger():
     """Configure loguru logger with appropriate settings"""
+    global _configured
+    from loguru import logger
+
+    # Create logs directory if it doesn't exist
+    Config.LOGS_DIR.mkdir(exist_ok=True)
 
     # Remove default handler
     logger.remove()
@@ -41,13 +50,39 @@ def setup_logger():
         compression="zip"
     )
 
+    _configured = True
     return logger
 
 
-def get_logger(name: str):
-    """Get a logger instance with the given name"""
-    return logger.bind(name=name)
+def ensure_logger():
+    """Configure the sinks once per process (called by the first log call)"""
+    if not _configured:
+        with _setup_lock:
+            if not _configured:
+                setup_logger()
+
+
+class _LazyLogger:
+    """
+    Module logger that configures logging on first use
 
+    Attribute lookups (info, warning, ...) return the bound loguru methods
+    themselves and are cached, so after the first call logging goes straight
+    to loguru and {function}/{line} still point at the caller.
+    """
 
-# Initialize logger on import
-setup_logger()
+    def __init__(self, name: str):
+        self._name = name
+
+    def __getattr__(self, attr):
+        from loguru import logger
+
+        ensure_logger()
+        value = getattr(logger.bind(name=self._name), attr)
+        self.__dict__[attr] = value
+        return value
+
+
+def get_logger(name: str):
+    """Get a logger instance with the given name"""
+    return _LazyLogger(name)
@@ -0,0 +1,371 @@
+"""
+Run metrics - per-stage timing, row counts, bytes, retries and errors for every ETL run
+Stages are recorded in memory while the run is going and flushed once at the end
+to the etl_run_metrics table and a Prometheus textfile
+"""
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+
+from psycopg2.extras import execute_values
+
+from etl.config import Config
+from etl.utils.database import db
+from etl.utils.logger import get_logger
+from etl.utils.profiling import profiler
+
+logger = get_logger(__name__)
+
+_CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS etl_run_metrics (
+        id BIGSERIAL PRIMARY KEY,
+        run_id VARCHAR(40) NOT NULL,
+        run_started_at TIMESTAMP NOT NULL,
+        source VARCHAR(20) NOT NULL,
+        stage VARCHAR(30) NOT NULL,
+        dataset VARCHAR(50) NOT NULL DEFAULT '',
+        calls INTEGER NOT NULL DEFAULT 0,
+        seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+        p50_ms DOUBLE PRECISION,
+        p95_ms DOUBLE PRECISION,
+        max_ms DOUBLE PRECISION,
+        rows BIGINT NOT NULL DEFAULT 0,
+        bytes BIGINT NOT NULL DEFAULT 0,
+        retries INTEGER NOT NULL DEFAULT 0,
+        errors INTEGER NOT NULL DEFAULT 0,
+        recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(run_id, source, stage, dataset)
+    );
+    CREATE INDEX IF NOT EXISTS idx_etl_run_metrics_started ON etl_run_metrics(run_started_at);
+"""
+
+_COLUMNS = ['run_id', 'run_started_at', 'source', 'stage', 'dataset', 'calls', 'seconds',
+            'p50_ms', 'p95_ms', 'max_ms', 'rows', 'bytes', 'retries', 'errors']
+
+# Counters exported to the textfile as etl_stage_<name>{source,stage,dataset}
+_PROM_GAUGES = [
+    ('calls', 'Stage invocations in the last run'),
+    ('seconds', 'Seconds spent in the stage in the last run (summed over calls)'),
+    ('rows', 'Rows handled by the stage in the last run'),
+    ('bytes', 'Bytes fetched by the stage in the last run'),
+    ('retries', 'Retried calls in the last run'),
+    ('errors', 'Failed calls in the last run')
+]
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of a list (None if empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class StageRecord:
+    """Counters of one stage call, filled in by the code inside metrics.stage()"""
+
+    __slots__ = ('rows', 'bytes', 'retries', 'errors')
+
+    def __init__(self):
+        self.rows = 0
+        self.bytes = 0
+        self.retries = 0
+        self.errors = 0
+
+
+class RunMetrics:
+    """
+    Metrics of the current run, keyed by (source, stage, dataset)
+
+    Thread-safe: CSO datasets and the Daft write-behind loader record from
+    worker threads. Worker processes (sharded Daft scrapes) hand their
+    snapshot() back to the parent, which merge()s it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._schema_checked = False
+        self.reset()
+
+    def reset(self):
+        """Start a new run"""
+        with self._lock:
+            self.run_started_at = datetime.now()
+            self.run_id = f"{self.run_started_at:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}"
+            self._stages: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+
+    def _entry(self, source: str, stage: str, dataset: str) -> Dict[str, Any]:
+        key = (source, stage, dataset or '')
+        entry = self._stages.get(key)
+        if entry is None:
+            entry = self._stages[key] = {'calls': 0, 'seconds': 0.0, 'durations': [],
+                                         'rows': 0, 'bytes': 0, 'retries': 0, 'errors': 0}
+        return entry
+
+    def record(self, source: str, stage: str, seconds: float, dataset: str = None, calls: int = 1,
+               rows: int = 0, bytes: int = 0, retries: int = 0, errors: int = 0):
+        """
+        Record one stage call
+
+        Args:
+            source: 'daft' or 'cso'
+            stage: Stage name, e.g. 'fetch', 'parse', 'dedup', 'upsert', 'load'
+            seconds: Duration of the call
+            dataset: Dataset within the source (CSO dataset key), if any
+            calls: Units of work covered by the call (e.g. pages of a crawl)
+            rows: Rows handled
+            bytes: Bytes fetched
+            retries: Retried attempts
+            errors: Failed attempts
+        """
+        with self._lock:
+            entry = self._entry(source, stage, dataset)
+            entry['calls'] += calls
+            entry['seconds'] += seconds
+            entry['durations'].append(seconds)
+            entry['rows'] += rows or 0
+            entry['bytes'] += bytes or 0
+            entry['retries'] += retries
+            entry['errors'] += errors
+
+    @contextmanager
+    def stage(self, source: str, stage: str, dataset: str = None):
+        """
+        Time a block as one stage call
+
+        Yields a StageRecord whose rows/bytes/retries/errors the block may set;
+        an exception escaping the block counts as an error and is re-raised.
+        The block is also a profiler stage named source[.dataset].stage.
+        """
+        record = StageRecord()
+        start = time.perf_counter()
+        try:
+            with profiler.stage('.'.join(part for part in (source, dataset, stage) if part)):
+                yield record
+        except Exception:
+            record.errors += 1
+            raise
+        finally:
+            self.record(source, stage, time.perf_counter() - start, dataset=dataset,
+                        rows=record.rows, bytes=record.bytes, retries=record.retries,
+                        errors=record.errors)
+
+    def snapshot(self, reset: bool = False) -> Dict[Tuple[str, str, str], Dict[str, Any]]:
+        """
+        Copy of the recorded stages (picklable, for handing back from worker processes)
+
+        Args:
+            reset: Clear the recorded stages after copying
+        """
+        with self._lock:
+            stages = {key: {**entry, 'durations': list(entry['durations'])}
+                      for key, entry in self._stages.items()}
+            if reset:
+                self._stages = {}
+        return stages
+
+    def merge(self, stages: Dict[Tuple[str, str, str], Dict[str, Any]]):
+        """Add stages recorded elsewhere (e.g. in a worker process) to this run"""
+        with self._lock:
+            for (source, stage, dataset), other in stages.items():
+                entry = self._entry(source, stage, dataset)
+                for field in ('calls', 'seconds', 'rows', 'bytes', 'retries', 'errors'):
+                    entry[field] += other[field]
+                entry['durations'].extend(other['durations'])
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """One summary row per stage, in etl_run_metrics column order"""
+        rows = []
+        for (source, stage, dataset), entry in sorted(self.snapshot().items()):
+            durations = entry['durations']
+            rows.append({
+                'run_id': self.run_id,
+                'run_started_at': self.run_started_at,
+                'source': source,
+                'stage': stage,
+                'dataset': dataset,
+                'calls': entry['calls'],
+                'seconds': round(entry['seconds'], 6),
+                'p50_ms': round(percentile(durations, 0.50) * 1000, 3) if durations else None,
+                'p95_ms': round(percentile(durations, 0.95) * 1000, 3) if durations else None,
+                'max_ms': round(max(durations) * 1000, 3) if durations else None,
+                'rows': entry['rows'],
+                'bytes': entry['bytes'],
+                'retries': entry['retries'],
+                'errors': entry['errors']
+            })
+        return rows
+
+    def flush(self) -> Optional[str]:
+        """
+        Write the run to etl_run_metrics and the Prometheus textfile, then start a new run
+        Metrics never fail the ETL: write errors are logged and swallowed.
+
+        Returns:
+            run_id of the flushed run, or None if nothing was recorded
+        """
+        rows = self.summary()
+        if not rows:
+            return None
+        run_id = self.run_id
+
+        try:
+            self._write_table(rows)
+            logger.info(f"📏 Run metrics: {len(rows)} stage(s) written to etl_run_metrics "
+                        f"(run {run_id})")
+        except Exception as e:
+            logger.warning(f"Could not write run metrics to the database: {e}")
+
+        try:
+            self._write_textfile(rows)
+        except OSError as e:
+            logger.warning(f"Could not write Prometheus textfile: {e}")
+
+        self.reset()
+        return run_id
+
+    def ensure_schema(self):
+        """Create etl_run_metrics if missing"""
+        if not self._schema_checked:
+            db.execute_sql(_CREATE_TABLE)
+            self._schema_checked = True
+
+    def _write_table(self, rows: List[Dict[str, Any]]):
+        self.ensure_schema()
+        with db.get_connection() as conn:
+            with conn.cursor() as cur:
+                execute_values(
+                    cur,
+                    f"INSERT INTO etl_run_metrics ({', '.join(_COLUMNS)}) VALUES %s "
+                    f"ON CONFLICT (run_id, source, stage, dataset) DO NOTHING",
+                    [tuple(row[col] for col in _COLUMNS) for row in rows]
+                )
+
+    def _write_textfile(self, rows: List[Dict[str, Any]]):
+        """Write the node_exporter textfile atomically (write + rename)"""
+        path = Config.METRICS_TEXTFILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        lines = []
+        for field, help_text in _PROM_GAUGES:
+            name = f"etl_stage_{field}"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            lines += [f"{name}{{{_labels(row)}}} {row[field]}" for row in rows]
+
+        name = 'etl_stage_latency_seconds'
+        lines += [f"# HELP {name} Per-call stage latency quantiles in the last run",
+                  f"# TYPE {name} gauge"]
+        for row in rows:
+            for quantile, column in (('0.5', 'p50_ms'), ('0.95', 'p95_ms')):
+                if row[column] is not None:
+                    lines.append(f'{name}{{{_labels(row)},quantile="{quantile}"}} '
+                                 f'{row[column] / 1000:.6f}')
+
+        lines += ["# HELP etl_last_run_timestamp_seconds Start time of the last recorded run",
+                  "# TYPE etl_last_run_timestamp_seconds gauge",
+                  f"etl_last_run_timestamp_seconds {rows[0]['run_started_at'].timestamp():.0f}"]
+
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        tmp_path.write_text('\n'.join(lines) + '\n')
+        os.replace(tmp_path, path)
+
+
+def _labels(row: Dict[str, Any]) -> str:
+    return f'source="{row["source"]}",stage="{row["stage"]}",dataset="{row["dataset"]}"'
+
+
+def metrics_trend(runs: int = 20) -> List[Dict[str, Any]]:
+    """
+    p50/p95 of each stage over the last N runs, with the latest run for comparison
+
+    Args:
+        runs: Number of most recent runs to include
+
+    Returns:
+        One dict per (source, stage, dataset): runs, p50/p95 seconds, p50/p95 rows/s,
+        p50/p95 per-call latency, calls/min, errors, retries and the latest run's values
+    """
+    metrics.ensure_schema()
+    return db.execute_query(
+        """
+            WITH recent AS (
+                SELECT run_id, MAX(run_started_at) AS started
+                FROM etl_run_metrics
+                GROUP BY run_id
+                ORDER BY started DESC
+                LIMIT %s
+            ),
+            latest AS (
+                SELECT run_id FROM recent ORDER BY started DESC LIMIT 1
+            ),
+            scoped AS (
+                SELECT m.*, m.rows / NULLIF(m.seconds, 0) AS rows_per_second,
+                       m.calls * 60.0 / NULLIF(m.seconds, 0) AS calls_per_minute
+                FROM etl_run_metrics m
+                JOIN recent r ON r.run_id = m.run_id
+            )
+            SELECT s.source, s.stage, s.dataset,
+                   COUNT(*) AS runs,
+                   percentile_cont(0.5) WITHIN GROUP (ORDER BY s.seconds) AS p50_seconds,
+                   percentile_cont(0.95) WITHIN GROUP (ORDER BY s.seconds) AS p95_seconds,
+                   percentile_cont(0.5) WITHIN GROUP (ORDER BY s.rows_per_second)
+                       AS p50_rows_per_second,
+                   percentile_cont(0.95) WITHIN GROUP (ORDER BY s.rows_per_second)
+                       AS p95_rows_per_second,
+                   percentile_cont(0.5) WITHIN GROUP (ORDER BY s.calls_per_minute)
+                       AS p50_calls_per_minute,
+                   percentile_cont(0.5) WITHIN GROUP (ORDER BY s.p50_ms) AS p50_latency_ms,
+                   percentile_cont(0.95) WITHIN GROUP (ORDER BY s.p95_ms) AS p95_latency_ms,
+                   SUM(s.errors) AS errors,
+                   SUM(s.retries) AS retries,
+                   MAX(s.seconds) FILTER (WHERE s.run_id IN (SELECT run_id FROM latest))
+                       AS last_seconds,
+                   MAX(s.rows_per_second) FILTER (WHERE s.run_id IN (SELECT run_id FROM latest))
+                       AS last_rows_per_second
+            FROM scoped s
+            GROUP BY s.source, s.stage, s.dataset
+            ORDER BY s.source, s.dataset, s.stage
+        """,
+        (runs,)
+    )
+
+
+def print_metrics_trend(runs: int = 20):
+    """Print p50/p95 stage trends over the last N runs, flagging last runs above p95"""
+    trend = metrics_trend(runs)
+
+    print("\n" + "=" * 110)
+    print(f"📏 ETL STAGE TRENDS (last {runs} runs)")
+    print("=" * 110)
+    if not trend:
+        print("No runs recorded in etl_run_metrics yet")
+        print("=" * 110 + "\n")
+        return
+
+    def fmt(value, spec='.1f'):
+        return '-' if value is None else format(value, spec)
+
+    print(f"{'Stage':<26} {'Runs':>4} {'p50 s':>8} {'p95 s':>8} {'last s':>8} "
+          f"{'p50 rows/s':>11} {'p95 rows/s':>11} {'calls/min':>10} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'err':>4} {'retry':>5}")
+    for row in trend:
+        name = '.'.join(part for part in (row['source'], row['dataset'], row['stage']) if part)
+        slow = (row['last_seconds'] is not None and row['runs'] > 1
+                and row['last_seconds'] > row['p95_seconds'])
+        print(f"{name:<26} {row['runs']:>4} {fmt(row['p50_seconds']):>8} "
+              f"{fmt(row['p95_seconds']):>8} {fmt(row['last_seconds']):>8} "
+              f"{fmt(row['p50_rows_per_second'], '.0f'):>11} "
+              f"{fmt(row['p95_rows_per_second'], '.0f'):>11} "
+              f"{fmt(row['p50_calls_per_minute']):>10} "
+              f"{fmt(row['p50_latency_ms'], '.0f'):>8} {fmt(row['p95_latency_ms'], '.0f'):>8} "
+              f"{row['errors']:>4} {row['retries']:>5}"
+              + ("  ⚠️  last run above p95" if slow else ""))
+    print("=" * 110 + "\n")
+
+
+# Global metrics of the current run
+metrics = RunMetrics()
@@ -0,0 +1,304 @@
+"""
+Profiling mode - cProfile plus wall-clock stack sampling, broken down by stage
+Off by default; stage() is then a plain pass-through. When enabled (--profile),
+a sampler thread records where every staged thread and every asyncio task is,
+including time spent waiting. Up to Python 3.11 each stage also gets its own
+cProfile profile; from 3.12 cProfile can only profile the whole process, so
+one process-wide profile is written and the per-stage breakdown comes from the samples
+(asyncio, cProfile and pstats are only imported once profiling is enabled)
+"""
+import io
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from etl.config import Config
+from etl.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _frame_name(frame) -> str:
+    """module:function of a frame, as shown in the flamegraph"""
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+def _thread_stack(frame) -> List[str]:
+    """Frames of a thread, outermost first"""
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    names.reverse()
+    return names
+
+
+def _await_stack(coro) -> List[str]:
+    """Await chain of a task's coroutine, outermost first (where the task is suspended)"""
+    names = []
+    while coro is not None:
+        frame = (getattr(coro, 'cr_frame', None) or getattr(coro, 'gi_frame', None)
+                 or getattr(coro, 'ag_frame', None))
+        if frame is None:
+            break
+        names.append(_frame_name(frame))
+        coro = (getattr(coro, 'cr_await', None) or getattr(coro, 'gi_yieldfrom', None)
+                or getattr(coro, 'ag_await', None))
+    return names
+
+
+class Profiler:
+    """
+    Stage profiler
+
+    Stages nest per thread. Up to Python 3.11 a nested stage pauses the
+    enclosing stage's cProfile profile, so every function call is attributed to
+    exactly one stage, and the same stage entered from several threads (e.g. CSO
+    datasets) is merged into one profile. From Python 3.12 cProfile hooks into
+    sys.monitoring, which allows one profiler per process and sees every thread,
+    so a per-stage profile would also record concurrent stages' calls; a single
+    process-wide profile is taken instead. Worker processes (sharded scrapes,
+    the parse pool) are not profiled, and stages on an event loop thread must be
+    entered by one coroutine at a time.
+
+    Output in Config.LOGS_DIR, per run:
+        profile_<ts>_<stage>.prof     cProfile data per stage (pstats, snakeviz), Python <= 3.11
+        profile_<ts>_<stage>.txt      top functions by cumulative time, Python <= 3.11
+        profile_<ts>_process.prof     cProfile data for the whole process, Python >= 3.12
+        profile_<ts>_process.txt      top functions by cumulative time, Python >= 3.12
+        profile_<ts>_<stage>.samples.txt  top functions by sampled wall time
+        profile_<ts>.collapsed        sampled stacks, "stage;frame;frame count"
+                                      (flamegraph.pl, speedscope)
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._profiles: Dict[str, list] = {}  # stage -> cProfile.Profile objects
+        self._stage_seconds: Counter = Counter()
+        self._thread_stages: Dict[int, List[str]] = {}  # thread id -> active stage names
+        self._loops: Dict[int, object] = {}  # loop thread id -> asyncio loop
+        self._samples: Counter = Counter()
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        # Python 3.12+ allows one cProfile profile per process, and it sees every thread
+        self.per_stage_cprofile = sys.version_info < (3, 12)
+        self._process_profile = None
+
+    def enable(self, sample_interval: float = None):
+        """
+        Turn profiling on and start the sampler thread
+
+        Args:
+            sample_interval: Seconds between stack samples (defaults to Config.PROFILE_SAMPLE_MS)
+        """
+        if self.enabled:
+            return
+        self.enabled = True
+        self.started_at = datetime.now()
+        self.sample_interval = sample_interval or Config.PROFILE_SAMPLE_MS / 1000
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample_loop, name='profiler-sampler',
+                                         daemon=True)
+        self._sampler.start()
+        logger.info(f"🔬 Profiling enabled (sampling every {self.sample_interval * 1000:.0f}ms)")
+
+        if not self.per_stage_cprofile:
+            import cProfile
+
+            logger.info("🔬 Python 3.12+: one process-wide cProfile profile, "
+                        "per-stage times from samples")
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+                self._process_profile = profile
+            except ValueError as e:
+                # e.g. the interpreter is already running under python -m cProfile
+                logger.warning(f"cProfile unavailable ({e}); sampling only")
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Profile a block as a stage (no-op unless profiling is enabled)
+
+        Args:
+            name: Stage name, e.g. 'daft.crawl', 'daft.load', 'cso.rent.fetch'
+        """
+        if not self.enabled:
+            yield
+            return
+
+        import asyncio
+
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        thread_id = threading.get_ident()
+
+        try:
+            # A running loop on this thread gets its tasks sampled too
+            self._loops[thread_id] = asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+
+        if stack and stack[-1][1] is not None:
+            stack[-1][1].disable()
+        profile = self._start_profile()
+        stack.append((name, profile))
+        self._thread_stages[thread_id] = [entry[0] for entry in stack]
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+            stack.pop()
+            self._thread_stages[thread_id] = [entry[0] for entry in stack]
+            if stack and stack[-1][1] is not None:
+                stack[-1][1].enable()
+
+            with self._lock:
+                self._stage_seconds[name] += elapsed
+                if profile is not None:
+                    self._profiles.setdefault(name, []).append(profile)
+
+    def _start_profile(self):
+        """New enabled cProfile profile for a stage, or None on Python 3.12+ (process-wide only)"""
+        import cProfile
+
+        if not self.per_stage_cprofile:
+            return None
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    def _sample_loop(self):
+        """Sampler thread: record the stack of every staged thread and asyncio task"""
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.sample_interval):
+            try:
+                self._sample(own_id)
+            except Exception:
+                # Threads and tasks change under us; a failed sample is simply dropped
+                continue
+
+    def _sample(self, own_id: int):
+        import asyncio
+
+        frames = sys._current_frames()
+        for thread_id, stages in list(self._thread_stages.items()):
+            if not stages or thread_id == own_id or thread_id not in frames:
+                continue
+            prefix = ';'.join(stages)
+            self._samples[f"{prefix};[thread];{';'.join(_thread_stack(frames[thread_id]))}"] += 1
+
+            loop = self._loops.get(thread_id)
+            if loop is None or loop.is_closed():
+                continue
+            for task in asyncio.all_tasks(loop):
+                chain = _await_stack(task.get_coro())
+                if chain:
+                    self._samples[f"{prefix};[async];{';'.join(chain)}"] += 1
+
+    def _sampled_summaries(self, top: int = 40) -> Dict[str, str]:
+        """
+        Top functions of each stage by sampled wall time (thread stacks only)
+
+        A sample counts towards its innermost stage; a function's total is the
+        share of that stage's samples it appears in, its own share those where it
+        is the frame being executed.
+        """
+        samples = Counter()
+        totals: Dict[str, Counter] = {}
+        owns: Dict[str, Counter] = {}
+        for stack, count in self._samples.items():
+            parts = stack.split(';')
+            if '[thread]' not in parts:
+                continue
+            marker = parts.index('[thread]')
+            name, frames = parts[marker - 1], parts[marker + 1:]
+            samples[name] += count
+            for frame in set(frames):
+                totals.setdefault(name, Counter())[frame] += count
+            if frames:
+                owns.setdefault(name, Counter())[frames[-1]] += count
+
+        summaries = {}
+        for name, count in samples.items():
+            lines = [f"{name}: {count} samples every {self.sample_interval * 1000:.0f}ms "
+                     f"(~{count * self.sample_interval:.1f}s of thread time)",
+                     '', f"{'total %':>8} {'own %':>7}  function"]
+            own = owns.get(name, Counter())
+            for frame, total in totals.get(name, Counter()).most_common(top):
+                lines.append(f"{total / count * 100:8.1f} {own[frame] / count * 100:7.1f}  {frame}")
+            summaries[name] = '\n'.join(lines) + '\n'
+        return summaries
+
+    def write(self, directory: Path = None) -> List[Path]:
+        """
+        Stop sampling and write the per-stage profiles and the collapsed stacks
+
+        Returns:
+            Paths of the written files
+        """
+        if not self.enabled:
+            return []
+        import pstats
+
+        self._stop.set()
+        if self._sampler:
+            self._sampler.join(timeout=5)
+        self.enabled = False
+
+        profiles = dict(self._profiles)
+        if self._process_profile is not None:
+            self._process_profile.disable()
+            profiles['process'] = [self._process_profile]
+            self._process_profile = None
+
+        directory = Path(directory or Config.LOGS_DIR)
+        prefix = f"profile_{self.started_at:%Y%m%d_%H%M%S}"
+        written = []
+
+        for name, stage_profiles in sorted(profiles.items()):
+            stats = pstats.Stats(stage_profiles[0])
+            for profile in stage_profiles[1:]:
+                stats.add(profile)
+
+            path = directory / f"{prefix}_{name}.prof"
+            stats.dump_stats(path)
+
+            summary = io.StringIO()
+            pstats.Stats(str(path), stream=summary).sort_stats('cumulative').print_stats(40)
+            path.with_suffix('.txt').write_text(summary.getvalue())
+            written += [path, path.with_suffix('.txt')]
+
+        for name, summary in sorted(self._sampled_summaries().items()):
+            path = directory / f"{prefix}_{name}.samples.txt"
+            path.write_text(summary)
+            written.append(path)
+
+        if self._samples:
+            path = directory / f"{prefix}.collapsed"
+            path.write_text(''.join(f"{stack} {count}\n"
+                                    for stack, count in self._samples.most_common()))
+            written.append(path)
+
+        logger.info("🔬 Profile by stage (wall time):")
+        for name, seconds in self._stage_seconds.most_common():
+            logger.info(f"   {name:<24} {seconds:8.1f}s")
+        for path in written:
+            logger.info(f"   📄 {path}")
+        return written
+
+
+# Global profiler (enabled with --profile)
+profiler = Profiler()
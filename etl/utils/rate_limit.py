@@ -0,0 +1,116 @@
+"""
+Rate limiting and pacing utilities for scrapers
+"""
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket shared by coroutines to cap the total request rate
+
+    Tokens refill continuously at `rate` per second up to `burst`; each
+    acquire() takes one token, waiting until one is available. Waiters are
+    served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate: Sustained requests per second (<= 0 disables limiting)
+            burst: Maximum requests allowed back-to-back after an idle period
+        """
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+        self.acquired = 0
+        self.waited_seconds = 0.0
+
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait for and consume one token"""
+        if self.rate <= 0:
+            self.acquired += 1
+            return
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.acquired += 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+                self.waited_seconds += wait
+                await asyncio.sleep(wait)
+
+
+class AdaptiveDelay:
+    """
+    Inter-request delay driven by observed response latency and throttling signals
+
+    The normal delay tracks an EWMA of response latency (clamped to
+    [min_delay, max_delay]), so a slow server is given more room. A block
+    signal (429/403/challenge page) pauses every caller sharing the instance,
+    for Retry-After seconds if given, otherwise block_delay doubled per
+    consecutive block. A successful response resets the block streak.
+    """
+
+    def __init__(self, min_delay: float, max_delay: float, block_delay: float,
+                 latency_factor: float = 1.0, alpha: float = 0.3):
+        """
+        Args:
+            min_delay: Smallest delay between requests, in seconds
+            max_delay: Largest delay (and block pause), in seconds
+            block_delay: Pause after the first block signal, in seconds
+            latency_factor: Delay as a multiple of the latency EWMA
+            alpha: EWMA smoothing factor for latency
+        """
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.block_delay = block_delay
+        self.latency_factor = latency_factor
+        self.alpha = alpha
+
+        self.latency = None
+        self.consecutive_blocks = 0
+        self.blocks = 0
+        self.hold_until = 0.0
+        self.waited_seconds = 0.0
+
+    @property
+    def delay(self) -> float:
+        """Current delay before the next request, in seconds"""
+        base = self.min_delay if self.latency is None else self.latency * self.latency_factor
+        delay = min(self.max_delay, max(self.min_delay, base))
+        return max(delay, self.hold_until - time.monotonic())
+
+    def record_response(self, latency: float):
+        """Feed a successful response's latency"""
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency = self.alpha * latency + (1 - self.alpha) * self.latency
+        self.consecutive_blocks = 0
+
+    def record_block(self, retry_after: float = None):
+        """Feed a throttling signal, pausing all callers"""
+        self.blocks += 1
+        self.consecutive_blocks += 1
+        pause = retry_after if retry_after is not None else \
+            self.block_delay * 2 ** (self.consecutive_blocks - 1)
+        self.hold_until = max(self.hold_until, time.monotonic() + min(self.max_delay, pause))
+
+    async def wait(self) -> float:
+        """Sleep for the current delay and return it"""
+        delay = self.delay
+        self.waited_seconds += delay
+        await asyncio.sleep(delay)
+        return delay
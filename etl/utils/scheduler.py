@@ -0,0 +1,268 @@
+"""
+Pipeline scheduler - runs ETL, warehouse SQL and dbt steps as a dependency graph
+Tasks declare the tables they read and write; independent tasks run in parallel
+and a task whose upstream tables received no new rows this run is skipped
+"""
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Any
+
+from etl.config import Config
+from etl.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class Task:
+    """
+    One pipeline step
+
+    The callable returns either a dict of {output table: rows inserted} (loaders,
+    so downstream tasks know whether anything changed) or None, in which case
+    every declared output counts as changed once the task succeeds.
+    """
+
+    def __init__(self, name: str, fn: Callable[[], Optional[Dict[str, int]]],
+                 inputs: List[str] = None, outputs: List[str] = None,
+                 after: List[str] = None, exclusive: str = None):
+        """
+        Args:
+            name: Unique task name
+            fn: Work to run
+            inputs: Tables read; the task is skipped when none of them changed this run
+                    (tasks without inputs always run)
+            outputs: Tables written
+            after: Tasks that must finish first without their outputs triggering this task
+            exclusive: Resource name; tasks sharing it never run at the same time (e.g. 'dbt')
+        """
+        self.name = name
+        self.fn = fn
+        self.inputs = list(inputs or [])
+        self.outputs = list(outputs or [])
+        self.after = list(after or [])
+        self.exclusive = exclusive
+
+
+class PipelineScheduler:
+    """
+    Dependency-aware task runner
+
+    A task depends on every task producing one of its inputs, plus the tasks
+    named in its `after` list. Ready tasks run on a thread pool. Outcomes:
+      - success: ran without error
+      - skipped: none of its inputs received new rows this run
+      - failed:  raised an exception
+      - blocked: an upstream task failed
+    """
+
+    def __init__(self, max_workers: int = None, force: bool = False):
+        """
+        Args:
+            max_workers: Tasks running at once (defaults to Config.PIPELINE_WORKERS)
+            force: Run every task regardless of upstream changes
+        """
+        self.max_workers = max_workers or Config.PIPELINE_WORKERS
+        self.force = force
+        self.tasks: Dict[str, Task] = {}
+
+    def add(self, task: Task) -> Task:
+        """Register a task"""
+        if task.name in self.tasks:
+            raise ValueError(f"Duplicate task name: {task.name}")
+        self.tasks[task.name] = task
+        return task
+
+    def dependencies(self) -> Dict[str, List[str]]:
+        """
+        Upstream tasks of every task
+
+        Raises:
+            ValueError: On unknown `after` names or a dependency cycle
+        """
+        producers = {}
+        for task in self.tasks.values():
+            for table in task.outputs:
+                producers.setdefault(table, []).append(task.name)
+
+        deps = {}
+        for task in self.tasks.values():
+            upstream = {p for table in task.inputs for p in producers.get(table, [])
+                        if p != task.name}
+            for name in task.after:
+                if name not in self.tasks:
+                    raise ValueError(f"Task {task.name} runs after unknown task {name}")
+                upstream.add(name)
+            deps[task.name] = sorted(upstream)
+
+        self._check_acyclic(deps)
+        return deps
+
+    @staticmethod
+    def _check_acyclic(deps: Dict[str, List[str]]):
+        """Raise if the dependency graph has a cycle"""
+        visiting, done = set(), set()
+
+        def visit(name, path):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for upstream in deps[name]:
+                visit(upstream, path + [name])
+            visiting.discard(name)
+            done.add(name)
+
+        for name in deps:
+            visit(name, [])
+
+    def plan(self) -> List[List[str]]:
+        """Tasks grouped into waves that could run in parallel (for display)"""
+        deps = self.dependencies()
+        waves, placed = [], set()
+        while len(placed) < len(deps):
+            wave = sorted(n for n, up in deps.items() if n not in placed and set(up) <= placed)
+            waves.append(wave)
+            placed.update(wave)
+        return waves
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run all tasks
+
+        Returns:
+            Run report: per-task status, reason, start offset, duration and rows,
+            plus the changed tables and total wall time
+        """
+        deps = self.dependencies()
+        results = {name: {'status': 'pending'} for name in self.tasks}
+        # table -> new rows this run (None = changed, count unknown)
+        changed: Dict[str, Optional[int]] = {}
+        busy_resources = set()
+        start = time.monotonic()
+
+        logger.info(f"🗓️  Pipeline: {len(self.tasks)} tasks, up to {self.max_workers} at once"
+                    + (" (forced)" if self.force else ""))
+
+        def execute(task: Task) -> Dict[str, Any]:
+            task_start = time.monotonic()
+            logger.info(f"▶️  {task.name}")
+            try:
+                rows = task.fn()
+                status, error = 'success', None
+            except Exception as e:
+                rows, status, error = None, 'failed', str(e)
+                logger.error(f"❌ {task.name} failed: {e}")
+            duration = time.monotonic() - task_start
+            if status == 'success':
+                logger.info(f"✅ {task.name} ({duration:.1f}s)")
+            return {'status': status, 'error': error, 'rows': rows,
+                    'started_seconds': round(task_start - start, 3), 'seconds': round(duration, 3)}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix='pipeline') as pool:
+            running = {}
+            while True:
+                # Resolve every pending task whose upstream is settled
+                progressed = True
+                while progressed:
+                    progressed = False
+                    for name, result in results.items():
+                        if result['status'] != 'pending':
+                            continue
+                        upstream = [results[u]['status'] for u in deps[name]]
+                        if any(s in ('pending', 'running') for s in upstream):
+                            continue
+
+                        task = self.tasks[name]
+                        if any(s in ('failed', 'blocked') for s in upstream):
+                            results[name] = {'status': 'blocked', 'reason': 'upstream task failed'}
+                            progressed = True
+                            continue
+
+                        if (not self.force and task.inputs
+                                and not any(t in changed for t in task.inputs)):
+                            results[name] = {'status': 'skipped',
+                                             'reason': 'no new rows in ' + ', '.join(task.inputs)}
+                            logger.info(f"⏭️  {name}: skipped (no new rows upstream)")
+                            progressed = True
+                            continue
+
+                        if task.exclusive and task.exclusive in busy_resources:
+                            continue
+                        if len(running) >= self.max_workers:
+                            continue
+
+                        if task.exclusive:
+                            busy_resources.add(task.exclusive)
+                        results[name] = {'status': 'running'}
+                        running[pool.submit(execute, task)] = name
+
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    task = self.tasks[name]
+                    result = future.result()
+                    results[name] = result
+                    if task.exclusive:
+                        busy_resources.discard(task.exclusive)
+                    if result['status'] == 'success':
+                        self._record_changes(task, result['rows'], changed)
+
+        return {
+            'generated_at': datetime.now().isoformat(),
+            'forced': self.force,
+            'wall_seconds': round(time.monotonic() - start, 3),
+            'changed_tables': changed,
+            'tasks': {name: {**results[name], 'depends_on': deps[name]} for name in self.tasks}
+        }
+
+    @staticmethod
+    def _record_changes(task: Task, rows: Optional[Dict[str, int]],
+                        changed: Dict[str, Optional[int]]):
+        """Mark a finished task's outputs as changed if it wrote anything"""
+        if rows is None:
+            for table in task.outputs:
+                changed.setdefault(table, None)
+            return
+        for table, count in rows.items():
+            if count:
+                changed[table] = (changed.get(table) or 0) + count
+
+
+def write_run_report(report: Dict[str, Any], directory: Path = None) -> Path:
+    """
+    Print a per-task summary and write the report as JSON
+
+    Returns:
+        Path of the written report
+    """
+    directory = Path(directory or Config.LOGS_DIR)
+    path = directory / f"pipeline_run_{datetime.now():%Y%m%d_%H%M%S}.json"
+    path.write_text(json.dumps(report, indent=2, default=str))
+
+    icons = {'success': '✅', 'skipped': '⏭️', 'failed': '❌', 'blocked': '⛔'}
+    print("\n" + "=" * 70)
+    print("🗓️  PIPELINE RUN REPORT")
+    print("=" * 70)
+    print(f"{'Task':<28} {'Status':<10} {'Start':>8} {'Duration':>9}  Detail")
+    for name, task in report['tasks'].items():
+        detail = task.get('error') or task.get('reason') or ''
+        if isinstance(task.get('rows'), dict):
+            detail = ', '.join(f"{table}: {rows}" for table, rows in task['rows'].items())
+        start = f"{task['started_seconds']:.1f}s" if 'started_seconds' in task else '-'
+        duration = f"{task['seconds']:.1f}s" if 'seconds' in task else '-'
+        print(f"{icons.get(task['status'], '')} {name:<25} {task['status']:<10} "
+              f"{start:>8} {duration:>9}  {detail}")
+    print("-" * 70)
+    serial = sum(t.get('seconds', 0) for t in report['tasks'].values())
+    print(f"⏱️  Wall time {report['wall_seconds']:.1f}s (tasks sum to {serial:.1f}s)")
+    print(f"📄 Report: {path}")
+    print("=" * 70 + "\n")
+    return path
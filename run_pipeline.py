@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Pipeline Runner - ETL, warehouse deploy and dbt as one dependency graph
+Source loaders, SQL scripts and dbt selectors are tasks with declared input and
+output tables; independent tasks run in parallel and tasks whose upstream tables
+received no new rows are skipped
+"""
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from etl.config import Config
+from etl.scrapers.cso_datasets import CSO_DATASETS
+from etl.utils.logger import get_logger
+from etl.utils.scheduler import PipelineScheduler, Task, write_run_report
+
+logger = get_logger(__name__)
+
+# Raw table of each CSO dataset
+CSO_TABLES = {dataset: info['table'] for dataset, info in CSO_DATASETS.items()}
+
+RAW_TABLES = ['raw_daft_listings'] + list(CSO_TABLES.values())
+
+SILVER_VIEWS = [
+    'silver.stg_daft_listings',
+    'silver.stg_cso_rent_index',
+    'silver.stg_economic_indicators',
+    'silver.stg_market_activity',
+    'silver.vw_data_quality_metrics'
+]
+
+GOLD_DIMENSIONS = ['gold.dim_date', 'gold.dim_county', 'gold.dim_property_type', 'gold.dim_market_segment']
+
+GOLD_FACTS = [
+    'gold.fact_rental_listings',
+    'gold.fact_market_summary',
+    'gold.fact_affordability',
+    'gold.fact_economic_indicators',
+    'gold.fact_price_movements'
+]
+
+DBT_STAGING = ['staging.stg_daft_listings', 'staging.stg_cso_rent', 'staging.stg_cso_cpi',
+               'staging.stg_cso_population', 'staging.stg_cso_income']
+
+DBT_MARTS = ['marts.dim_county', 'marts.dim_date', 'marts.fact_listings',
+             'marts.fact_rent_market', 'marts.fact_cso_rent']
+
+DBT_KPIS = ['analytics.rental_affordability_kpis']
+
+
+def daft_task():
+    """Daft loader: crawl on its own event loop, within its share of the connection pool"""
+    def run():
+        from etl.scrapers.smart_daft_scraper import SmartDaftScraper
+        from etl.utils.database import db
+
+        async def scrape():
+            async with SmartDaftScraper(headless=True) as scraper:
+                return await scraper.scrape_rentals(max_pages=None)
+
+        with db.connection_budget('daft', Config.DB_BUDGET_DAFT):
+            return {'raw_daft_listings': asyncio.run(scrape())}
+    return run
+
+
+def cso_task(dataset: str, table: str, force_full: bool = False):
+    """CSO loader for one dataset"""
+    def run():
+        from etl.scrapers.smart_cso_scraper import run_smart_cso_scraper
+
+        result = run_smart_cso_scraper(datasets=[dataset], force_full=force_full)[dataset]
+        if not result['success']:
+            raise RuntimeError(f"CSO {dataset} load failed")
+        return {table: result['rows']}
+    return run
+
+
+def sql_task(script: str):
+    """Warehouse SQL script from sql/"""
+    def run():
+        from etl.utils.database import db
+
+        path = Config.SQL_DIR / script
+        logger.info(f"📄 Executing: {script}")
+        db.execute_sql(path.read_text())
+    return run
+
+
+def dbt_task(*args: str):
+    """dbt command in the dbt project directory"""
+    def run():
+        command = ['dbt', *args, '--profiles-dir', '.']
+        logger.info(f"🔧 {' '.join(command)}")
+        completed = subprocess.run(command, cwd=Config.DBT_DIR, capture_output=True, text=True)
+        if completed.returncode != 0:
+            tail = (completed.stdout + completed.stderr).strip().splitlines()[-20:]
+            raise RuntimeError(f"{' '.join(command)} exited {completed.returncode}:\n" + '\n'.join(tail))
+    return run
+
+
+def build_pipeline(scheduler: PipelineScheduler, force_full: bool = False,
+                   daft: bool = True, cso: bool = True, dbt: bool = True) -> PipelineScheduler:
+    """
+    Register every pipeline task
+
+    Args:
+        scheduler: Scheduler to add the tasks to
+        force_full: Force full loads in the CSO loaders
+        daft: Include the Daft loader
+        cso: Include the CSO loaders
+        dbt: Include the dbt tasks
+    """
+    # Source loaders (bronze)
+    if daft:
+        scheduler.add(Task('daft', daft_task(), outputs=['raw_daft_listings']))
+    if cso:
+        for dataset, table in CSO_TABLES.items():
+            scheduler.add(Task(f'cso_{dataset}', cso_task(dataset, table, force_full), outputs=[table]))
+
+    # Warehouse SQL (silver -> gold); dimensions are static and idempotent, so they
+    # always run but do not by themselves trigger a rebuild of the facts
+    scheduler.add(Task('sql_silver', sql_task('01_create_silver_layer.sql'),
+                       inputs=RAW_TABLES, outputs=SILVER_VIEWS))
+    scheduler.add(Task('sql_gold_dimensions', sql_task('02_create_gold_dimensions.sql'),
+                       outputs=GOLD_DIMENSIONS))
+    scheduler.add(Task('sql_gold_facts', sql_task('03_create_gold_facts.sql'),
+                       inputs=['silver.stg_daft_listings', 'silver.stg_economic_indicators'],
+                       outputs=GOLD_FACTS, after=['sql_gold_dimensions']))
+
+    # dbt selectors; one dbt process at a time since they share dbt/target
+    if dbt:
+        scheduler.add(Task('dbt_staging', dbt_task('run', '--select', 'tag:staging'),
+                           inputs=RAW_TABLES, outputs=DBT_STAGING, exclusive='dbt'))
+        scheduler.add(Task('dbt_marts', dbt_task('run', '--select', 'tag:marts'),
+                           inputs=DBT_STAGING, outputs=DBT_MARTS, exclusive='dbt'))
+        scheduler.add(Task('dbt_kpis', dbt_task('run', '--select', 'tag:kpis'),
+                           inputs=DBT_MARTS, outputs=DBT_KPIS, exclusive='dbt'))
+        scheduler.add(Task('dbt_test', dbt_task('test'),
+                           inputs=DBT_STAGING + DBT_MARTS + DBT_KPIS, exclusive='dbt'))
+
+    return scheduler
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='ETL, warehouse deploy and dbt as one dependency-aware pipeline',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Load sources, then rebuild only what received new rows
+  python run_pipeline.py
+
+  # Rebuild everything (e.g. after changing a SQL script or dbt model)
+  python run_pipeline.py --force
+
+  # Show the task graph without running it
+  python run_pipeline.py --dry-run
+        """
+    )
+
+    parser.add_argument('--force', action='store_true',
+                        help='Run every task even if its upstream tables got no new rows')
+    parser.add_argument('--force-full', action='store_true',
+                        help='Force full loads in the CSO loaders')
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f'Tasks running at once (default {Config.PIPELINE_WORKERS})')
+    parser.add_argument('--skip-daft', action='store_true', help='Leave out the Daft loader')
+    parser.add_argument('--skip-cso', action='store_true', help='Leave out the CSO loaders')
+    parser.add_argument('--no-dbt', action='store_true', help='Leave out the dbt tasks')
+    parser.add_argument('--dry-run', action='store_true', help='Print the task graph and exit')
+
+    args = parser.parse_args()
+
+    scheduler = build_pipeline(
+        PipelineScheduler(max_workers=args.workers, force=args.force),
+        force_full=args.force_full,
+        daft=not args.skip_daft,
+        cso=not args.skip_cso,
+        dbt=not args.no_dbt
+    )
+
+    if args.dry_run:
+        deps = scheduler.dependencies()
+        for wave_num, wave in enumerate(scheduler.plan(), 1):
+            print(f"Wave {wave_num}:")
+            for name in wave:
+                upstream = ', '.join(deps[name]) or '-'
+                print(f"  {name:<22} after: {upstream}")
+        return
+
+    from etl.utils.database import db
+    from etl.utils.metrics import metrics
+
+    try:
+        report = scheduler.run()
+        metrics.flush()
+    finally:
+        db.close()
+
+    write_run_report(report)
+    failed = [name for name, task in report['tasks'].items() if task['status'] in ('failed', 'blocked')]
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
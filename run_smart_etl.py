@@ -1,16 +1,18 @@
 #!/usr/bin/env python3
 """
 Smart ETL Runner - Orchestrates Daft and CSO scrapers with automatic incremental loading
+Scrapers, pandas and the database stack are imported by the stage that needs them,
+so --help and --cso-only never load Playwright or BeautifulSoup
 """
-import asyncio
 import sys
+import time
 from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from etl.scrapers.smart_daft_scraper import run_smart_scraper as run_daft
-from etl.scrapers.smart_cso_scraper import run_smart_cso_scraper
+from etl.config import Config
+from etl.utils.profiling import profiler
 from etl.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -29,44 +31,103 @@ def print_banner():
     print("="*70 + "\n")
 
 
-async def run_full_pipeline(daft_only: bool = False, cso_only: bool = False, force_full: bool = False):
+def source_seconds(timings: dict, source: str) -> float:
+    """Wall time of one source"""
+    start, end = timings.get(source, (0.0, 0.0))
+    return end - start
+
+
+def overlap_seconds(timings: dict) -> float:
+    """Time during which every source was running"""
+    if len(timings) < 2:
+        return 0.0
+    latest_start = max(start for start, _ in timings.values())
+    earliest_end = min(end for _, end in timings.values())
+    return max(0.0, earliest_end - latest_start)
+
+
+async def run_full_pipeline(daft_only: bool = False, cso_only: bool = False, force_full: bool = False,
+                            restart: bool = False, sharded: bool = False, verify_coverage: bool = False):
     """
     Run complete ETL pipeline with smart incremental loading
+    Daft and CSO run concurrently, each within its own DB connection budget
 
     Args:
         daft_only: Only run Daft scraper
         cso_only: Only run CSO scraper
         force_full: Force full load for all data sources
+        restart: Start the Daft scrape from page 1 instead of resuming an interrupted run
+        sharded: Run a full Daft scrape split into shards across worker processes
+        verify_coverage: With sharded, also crawl the single list and report missed listings
     """
+    import asyncio
+    from etl.utils.database import db
+    from etl.utils.metrics import metrics
+
     print_banner()
 
     results = {
         'daft': None,
         'cso': {}
     }
+    timings = {}
 
-    # Run Daft scraper
-    if not cso_only:
-        logger.info("🏠 STEP 1: Daft.ie Rental Listings")
+    async def run_daft_source():
+        """Daft crawl on the event loop, within its share of the connection pool"""
+        logger.info("🏠 Daft.ie Rental Listings")
         logger.info("-" * 70)
-        try:
-            daft_success = await run_daft()
-            results['daft'] = daft_success
-        except Exception as e:
-            logger.error(f"Daft scraper failed: {e}")
-            results['daft'] = False
+        if sharded:
+            from etl.scrapers.daft_sharding import run_sharded_scrape
+        else:
+            from etl.scrapers.smart_daft_scraper import run_smart_scraper as run_daft
 
-        print()  # Spacing
+        with db.connection_budget('daft', Config.DB_BUDGET_DAFT):
+            start = time.monotonic()
+            try:
+                if sharded:
+                    # Shard workers are separate processes; this profiles the parent's planning and loading
+                    with profiler.stage('daft.sharded'):
+                        report = await run_sharded_scrape(verify=verify_coverage)
+                    results['daft'] = not report['failed_shards']
+                else:
+                    results['daft'] = await run_daft(restart=restart)
+            except Exception as e:
+                logger.error(f"Daft scraper failed: {e}")
+                results['daft'] = False
+            finally:
+                timings['daft'] = (start, time.monotonic())
 
-    # Run CSO scrapers
-    if not daft_only:
-        logger.info("📊 STEP 2: CSO Official Statistics")
+    async def run_cso_source():
+        """Synchronous CSO scraper on a worker thread, within its share of the connection pool"""
+        logger.info("📊 CSO Official Statistics")
         logger.info("-" * 70)
-        try:
-            cso_results = run_smart_cso_scraper(force_full=force_full)
-            results['cso'] = cso_results
-        except Exception as e:
-            logger.error(f"CSO scraper failed: {e}")
+        from etl.scrapers.smart_cso_scraper import run_smart_cso_scraper
+
+        with db.connection_budget('cso', Config.DB_BUDGET_CSO):
+            start = time.monotonic()
+            try:
+                # to_thread copies the context, so the CSO threads draw from the 'cso' budget
+                results['cso'] = await asyncio.to_thread(run_smart_cso_scraper, force_full=force_full)
+            except Exception as e:
+                logger.error(f"CSO scraper failed: {e}")
+            finally:
+                timings['cso'] = (start, time.monotonic())
+
+    # Both sources run at once: the crawl is network-bound, CSO is download/parse-bound
+    sources = []
+    if not cso_only:
+        sources.append(run_daft_source())
+    if not daft_only:
+        sources.append(run_cso_source())
+
+    pipeline_start = time.monotonic()
+    await asyncio.gather(*sources)
+    pipeline_seconds = time.monotonic() - pipeline_start
+
+    # Persist per-stage run metrics, then release pooled connections and report pool usage
+    metrics.flush()
+    db.close()
+    profiler.write()
 
     # Final summary
     print("\n" + "="*70)
@@ -75,13 +136,19 @@ async def run_full_pipeline(daft_only: bool = False, cso_only: bool = False, for
 
     if results['daft'] is not None:
         status = "✅ SUCCESS" if results['daft'] else "❌ FAILED"
-        print(f"{status}: Daft.ie Scraper")
+        print(f"{status}: Daft.ie Scraper ({source_seconds(timings, 'daft'):.1f}s wall)")
 
     if results['cso']:
-        for dataset, success in results['cso'].items():
-            status = "✅ SUCCESS" if success else "❌ FAILED"
-            print(f"{status}: CSO {dataset.upper()}")
+        for dataset, result in results['cso'].items():
+            status = "✅ SUCCESS" if result['success'] else "❌ FAILED"
+            print(f"{status}: CSO {dataset.upper()} ({result['rows']} rows, {result['seconds']:.1f}s)")
+    if 'cso' in timings:
+        print(f"   CSO total: {source_seconds(timings, 'cso'):.1f}s wall")
 
+    serial_seconds = sum(end - start for start, end in timings.values())
+    print("-"*70)
+    print(f"⏱️  Pipeline wall time: {pipeline_seconds:.1f}s "
+          f"(sources sum to {serial_seconds:.1f}s, overlapped {overlap_seconds(timings):.1f}s)")
     print("="*70)
     print("\n💡 Next steps:")
     print("   1. Run dbt models: cd dbt && dbt run --profiles-dir .")
@@ -110,6 +177,21 @@ Examples:
 
   # Only run CSO scrapers
   python run_smart_etl.py --cso-only
+
+  # Start the Daft scrape from page 1 instead of resuming an interrupted run
+  python run_smart_etl.py --restart
+
+  # Full Daft scrape split by county/price band across worker processes
+  python run_smart_etl.py --daft-only --sharded --verify-coverage
+
+  # Re-resolve county from title for already-stored Daft listings
+  python run_smart_etl.py --backfill-counties
+
+  # Profile each stage (cProfile + sampled flamegraph stacks in logs/)
+  python run_smart_etl.py --cso-only --profile
+
+  # p50/p95 stage timings and throughput over the last 30 runs
+  python run_smart_etl.py --metrics-report 30
         """
     )
 
@@ -131,13 +213,75 @@ Examples:
         help='Force full load (ignore existing data)'
     )
 
+    parser.add_argument(
+        '--restart',
+        action='store_true',
+        help='Ignore the Daft checkpoint of an interrupted run and start from page 1'
+    )
+
+    parser.add_argument(
+        '--sharded',
+        action='store_true',
+        help='Full Daft scrape split into county/price-band shards on worker processes'
+    )
+
+    parser.add_argument(
+        '--verify-coverage',
+        action='store_true',
+        help='With --sharded, also crawl the single result list and report missed listings'
+    )
+
+    parser.add_argument(
+        '--backfill-counties',
+        action='store_true',
+        help='Re-resolve county for stored Daft listings and exit'
+    )
+
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Profile each stage: cProfile and collapsed-stack files in logs/'
+    )
+
+    parser.add_argument(
+        '--metrics-report',
+        type=int,
+        nargs='?',
+        const=20,
+        metavar='RUNS',
+        help='Print p50/p95 stage trends over the last RUNS runs (default 20) and exit'
+    )
+
     args = parser.parse_args()
 
+    if args.metrics_report:
+        from etl.utils.database import db
+        from etl.utils.metrics import print_metrics_trend
+
+        print_metrics_trend(args.metrics_report)
+        db.close()
+        return
+
+    if args.backfill_counties:
+        from etl.loaders.data_loader import DataLoader
+        from etl.utils.database import db
+
+        DataLoader().backfill_daft_counties()
+        db.close()
+        return
+
+    if args.profile:
+        profiler.enable()
+
     # Run pipeline
+    import asyncio
     asyncio.run(run_full_pipeline(
         daft_only=args.daft_only,
         cso_only=args.cso_only,
-        force_full=args.force_full
+        force_full=args.force_full,
+        restart=args.restart,
+        sharded=args.sharded,
+        verify_coverage=args.verify_coverage
     ))
 
 
@@ -22,36 +22,8 @@ SELECT
     scraped_at::DATE as scraped_date,
     CURRENT_DATE - COALESCE(TO_TIMESTAMP(publish_date / 1000.0)::DATE, scraped_at::DATE) as days_on_market,
 
-    -- Location (Standardized)
-    CASE
-        WHEN county ILIKE '%dublin%' THEN 'Dublin'
-        WHEN county ILIKE '%cork%' THEN 'Cork'
-        WHEN county ILIKE '%galway%' THEN 'Galway'
-        WHEN county ILIKE '%kerry%' THEN 'Kerry'
-        WHEN county ILIKE '%limerick%' THEN 'Limerick'
-        WHEN county ILIKE '%waterford%' THEN 'Waterford'
-        WHEN county ILIKE '%clare%' THEN 'Clare'
-        WHEN county ILIKE '%mayo%' THEN 'Mayo'
-        WHEN county ILIKE '%sligo%' THEN 'Sligo'
-        WHEN county ILIKE '%donegal%' THEN 'Donegal'
-        WHEN county ILIKE '%wicklow%' THEN 'Wicklow'
-        WHEN county ILIKE '%meath%' THEN 'Meath'
-        WHEN county ILIKE '%kildare%' THEN 'Kildare'
-        WHEN county ILIKE '%louth%' THEN 'Louth'
-        WHEN county ILIKE '%westmeath%' THEN 'Westmeath'
-        WHEN county ILIKE '%offaly%' THEN 'Offaly'
-        WHEN county ILIKE '%laois%' THEN 'Laois'
-        WHEN county ILIKE '%carlow%' THEN 'Carlow'
-        WHEN county ILIKE '%kilkenny%' THEN 'Kilkenny'
-        WHEN county ILIKE '%wexford%' THEN 'Wexford'
-        WHEN county ILIKE '%tipperary%' THEN 'Tipperary'
-        WHEN county ILIKE '%roscommon%' THEN 'Roscommon'
-        WHEN county ILIKE '%longford%' THEN 'Longford'
-        WHEN county ILIKE '%cavan%' THEN 'Cavan'
-        WHEN county ILIKE '%monaghan%' THEN 'Monaghan'
-        WHEN county ILIKE '%leitrim%' THEN 'Leitrim'
-        ELSE INITCAP(TRIM(county))
-    END as county_clean,
+    -- Location (county is resolved to its canonical name at ingest, see etl/utils/county.py)
+    INITCAP(TRIM(county)) as county_clean,
     county as county_original,
     title,
     seo_friendly_path,
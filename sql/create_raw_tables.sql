@@ -25,12 +25,41 @@ CREATE TABLE IF NOT EXISTS scraping_checkpoints (
     total_records_scraped INTEGER DEFAULT 0,
     status VARCHAR(20) DEFAULT 'completed',  -- 'completed', 'failed', 'in_progress'
     error_message TEXT,
+    run_mode VARCHAR(20),  -- 'full' or 'incremental' (current/last run)
+    run_started_at TIMESTAMP,
+    last_page INTEGER,  -- Last page committed by the current run (resume point)
+    run_max_publish_date BIGINT,  -- Newest publish_date committed by the current run
     UNIQUE(data_source)
 );
 
 -- Index for quick lookups
 CREATE INDEX IF NOT EXISTS idx_checkpoints_data_source ON scraping_checkpoints(data_source);
 
+-- ============================================================================
+-- ETL RUN METRICS (One row per run and stage)
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS etl_run_metrics (
+    id BIGSERIAL PRIMARY KEY,
+    run_id VARCHAR(40) NOT NULL,
+    run_started_at TIMESTAMP NOT NULL,
+    source VARCHAR(20) NOT NULL,  -- 'daft', 'cso'
+    stage VARCHAR(30) NOT NULL,  -- 'crawl', 'fetch', 'parse', 'dedup', 'upsert', 'load'
+    dataset VARCHAR(50) NOT NULL DEFAULT '',  -- CSO dataset key
+    calls INTEGER NOT NULL DEFAULT 0,
+    seconds DOUBLE PRECISION NOT NULL DEFAULT 0,  -- Summed over calls
+    p50_ms DOUBLE PRECISION,  -- Per-call latency
+    p95_ms DOUBLE PRECISION,
+    max_ms DOUBLE PRECISION,
+    rows BIGINT NOT NULL DEFAULT 0,
+    bytes BIGINT NOT NULL DEFAULT 0,
+    retries INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0,
+    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(run_id, source, stage, dataset)
+);
+
+CREATE INDEX IF NOT EXISTS idx_etl_run_metrics_started ON etl_run_metrics(run_started_at);
+
 -- ============================================================================
 -- 1. DAFT.IE RENTAL LISTINGS (ALL 38 FIELDS)
 -- ============================================================================
@@ -0,0 +1,85 @@
+"""
+Shared pytest fixtures
+"""
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from etl.config import Config
+
+
+@pytest.fixture(autouse=True, scope='session')
+def _isolated_dirs(tmp_path_factory):
+    """Keep logs, caches and metrics written by the code under test out of the repository"""
+    root = tmp_path_factory.mktemp('etl')
+    Config.LOGS_DIR = root / 'logs'
+    Config.CACHE_DIR = root / 'cache'
+    Config.METRICS_TEXTFILE = root / 'logs' / 'etl_metrics.prom'
+    Config.LOGS_DIR.mkdir()
+    yield root
+
+
+class StandInServer:
+    """
+    Local HTTP server standing in for a remote site
+
+    Tests register a handler per path; a handler gets the request (path,
+    query and headers) and returns (status, headers, body). Every request
+    is recorded in `requests`.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlsplit(self.path)
+                request = {'path': parsed.path, 'query': parse_qs(parsed.query), 'headers': dict(self.headers)}
+                server.requests.append(request)
+
+                handler = server.routes.get(parsed.path)
+                status, headers, body = handler(request) if handler else (404, {}, b'Not Found')
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def route(self, path: str, handler: Callable[[Dict[str, Any]], Tuple[int, Dict[str, str], bytes]]):
+        """Serve path with handler"""
+        self.routes[path] = handler
+
+    def requests_for(self, path: str) -> List[Dict[str, Any]]:
+        """Recorded requests for a path"""
+        return [request for request in self.requests if request['path'] == path]
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def http_server():
+    """Local stand-in HTTP server (see StandInServer)"""
+    server = StandInServer()
+    yield server
+    server.close()
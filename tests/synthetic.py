@@ -0,0 +1,82 @@
+"""
+Synthetic source data shared by the tests and benchmark_etl.py
+"""
+import json
+import random
+from pathlib import Path
+
+
+def write_synthetic_cube(path: Path, cells: int, n_area: int = 50) -> int:
+    """
+    Write a dense 3-dimension JSON-stat 2.0 cube of roughly `cells` cells, ~10% null, to path
+
+    Args:
+        path: Output file
+        cells: Approximate cell count; the time dimension absorbs the rest
+        n_area: Categories of the area dimension
+
+    Returns:
+        Cells written
+    """
+    n_stat = 4
+    n_time = max(1, cells // (n_stat * n_area))
+    dims = {
+        'STATISTIC': [f'S{i}' for i in range(n_stat)],
+        'TLIST(M1)': [f'{1950 + i // 12}{i % 12 + 1:02d}' for i in range(n_time)],
+        'C03004V03625': [f'A{i}' for i in range(n_area)],
+    }
+    header = {
+        'version': '2.0',
+        'class': 'dataset',
+        'id': list(dims),
+        'size': [len(v) for v in dims.values()],
+        'dimension': {
+            dim_id: {'label': dim_id,
+                     'category': {'index': codes, 'label': {c: f'{c} label' for c in codes}}}
+            for dim_id, codes in dims.items()
+        },
+    }
+
+    rng = random.Random(1)
+    total = n_stat * n_time * n_area
+    with open(path, 'w') as f:
+        f.write(json.dumps(header)[:-1] + ', "value": [')
+        for start in range(0, total, 100000):
+            block = ('null' if rng.random() < 0.1 else f'{rng.random() * 100:.1f}'
+                     for _ in range(start, min(start + 100000, total)))
+            f.write((',' if start else '') + ','.join(block))
+        f.write(']}')
+    return total
+
+
+def synthetic_daft_page(page_num: int, listings: int = 20, filler_cards: int = 400,
+                        build_id: str = 'bench') -> str:
+    """Search results page shaped like Daft's: rendered cards plus a __NEXT_DATA__ script"""
+    items = []
+    for i in range(listings):
+        pid = page_num * 1000 + i
+        items.append({'listing': {
+            'id': pid, 'daftShortcode': f'{pid}', 'title': f'Apartment {i}, Main Street, Westmeath',
+            'seoTitle': f'Apartment {i} Main Street', 'price': '€1,850 per month', 'abbreviatedPrice': '€1,850',
+            'propertyType': 'Apartment', 'numBedrooms': '2 Bed', 'sections': ['Property', 'Residential'],
+            'saleType': ['To Let'], 'publishDate': 1700000000000 - pid, 'category': 'Rent', 'state': 'PUBLISHED',
+            'featuredLevel': 'STANDARD', 'featuredLevelFull': 'STANDARD', 'premierPartner': False,
+            'point': {'type': 'Point', 'coordinates': [-7.35, 53.53]}, 'seoFriendlyPath': f'/for-rent/apartment/{pid}',
+            'seller': {'sellerId': 1, 'name': 'Agent', 'phone': '01 234 5678', 'branch': 'Mullingar',
+                       'sellerType': 'BRANDED_AGENT', 'licenceNumber': '001234'},
+            'media': {'totalImages': 12, 'hasVideo': False, 'hasVirtualTour': False, 'hasBrochure': False,
+                      'images': [{'size720x480': f'https://media.daft.ie/{pid}/{k}.jpg'} for k in range(12)]},
+            'ber': {'rating': 'B2'}, 'prsTotalUnitTypes': None, 'prsTagline': None,
+        }})
+    next_data = json.dumps({'props': {'pageProps': {'listings': items, 'paging': {'totalResults': 9000}}},
+                            'page': '/property-for-rent/[...]', 'buildId': build_id})
+
+    cards = ''.join(
+        f'<li class="card"><div data-testid="card-{k}"><a href="/for-rent/apartment/{k}">'
+        f'<img src="https://media.daft.ie/{k}.jpg" alt="Apartment {k}"/><span>€1,850 per month</span>'
+        f'<p class="address">Apartment {k}, Main Street</p></a></div></li>'
+        for k in range(filler_cards)
+    )
+    return (f'<!DOCTYPE html><html><head><title>Property for rent</title>'
+            f'<link rel="stylesheet" href="/_next/static/css/app.css"/></head><body><div id="__next"><ul>{cards}</ul>'
+            f'</div><script id="__NEXT_DATA__" type="application/json">{next_data}</script></body></html>')
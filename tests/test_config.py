@@ -0,0 +1,34 @@
+"""
+Lazy loading of Config
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+from etl.config import Config
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def test_override_survives_first_lazy_access(tmp_path):
+    # A fresh interpreter, so the override is made before anything is loaded
+    script = (
+        "from pathlib import Path\n"
+        "from etl.config import Config\n"
+        f"Config.LOGS_DIR = Path({str(tmp_path)!r})\n"
+        "assert not Config._loaded\n"
+        "Config.CSO_CACHE_ENABLED\n"
+        "assert Config._loaded\n"
+        "print(Config.LOGS_DIR)\n"
+    )
+    completed = subprocess.run([sys.executable, '-c', script], cwd=PROJECT_ROOT,
+                               capture_output=True, text=True)
+
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == str(tmp_path)
+
+
+def test_session_dirs_are_isolated(_isolated_dirs):
+    Config.load()
+    for path in (Config.LOGS_DIR, Config.CACHE_DIR, Config.METRICS_TEXTFILE):
+        assert Path(path).is_relative_to(_isolated_dirs)
@@ -0,0 +1,57 @@
+"""
+Streaming JSON-stat decoding in the CSO scraper
+"""
+import json
+import tracemalloc
+
+import pytest
+
+from synthetic import write_synthetic_cube
+from etl.config import Config
+from etl.scrapers.smart_cso_scraper import SmartCSOScraper
+
+CHUNK_ROWS = 100000
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    monkeypatch.setattr(Config, 'CSO_CACHE_ENABLED', False)
+    return SmartCSOScraper()
+
+
+def _stream_peak(scraper, path):
+    """(rows decoded, peak traced bytes) of streaming a cube file"""
+    tracemalloc.start()
+    try:
+        rows = sum(len(chunk) for chunk in scraper._iter_jsonstat_file(path, 'TEST', chunk_rows=CHUNK_ROWS))
+        return rows, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_stream_matches_whole_document_parse(scraper, tmp_path):
+    path = tmp_path / 'cube.json'
+    write_synthetic_cube(path, 250000)
+
+    with open(path) as f:
+        whole = scraper._parse_jsonstat(json.load(f))
+    streamed = list(scraper._iter_jsonstat_file(path, 'TEST', chunk_rows=30000))
+
+    assert len(streamed) > 1
+    assert sum(len(chunk) for chunk in streamed) == len(whole)
+    assert streamed[-1]['VALUE'].tolist() == whole['VALUE'].tolist()[-len(streamed[-1]):]
+
+
+def test_stream_peak_memory_is_flat_in_cube_size(scraper, tmp_path):
+    peaks = {}
+    # Grow areas and periods together, so dimension metadata stays small next to the cells
+    for cells, areas in ((1000000, 500), (4000000, 1000)):
+        path = tmp_path / f'cube_{cells}.json'
+        total = write_synthetic_cube(path, cells, n_area=areas)
+        rows, peak = _stream_peak(scraper, path)
+        assert 0.85 * total < rows < 0.95 * total  # ~10% null cells dropped
+        peaks[cells] = peak
+        path.unlink()
+
+    # 4x the cells must not mean noticeably more memory: the peak depends on chunk_rows only
+    assert peaks[4000000] < peaks[1000000] * 1.25
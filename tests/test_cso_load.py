@@ -0,0 +1,76 @@
+"""
+Deduplication of CSO datasets loaded in several chunks
+"""
+import re
+
+import pandas as pd
+import pytest
+
+from etl.loaders.data_loader import DataLoader
+
+
+class TableStore:
+    """In-memory stand-in for the raw tables: the loader's key queries and appends"""
+
+    def __init__(self):
+        self.tables = {}
+
+    def stream_query(self, query, params=None, itersize=None):
+        columns = re.search(r'SELECT DISTINCT (.+?)\s+FROM', query, re.S).group(1).split(', ')
+        table = re.search(r'FROM (\w+)', query).group(1)
+        years = {int(y) for y in re.search(r'year IN \(([\d,]+)\)', query).group(1).split(',')}
+        keys = {tuple(row[c] for c in columns)
+                for row in self.tables.get(table, []) if row['year'] in years}
+        for key in keys:
+            yield dict(zip(columns, key))
+
+    def load_dataframe(self, df, table, if_exists='append'):
+        self.tables.setdefault(table, []).extend(df.to_dict('records'))
+        return len(df)
+
+
+@pytest.fixture
+def loader():
+    loader = DataLoader()
+    loader.db = TableStore()
+    return loader
+
+
+def _cpm01(months):
+    """CPM01-shaped rows (monthly) for 'YYYYMmm' periods"""
+    return pd.DataFrame([
+        {'STATISTIC': statistic, 'TLIST(M1)': month, 'Year': int(month[:4]),
+         'C01779V03424_Label': commodity, 'VALUE': 100.0}
+        for month in months
+        for commodity in ('Food', 'Energy', 'Transport')
+        for statistic in ('CPM01C01', 'CPM01C02')
+    ])
+
+
+def _months(*years):
+    return [f"{year}M{month:02d}" for year in years for month in range(1, 13)]
+
+
+def test_chunks_splitting_a_year_all_load(loader):
+    months = _months(2023, 2024)
+    # The chunk boundary falls in the middle of 2023
+    chunks = [_cpm01(months[:7]), _cpm01(months[7:])]
+
+    with loader.cso_dataset_load('raw_cso_cpi'):
+        loaded = sum(loader.load_cso_cpi(chunk) for chunk in chunks)
+
+    assert loaded == sum(len(chunk) for chunk in chunks)
+    assert len(loader.db.tables['raw_cso_cpi']) == loaded
+
+
+def test_rows_loaded_by_an_earlier_run_are_still_skipped(loader):
+    with loader.cso_dataset_load('raw_cso_cpi'):
+        loader.load_cso_cpi(_cpm01(_months(2023)))
+
+    # A full reload: 2023 is already in the table, only 2024 is new
+    months = _months(2023, 2024)
+    with loader.cso_dataset_load('raw_cso_cpi'):
+        loaded = sum(loader.load_cso_cpi(_cpm01(months[i:i + 5])) for i in range(0, len(months), 5))
+
+    assert loaded == len(_cpm01(_months(2024)))
+    assert not loader._cso_snapshots
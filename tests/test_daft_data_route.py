@@ -0,0 +1,266 @@
+"""
+Daft page fetching through the Next.js data route, against a local stand-in for
+daft.ie serving rendered search pages and /_next/data/<buildId>/ JSON
+"""
+import asyncio
+import json
+import re
+import time
+from types import SimpleNamespace
+
+import pytest
+from playwright.async_api import async_playwright
+
+from synthetic import synthetic_daft_page
+from etl.config import Config
+from etl.scrapers.smart_daft_scraper import SmartDaftScraper
+
+SEARCH_PATH = '/property-for-rent/ireland'
+DATA_ROUTE = re.compile(r'^/_next/data/([^/]+)/property-for-rent/ireland\.json$')
+
+
+class DaftStandIn:
+    """
+    Rendered search pages and data-route JSON for one Next.js build at a time
+
+    Only the current build's data route exists; requests for an older build
+    get the 404 a real deployment returns. With reject_data_route set, the
+    data route answers 403 (as a bot check would). Pages after last_page
+    have no listings.
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.build_id = None
+        self.reject_data_route = False
+        self.last_page = None
+        server.route(SEARCH_PATH, self._search_page)
+        self.deploy('build-1')
+
+    def deploy(self, build_id: str):
+        """Replace the current build"""
+        if self.build_id:
+            self.server.routes.pop(self._data_route_path(self.build_id))
+        self.build_id = build_id
+        self.server.route(self._data_route_path(build_id), self._data_route)
+
+    @staticmethod
+    def _data_route_path(build_id: str) -> str:
+        return f'/_next/data/{build_id}/property-for-rent/ireland.json'
+
+    @staticmethod
+    def _page_num(request) -> int:
+        return int(request['query']['from'][0]) // 20 + 1
+
+    def _html(self, request) -> str:
+        page_num = self._page_num(request)
+        listings = 0 if self.last_page is not None and page_num > self.last_page else 20
+        return synthetic_daft_page(page_num, listings=listings, filler_cards=20, build_id=self.build_id)
+
+    def _search_page(self, request):
+        return 200, {'Content-Type': 'text/html; charset=utf-8'}, self._html(request).encode()
+
+    def _data_route(self, request):
+        if self.reject_data_route:
+            return 403, {'Retry-After': '0'}, b'Forbidden'
+        next_data = self._html(request).split('type="application/json">', 1)[1].split('</script>', 1)[0]
+        body = {'pageProps': json.loads(next_data)['props']['pageProps'], '__N_SSP': True}
+        return 200, {'Content-Type': 'application/json'}, json.dumps(body).encode()
+
+    def rendered_pages(self):
+        """Page numbers of rendered search page requests, in order"""
+        return [self._page_num(r) for r in self.server.requests if r['path'] == SEARCH_PATH]
+
+    def data_route_requests(self):
+        """(build id, page number) of data-route requests, in order"""
+        return [(DATA_ROUTE.match(r['path']).group(1), self._page_num(r))
+                for r in self.server.requests if DATA_ROUTE.match(r['path'])]
+
+
+@pytest.fixture
+def daft(http_server, monkeypatch):
+    settings = {
+        'DAFT_BASE_URL': http_server.url,
+        'DAFT_FETCH_MODE': 'data_route',
+        'DAFT_PAGE_CONCURRENCY': 1,
+        'DAFT_MAX_RPS': 0,
+        'DAFT_MIN_DELAY_SECONDS': 0,
+        'DAFT_BLOCK_BACKOFF_SECONDS': 0,
+        'DAFT_READY_TIMEOUT_MS': 5000,
+        'DAFT_PARSE_WORKERS': 0
+    }
+    for name, value in settings.items():
+        monkeypatch.setattr(Config, name, value)
+    return DaftStandIn(http_server)
+
+
+def _page_ids(page_num):
+    """Property ids the stand-in serves on a page"""
+    return [page_num * 1000 + i for i in range(20)]
+
+
+def _ids(listings):
+    return [listing['property_id'] for listing in listings]
+
+
+def _with_request_client(test):
+    """
+    Run test(scraper, request) with Playwright's HTTP client as the scraper's
+    context.request (the data route never needs a browser)
+    """
+    async def run():
+        async with async_playwright() as playwright:
+            request = await playwright.request.new_context()
+            scraper = SmartDaftScraper()
+            scraper.context = SimpleNamespace(request=request)
+            try:
+                return await test(scraper, request)
+            finally:
+                await request.dispose()
+    return asyncio.run(run())
+
+
+async def _capture_build_id(scraper, request, page_num: int):
+    """What a rendered page does in data_route mode: pick the build id out of __NEXT_DATA__"""
+    response = await request.get(scraper._search_url(page_num))
+    scraper._capture_build_id(await response.text())
+
+
+def test_data_route_returns_listings(daft):
+    async def test(scraper, request):
+        await _capture_build_id(scraper, request, 1)
+        assert scraper.build_id == 'build-1'
+        return await scraper._fetch_listings_data_route(2)
+
+    assert _ids(_with_request_client(test)) == _page_ids(2)
+    assert daft.data_route_requests() == [('build-1', 2)]
+    assert daft.server.requests_for('/_next/data/build-1/property-for-rent/ireland.json')[0]['headers'][
+        'x-nextjs-data'] == '1'
+
+
+def test_data_route_404_after_build_change_drops_build_id(daft):
+    async def test(scraper, request):
+        await _capture_build_id(scraper, request, 1)
+        daft.deploy('build-2')
+
+        assert await scraper._fetch_listings_data_route(2) is None
+        # A new deployment is not a failure: wait for the next rendered page's build id
+        assert scraper.build_id is None
+        assert (scraper.data_route_failures, scraper.fetch_mode) == (0, 'data_route')
+
+        await _capture_build_id(scraper, request, 2)
+        assert scraper.build_id == 'build-2'
+        return await scraper._fetch_listings_data_route(3)
+
+    assert _ids(_with_request_client(test)) == _page_ids(3)
+    assert daft.data_route_requests() == [('build-1', 2), ('build-2', 3)]
+
+
+def test_three_rejections_switch_to_browser_mode(daft):
+    async def test(scraper, request):
+        await _capture_build_id(scraper, request, 1)
+        daft.reject_data_route = True
+        modes = []
+        for page_num in (2, 3, 4):
+            assert await scraper._fetch_listings_data_route(page_num) is None
+            modes.append(scraper.fetch_mode)
+        return modes
+
+    assert _with_request_client(test) == ['data_route', 'data_route', 'browser']
+
+
+def test_successful_data_route_resets_rejection_streak(daft):
+    async def test(scraper, request):
+        await _capture_build_id(scraper, request, 1)
+        daft.reject_data_route = True
+        await scraper._fetch_listings_data_route(2)
+        await scraper._fetch_listings_data_route(3)
+        daft.reject_data_route = False
+        assert _ids(await scraper._fetch_listings_data_route(4)) == _page_ids(4)
+        daft.reject_data_route = True
+        await scraper._fetch_listings_data_route(5)
+        await scraper._fetch_listings_data_route(6)
+        return scraper.fetch_mode, scraper.data_route_failures
+
+    assert _with_request_client(test) == ('data_route', 2)
+
+
+# End to end through _fetch_listings_page: rendered pages in Chromium, data route in between
+
+@pytest.fixture(scope='module')
+def chromium():
+    async def launch():
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch()
+            await browser.close()
+
+    try:
+        asyncio.run(launch())
+    except Exception as e:
+        pytest.skip(f"Chromium not available ({str(e).splitlines()[0]}); run: playwright install chromium")
+
+
+def _with_browser(test):
+    """Run test(scraper) on a scraper with a started browser"""
+    async def run():
+        async with SmartDaftScraper(headless=True, concurrency=1) as scraper:
+            return await test(scraper)
+    return asyncio.run(run())
+
+
+def test_rendered_page_then_data_route(chromium, daft):
+    async def test(scraper):
+        return [await scraper._fetch_listings_page(page_num) for page_num in (1, 2, 3)]
+
+    pages = _with_browser(test)
+
+    assert [_ids(listings) for listings in pages] == [_page_ids(n) for n in (1, 2, 3)]
+    assert daft.rendered_pages() == [1]
+    assert daft.data_route_requests() == [('build-1', 2), ('build-1', 3)]
+
+
+def test_build_change_renders_page_and_follows_new_build(chromium, daft):
+    async def test(scraper):
+        pages = [await scraper._fetch_listings_page(1)]
+        daft.deploy('build-2')
+        pages += [await scraper._fetch_listings_page(page_num) for page_num in (2, 3)]
+        return pages, scraper.fetch_mode
+
+    pages, fetch_mode = _with_browser(test)
+
+    assert [_ids(listings) for listings in pages] == [_page_ids(n) for n in (1, 2, 3)]
+    assert fetch_mode == 'data_route'
+    assert daft.rendered_pages() == [1, 2]
+    assert daft.data_route_requests() == [('build-1', 2), ('build-2', 3)]
+
+
+def test_rejected_data_route_falls_back_to_rendering_every_page(chromium, daft):
+    async def test(scraper):
+        pages = [await scraper._fetch_listings_page(1)]
+        daft.reject_data_route = True
+        pages += [await scraper._fetch_listings_page(page_num) for page_num in (2, 3, 4, 5)]
+        return pages, scraper.fetch_mode
+
+    pages, fetch_mode = _with_browser(test)
+
+    # Every rejected page is still rendered; after the third rejection the route is not tried again
+    assert [_ids(listings) for listings in pages] == [_page_ids(n) for n in (1, 2, 3, 4, 5)]
+    assert fetch_mode == 'browser'
+    assert daft.data_route_requests() == [('build-1', 2), ('build-1', 3), ('build-1', 4)]
+    assert daft.rendered_pages() == [1, 2, 3, 4, 5]
+
+
+def test_empty_results_page_returns_without_waiting(chromium, daft):
+    daft.last_page = 0
+
+    async def test(scraper):
+        start = time.monotonic()
+        listings = await scraper._fetch_listings_page(1)
+        return listings, time.monotonic() - start
+
+    listings, seconds = _with_browser(test)
+
+    # Read as soon as __NEXT_DATA__ shows the empty page: no readiness timeout, no retries
+    assert listings == []
+    assert seconds < Config.DAFT_READY_TIMEOUT_MS / 1000
+    assert daft.rendered_pages() == [1]
@@ -0,0 +1,46 @@
+"""
+Daft page parsing inline and on the parse process pool
+"""
+import asyncio
+
+import pytest
+
+from etl.config import Config
+from etl.scrapers import daft_parser
+from etl.scrapers.smart_daft_scraper import SmartDaftScraper
+from synthetic import synthetic_daft_page
+
+
+def _comparable(listings):
+    return [{k: v for k, v in listing.items() if k != 'scraped_at'} for listing in listings]
+
+
+@pytest.fixture
+def parse_pool(monkeypatch):
+    """Scraper with a two-worker parse pool"""
+    monkeypatch.setattr(Config, 'DAFT_PARSE_WORKERS', 2)
+    scraper = SmartDaftScraper()
+    scraper._start_parse_pool()
+    yield scraper
+    scraper._stop_parse_pool()
+
+
+def test_pool_matches_inline_parse(parse_pool):
+    pages = [synthetic_daft_page(n, filler_cards=20) for n in (1, 2, 3)]
+
+    async def parse_all():
+        return await asyncio.gather(*(
+            parse_pool._parse(daft_parser.extract_listings_from_html, html) for html in pages
+        ))
+
+    pooled = asyncio.run(parse_all())
+
+    assert [_comparable(listings) for listings in pooled] == \
+        [_comparable(daft_parser.extract_listings_from_html(html)) for html in pages]
+
+
+def test_pool_passes_through_missing_listings(parse_pool):
+    listings = asyncio.run(parse_pool._parse(daft_parser.extract_listings_from_data_route,
+                                             b'{"pageProps": {}}'))
+
+    assert listings is None
@@ -0,0 +1,112 @@
+"""
+Sharded Daft scrape bookkeeping: the merged load and the checkpoint watermark,
+with the browser, the worker processes and the database replaced by stand-ins
+"""
+import asyncio
+
+import pytest
+
+import etl.loaders.data_loader
+import etl.scrapers.smart_daft_scraper
+from etl.scrapers import daft_sharding
+from etl.utils.database import _current_budget, db
+
+SHARDS = [{'name': name, 'path': name.lower(), 'filters': {}, 'expected': 2}
+          for name in ('Dublin', 'Cork')]
+
+
+class Planner:
+    """SmartDaftScraper stand-in for planning: reports the unsharded total"""
+
+    def __init__(self, headless=True):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def probe_total_results(self, *args):
+        return 4
+
+
+class Checkpoints:
+    """CheckpointStore stand-in recording the calls of the last run"""
+    calls = []
+
+    def __init__(self, data_source):
+        Checkpoints.calls = []
+
+    def start_run(self, mode):
+        self.calls.append(('start_run', mode))
+
+    def advance(self, page, max_publish_date, rows, last_property_id=None):
+        self.calls.append(('advance', max_publish_date))
+
+    def complete(self):
+        self.calls.append(('complete',))
+
+    def fail(self, error):
+        self.calls.append(('fail', error))
+
+
+class Loader:
+    """DataLoader stand-in recording the connection budget the load ran under"""
+    budgets = []
+
+    def load_daft_listings(self, listings):
+        budget = _current_budget.get()
+        self.budgets.append(budget['name'] if budget else None)
+        return len(listings)
+
+
+def _listing(shard_num, i):
+    return {'property_id': f"{shard_num}-{i}", 'publish_date': 1700000000 + shard_num * 10 + i}
+
+
+@pytest.fixture
+def sharded(monkeypatch):
+    """Run a sharded scrape whose shards collected the given listing counts"""
+    monkeypatch.setattr(etl.scrapers.smart_daft_scraper, 'SmartDaftScraper', Planner)
+    monkeypatch.setattr(etl.loaders.data_loader, 'DataLoader', Loader)
+    monkeypatch.setattr(daft_sharding, 'CheckpointStore', Checkpoints)
+    Loader.budgets = []
+
+    async def plan(probe, *args, **kwargs):
+        return [dict(shard) for shard in SHARDS]
+    monkeypatch.setattr(daft_sharding, 'plan_shards', plan)
+
+    def run(collected, error=None):
+        def scrape(shards, workers, headless):
+            return [{'shard': shard, 'listings': [_listing(n, i) for i in range(count)],
+                     'pages': 1, 'seconds': 1.0, 'error': error if n == 0 else None}
+                    for n, (shard, count) in enumerate(zip(shards, collected))]
+        monkeypatch.setattr(daft_sharding, 'scrape_shards', scrape)
+
+        async def scrape_under_budget():
+            with db.connection_budget('daft', 2):
+                return await daft_sharding.run_sharded_scrape()
+        return asyncio.run(scrape_under_budget())
+    return run
+
+
+def test_load_draws_from_the_callers_budget(sharded):
+    report = sharded([2, 2])
+
+    assert report['loaded'] == 4
+    assert Loader.budgets == ['daft']
+
+
+def test_watermark_advances_when_every_shard_finished(sharded):
+    sharded([2, 2])
+
+    assert Checkpoints.calls[-1] == ('complete',)
+
+
+@pytest.mark.parametrize('collected, error', [([1, 2], None), ([0, 2], 'browser crashed')])
+def test_short_or_failed_shard_keeps_the_watermark(sharded, collected, error):
+    sharded(collected, error)
+
+    assert ('complete',) not in Checkpoints.calls
+    assert Checkpoints.calls[-1][0] == 'fail'
@@ -0,0 +1,71 @@
+"""
+COPY upserts, key lookups and their fallback inside DatabaseManager.transaction()
+
+Needs a scratch PostgreSQL database: set TEST_DATABASE_URL (e.g.
+postgresql+psycopg2://postgres@localhost/postgres), otherwise these tests skip.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+from etl.config import Config
+from etl.utils.database import DatabaseManager
+
+TABLE = 'test_upsert_target'
+
+
+@pytest.fixture
+def pg(monkeypatch):
+    url = os.getenv('TEST_DATABASE_URL')
+    if not url:
+        pytest.skip("TEST_DATABASE_URL not set")
+    monkeypatch.setattr(Config, 'DATABASE_URL', url)
+    monkeypatch.setattr(Config, 'DB_SCHEMA', 'public')
+
+    manager = DatabaseManager()
+    manager.execute_sql(f"DROP TABLE IF EXISTS {TABLE}; "
+                        f"CREATE TABLE {TABLE} (id int PRIMARY KEY, v text CHECK (length(v) < 5))")
+    yield manager
+    manager.execute_sql(f"DROP TABLE IF EXISTS {TABLE}")
+    manager.close()
+
+
+def _rows(manager):
+    return [row['id'] for row in manager.execute_query(f"SELECT id FROM {TABLE} ORDER BY id")]
+
+
+def _frame(ids, v='x'):
+    return pd.DataFrame({'id': ids, 'v': [v] * len(ids)})
+
+
+def test_copy_upserts_share_a_transaction(pg):
+    with pg.transaction():
+        first = pg.copy_upsert(_frame([1, 2]), TABLE, ['id'])['inserted']
+        second = pg.copy_upsert(_frame([2, 3]), TABLE, ['id'])['inserted']
+
+    assert (first, second) == (2, 1)
+    assert _rows(pg) == [1, 2, 3]
+
+
+def test_key_lookups_share_a_transaction(pg):
+    pg.copy_upsert(_frame([1, 2]), TABLE, ['id'])
+
+    with pg.transaction():
+        first = pg.existing_keys(_frame([1, 5])[['id']], TABLE, ['id'])
+        second = pg.existing_keys(_frame([2, 6])[['id']], TABLE, ['id'])
+
+    assert (first['id'].tolist(), second['id'].tolist()) == ([1], [2])
+
+
+def test_failed_copy_falls_back_within_the_transaction(pg):
+    # One value breaks the CHECK constraint, so the set-based INSERT fails as a whole
+    df = pd.DataFrame({'id': [1, 2, 3], 'v': ['a', 'too long', 'c']})
+
+    with pg.transaction():
+        pg.copy_upsert(_frame([10]), TABLE, ['id'])
+        inserted = pg.bulk_upsert(df, TABLE, ['id'], method='copy')
+
+    # Row by row, the bad row only loses itself; earlier work in the transaction is kept
+    assert inserted == 2
+    assert _rows(pg) == [1, 3, 10]
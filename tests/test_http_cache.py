@@ -0,0 +1,146 @@
+"""
+Conditional revalidation of CSO downloads through the on-disk HTTP cache,
+against a local stand-in for the PxStat API
+"""
+import pytest
+
+from synthetic import write_synthetic_cube
+from etl.config import Config
+from etl.scrapers.smart_cso_scraper import SmartCSOScraper
+from etl.utils.http_cache import HTTPCache
+
+LAST_MODIFIED = 'Wed, 14 Oct 2026 09:00:00 GMT'
+
+
+@pytest.fixture
+def cube(tmp_path):
+    path = tmp_path / 'cube.json'
+    write_synthetic_cube(path, 2000)
+    return path.read_bytes()
+
+
+@pytest.fixture
+def pxstat(http_server, monkeypatch):
+    """Serve datasets with ETag/Last-Modified validators; returns {code: body} to fill in"""
+    bodies = {}
+
+    def dataset(code):
+        def handler(request):
+            etag = f'"{code}-v1"'
+            if request['headers'].get('If-None-Match') == etag:
+                return 304, {'ETag': etag}, b''
+            return 200, {'ETag': etag, 'Last-Modified': LAST_MODIFIED,
+                         'Content-Type': 'application/json'}, bodies[code]
+        return handler
+
+    def add(code, body):
+        bodies[code] = body
+        http_server.route(f'/api/{code}/JSON-stat/2.0/en', dataset(code))
+
+    monkeypatch.setattr(SmartCSOScraper, 'BASE_URL', f'{http_server.url}/api')
+    return add
+
+
+def _scraper(monkeypatch, tmp_path, max_bytes=10 * 1024 * 1024, max_entries=32):
+    monkeypatch.setattr(Config, 'CSO_CACHE_ENABLED', False)
+    scraper = SmartCSOScraper()
+    scraper.cache = HTTPCache(tmp_path / 'http_cache', max_bytes=max_bytes, max_entries=max_entries)
+    return scraper
+
+
+def test_200_stores_validators(pxstat, cube, monkeypatch, tmp_path):
+    pxstat('RIA02', cube)
+    scraper = _scraper(monkeypatch, tmp_path)
+
+    path, temporary = scraper._download_cso_dataset('RIA02')
+
+    assert not temporary
+    assert path == scraper.cache.body_path('RIA02')
+    assert path.read_bytes() == cube
+    entry = scraper.cache.get('RIA02')
+    assert entry['etag'] == '"RIA02-v1"'
+    assert entry['last_modified'] == LAST_MODIFIED
+    assert entry['size'] == len(cube)
+
+
+def test_304_skips_before_parsing(pxstat, http_server, cube, monkeypatch, tmp_path):
+    pxstat('RIA02', cube)
+    scraper = _scraper(monkeypatch, tmp_path)
+
+    assert sum(len(df) for df in scraper._fetch_cso_stream('RIA02')) > 0
+    scraper._mark_loaded('rent')
+
+    def parse(*args, **kwargs):
+        raise AssertionError("an unchanged, already loaded dataset must not be parsed")
+    monkeypatch.setattr(scraper, '_iter_jsonstat_file', parse)
+
+    assert list(scraper._fetch_cso_stream('RIA02', skip_unchanged=True)) == []
+
+    revalidation = http_server.requests_for('/api/RIA02/JSON-stat/2.0/en')[-1]
+    assert revalidation['headers']['If-None-Match'] == '"RIA02-v1"'
+    assert revalidation['headers']['If-Modified-Since'] == LAST_MODIFIED
+
+
+def test_304_not_yet_loaded_parses_cached_body(pxstat, cube, monkeypatch, tmp_path):
+    pxstat('RIA02', cube)
+    scraper = _scraper(monkeypatch, tmp_path)
+
+    first = sum(len(df) for df in scraper._fetch_cso_stream('RIA02'))
+    # No _mark_loaded: the previous load did not finish, so the cached body is loaded again
+    second = sum(len(df) for df in scraper._fetch_cso_stream('RIA02', skip_unchanged=True))
+
+    assert second == first
+    assert scraper.cache.stats()['hits'] == 1
+
+
+def test_hit_and_miss_counters(pxstat, cube, monkeypatch, tmp_path):
+    pxstat('RIA02', cube)
+    pxstat('CPM01', cube)
+    scraper = _scraper(monkeypatch, tmp_path)
+
+    scraper._download_cso_dataset('RIA02')
+    scraper._download_cso_dataset('CPM01')
+    scraper._download_cso_dataset('RIA02')
+    scraper._download_cso_dataset('RIA02')
+
+    stats = scraper.cache.stats()
+    assert (stats['misses'], stats['hits']) == (2, 2)
+    assert stats['bytes_saved'] == 2 * len(cube)
+    assert (stats['entries'], stats['bytes']) == (2, 2 * len(cube))
+    # Only misses transfer the body
+    assert scraper.transfer_stats['RIA02']['bytes'] == len(cube)
+
+
+def test_entry_limit_evicts_least_recently_used(pxstat, cube, monkeypatch, tmp_path):
+    for code in ('RIA02', 'CPM01', 'PEA01'):
+        pxstat(code, cube)
+    scraper = _scraper(monkeypatch, tmp_path, max_entries=2)
+
+    scraper._download_cso_dataset('RIA02')
+    scraper._download_cso_dataset('CPM01')
+    scraper._download_cso_dataset('RIA02')  # 304: RIA02 is now the most recently used
+    scraper._download_cso_dataset('PEA01')
+
+    assert scraper.cache.get('CPM01') is None
+    assert not scraper.cache.body_path('CPM01').exists()
+    assert scraper.cache.get('RIA02') is not None
+    assert scraper.cache.get('PEA01') is not None
+    assert scraper.cache.stats()['evictions'] == 1
+
+
+def test_size_limit_evicts_until_within_budget(pxstat, cube, monkeypatch, tmp_path):
+    for code in ('RIA02', 'CPM01', 'PEA01'):
+        pxstat(code, cube)
+    scraper = _scraper(monkeypatch, tmp_path, max_bytes=2 * len(cube) + len(cube) // 2)
+
+    for code in ('RIA02', 'CPM01', 'PEA01'):
+        scraper._download_cso_dataset(code)
+
+    stats = scraper.cache.stats()
+    assert stats['bytes'] <= scraper.cache.max_bytes
+    assert (stats['entries'], stats['evictions']) == (2, 1)
+    assert scraper.cache.get('RIA02') is None
+
+    # An evicted dataset is downloaded in full again
+    scraper._download_cso_dataset('RIA02')
+    assert scraper.cache.stats()['misses'] == 4